@@ -3,8 +3,9 @@ Admin endpoints for database initialization and management
 """
 from fastapi import APIRouter, HTTPException, Depends
 from app.core.db import engine, get_db
-from app.core.models import Base, User, Company, UserProfile
-from app.core.auth import hash_password, pwd_context
+from app.core.models import Base, User, Company, UserProfile, Job
+from app.core.auth import hash_password, pwd_context, require_admin
+from app.core.timing import summarize_stage_timings
 import bcrypt
 from sqlalchemy.orm import Session
 import os
@@ -98,6 +99,7 @@ async def initialize_database(secret: str):
                 "companies",
                 "user_profiles",
                 "jobs",
+                "ingest_batches",
                 "profiles",
                 "skills",
                 "evidence"
@@ -130,3 +132,23 @@ async def health_check(db: Session = Depends(get_db)):
             "database": "error",
             "error": str(e)
         }
+
+@router.get("/stage-timings")
+async def stage_timings(
+    limit: int = 500,
+    db: Session = Depends(get_db),
+    current_user: dict = Depends(require_admin)
+):
+    """
+    Percentile summaries of per-stage ingest timings over the most recent jobs
+    """
+    rows = db.query(Job.stage_timings).filter(
+        Job.stage_timings.isnot(None),
+        Job.status == "done"
+    ).order_by(Job.updated_at.desc()).limit(limit).all()
+    
+    timings = [row.stage_timings for row in rows]
+    return {
+        "jobs": len(timings),
+        "stages": summarize_stage_timings(timings)
+    }
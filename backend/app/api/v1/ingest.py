@@ -1,19 +1,207 @@
-from fastapi import APIRouter, UploadFile, File, Form, HTTPException
-from uuid import uuid4
-from datetime import datetime
+from fastapi import APIRouter, UploadFile, File, Form, HTTPException, Request
+from fastapi.concurrency import run_in_threadpool
+from fastapi.routing import APIRoute
+from celery import group
+from uuid import uuid4, UUID
+from datetime import datetime, timedelta
+from typing import Callable, Optional, Dict, Any, List, Tuple, BinaryIO
+from urllib.parse import urlsplit, urlunsplit
+import hashlib
 import json
+import os
+import zipfile
 from app.core.db import SessionLocal
-from app.core.models import Job
+from app.core.models import Job, IngestBatch
 from app.core.tasks import process_ingest_job
-from app.core.schemas import IngestResponse
+from app.core.events import publish_job_status, JOB_PROGRESS, TERMINAL_STATUSES
+from app.core.schemas import (
+    IngestResponse,
+    IngestBatchResponse,
+    IngestBatchStatus,
+    BatchFileResult,
+    BatchFileRejection
+)
 
-router = APIRouter()
+# Identical submissions within this window reuse the existing profile (0 disables)
+INGEST_DEDUP_TTL_SECONDS = int(os.getenv("INGEST_DEDUP_TTL_SECONDS", "86400"))
+
+# Uploads are streamed to disk in chunks and never held in memory as a whole
+UPLOAD_DIR = os.getenv("UPLOAD_DIR", "/tmp")
+MAX_UPLOAD_BYTES = int(os.getenv("MAX_UPLOAD_BYTES", str(10 * 1024 * 1024)))
+UPLOAD_CHUNK_SIZE = 64 * 1024
+# Room for the multipart headers and form fields around the file itself
+FORM_OVERHEAD_BYTES = 64 * 1024
+
+# Bulk uploads: total size of the request, and of the files once unzipped, and number of CVs per batch
+MAX_BATCH_UPLOAD_BYTES = int(os.getenv("MAX_BATCH_UPLOAD_BYTES", str(200 * 1024 * 1024)))
+MAX_BATCH_FILES = int(os.getenv("MAX_BATCH_FILES", "500"))
+
+# Magic numbers of the formats parse_file understands; legacy .doc (OLE) files
+# are not among them, python-docx cannot read them
+UPLOAD_SIGNATURES = [
+    (b"%PDF-", ".pdf"),
+    (b"PK\x03\x04", ".docx")
+]
+
+def request_body_limit(endpoint: Callable) -> Optional[int]:
+    """Largest request body accepted by an upload endpoint, read per request so it follows the settings"""
+    if endpoint is ingest:
+        return MAX_UPLOAD_BYTES + FORM_OVERHEAD_BYTES
+    if endpoint is ingest_batch:
+        return MAX_BATCH_UPLOAD_BYTES + FORM_OVERHEAD_BYTES
+    return None
+
+class UploadLimitRoute(APIRoute):
+    """
+    Rejects oversized uploads before the form is parsed, so they are never spooled
+    Checks Content-Length up front and counts the bytes of requests sent without it
+    """
+
+    def get_route_handler(self) -> Callable:
+        handler = super().get_route_handler()
+
+        async def limited_handler(request: Request):
+            max_bytes = request_body_limit(self.endpoint)
+            if max_bytes is None:
+                return await handler(request)
+            
+            declared = request.headers.get("content-length")
+            if declared and declared.isdigit() and int(declared) > max_bytes:
+                raise HTTPException(status_code=413, detail=f"Request exceeds {max_bytes} bytes")
+            
+            received = 0
+            async def receive():
+                nonlocal received
+                message = await request.receive()
+                received += len(message.get("body", b""))
+                if received > max_bytes:
+                    raise HTTPException(status_code=413, detail=f"Request exceeds {max_bytes} bytes")
+                return message
+            
+            return await handler(Request(request.scope, receive))
+
+        return limited_handler
+
+router = APIRouter(route_class=UploadLimitRoute)
+
+def sniff_extension(head: bytes) -> Optional[str]:
+    """Detect the document type from the first bytes of an upload"""
+    for signature, extension in UPLOAD_SIGNATURES:
+        if head.startswith(signature):
+            return extension
+    return None
+
+def is_docx(path: str) -> bool:
+    """A zip file is only a DOCX when it holds the main document part"""
+    try:
+        with zipfile.ZipFile(path) as package:
+            package.getinfo("word/document.xml")
+        return True
+    except (zipfile.BadZipFile, KeyError):
+        return False
+
+def save_stream(stream: BinaryIO, path_prefix: str, max_bytes: Optional[int] = None) -> Tuple[str, str]:
+    """
+    Copy a binary stream to disk in chunks, enforcing the upload size limit
+    Returns the saved path (extension from the sniffed type) and the SHA-256 of the content
+    """
+    max_bytes = max_bytes or MAX_UPLOAD_BYTES
+    chunk = stream.read(UPLOAD_CHUNK_SIZE)
+    if not chunk:
+        raise HTTPException(status_code=400, detail="Uploaded file is empty")
+    extension = sniff_extension(chunk)
+    if not extension:
+        raise HTTPException(status_code=415, detail="Unsupported file type, upload a PDF or DOCX")
+    
+    saved_path = f"{path_prefix}{extension}"
+    digest = hashlib.sha256()
+    size = 0
+    try:
+        with open(saved_path, "wb") as f:
+            while chunk:
+                size += len(chunk)
+                if size > max_bytes:
+                    raise HTTPException(status_code=413, detail=f"File exceeds {max_bytes} bytes")
+                digest.update(chunk)
+                f.write(chunk)
+                chunk = stream.read(UPLOAD_CHUNK_SIZE)
+        # Any zip starts like a DOCX, its central directory is at the end of the file
+        if extension == ".docx" and not is_docx(saved_path):
+            raise HTTPException(status_code=415, detail="Unsupported file type, upload a PDF or DOCX")
+    except Exception:
+        os.remove(saved_path)
+        raise
+    
+    return saved_path, digest.hexdigest()
+
+async def stream_upload(file: UploadFile, path_prefix: str) -> Tuple[str, str]:
+    """
+    Stream an upload to disk, enforcing MAX_UPLOAD_BYTES
+    Returns the saved path and the SHA-256 of the content
+    """
+    # The copy is blocking disk IO, keep it off the event loop
+    return await run_in_threadpool(save_stream, file.file, path_prefix)
+
+def normalize_urls(urls: Optional[str]) -> List[str]:
+    """Normalize the submitted URL list so equivalent submissions hash the same"""
+    if not urls:
+        return []
+    try:
+        url_list = json.loads(urls)
+    except json.JSONDecodeError:
+        return [urls.strip()]
+    if not isinstance(url_list, list):
+        url_list = [url_list]
+    
+    normalized = set()
+    for url in url_list:
+        parts = urlsplit(str(url).strip())
+        normalized.add(urlunsplit((
+            parts.scheme.lower(),
+            parts.netloc.lower(),
+            parts.path.rstrip("/"),
+            parts.query,
+            ""
+        )))
+    return sorted(normalized)
+
+def compute_content_hash(file_digest: Optional[str], urls: Optional[str], options: Dict[str, Any]) -> str:
+    """SHA-256 over the uploaded file digest, the normalized URL list and the options"""
+    key = json.dumps({
+        "file": file_digest,
+        "urls": normalize_urls(urls),
+        "options": options
+    }, sort_keys=True)
+    return hashlib.sha256(key.encode("utf-8")).hexdigest()
+
+def find_fresh_jobs(db, content_hashes: List[str]) -> Dict[str, Job]:
+    """
+    Find the latest finished job per content hash inside the freshness window, in one query
+    Dedup hits are skipped so reusing a profile never extends its freshness
+    """
+    if INGEST_DEDUP_TTL_SECONDS <= 0 or not content_hashes:
+        return {}
+    cutoff = datetime.utcnow() - timedelta(seconds=INGEST_DEDUP_TTL_SECONDS)
+    jobs = db.query(Job).filter(
+        Job.content_hash.in_(set(content_hashes)),
+        Job.status == "done",
+        Job.profile_id.isnot(None),
+        Job.source_job_id.is_(None),
+        Job.updated_at >= cutoff
+    ).order_by(Job.updated_at.asc()).all()
+    # Later rows overwrite earlier ones, leaving the newest job per hash
+    return {job.content_hash: job for job in jobs}
+
+def find_fresh_job(db, content_hash: str) -> Optional[Job]:
+    """Find the latest finished job for the same content inside the freshness window"""
+    return find_fresh_jobs(db, [content_hash]).get(content_hash)
 
 @router.post("/ingest", response_model=IngestResponse)
 async def ingest(
     file: UploadFile = File(None),
     urls: str = Form(None),
-    options: str = Form("{}")
+    options: str = Form("{}"),
+    force_refresh: bool = Form(False)
 ):
     job_id = uuid4()  # Generate UUID object
     
@@ -23,26 +211,226 @@ async def ingest(
     except json.JSONDecodeError:
         raise HTTPException(status_code=400, detail="Invalid options JSON")
     
-    # Persist job
-    db = SessionLocal()
-    job = Job(
-        id=job_id,  # Use UUID object
-        status="queued",
-        payload={"urls": urls, "options": options_dict},
-        created_at=datetime.utcnow()
-    )
-    db.add(job)
-    db.commit()
-    
-    # Save file temporarily if provided
-    saved_path = None
+    # Stream the file to disk, hashing it on the way
+    saved_path, file_digest = None, None
     if file:
-        saved_path = f"/tmp/{job_id}_{file.filename}"
-        with open(saved_path, "wb") as f:
-            f.write(await file.read())
+        saved_path, file_digest = await stream_upload(file, os.path.join(UPLOAD_DIR, str(job_id)))
+    content_hash = compute_content_hash(file_digest, urls, options_dict)
+    
+    db = SessionLocal()
+    try:
+        # Reuse the profile of an identical recent submission
+        cached_job = None if force_refresh else find_fresh_job(db, content_hash)
+        if cached_job:
+            job = Job(
+                id=job_id,
+                status="done",
+                payload={"urls": urls, "options": options_dict},
+                profile_id=cached_job.profile_id,
+                source_job_id=cached_job.id,
+                content_hash=content_hash,
+                created_at=datetime.utcnow()
+            )
+            db.add(job)
+            db.commit()
+            publish_job_status(job_id, "done")
+            if saved_path:
+                os.remove(saved_path)
+            return IngestResponse(jobId=str(job_id), estimatedSeconds=0)
+        
+        # Persist job
+        job = Job(
+            id=job_id,  # Use UUID object
+            status="queued",
+            payload={"urls": urls, "options": options_dict},
+            content_hash=content_hash,
+            created_at=datetime.utcnow()
+        )
+        db.add(job)
+        db.commit()
+    finally:
+        db.close()
     
     # Enqueue Celery task
     process_ingest_job.delay(str(job_id), saved_path, urls, options)  # Pass string to Celery
     
-    db.close()
     return IngestResponse(jobId=str(job_id), estimatedSeconds=45)
+
+def _save_batch_files(files: List[UploadFile], batch_id) -> Tuple[List[Tuple[str, str, str]], List[BatchFileRejection]]:
+    """
+    Save every CV of a batch upload, expanding zip archives member by member
+    Files written across the batch are capped at MAX_BATCH_UPLOAD_BYTES after decompression
+    Returns (filename, saved_path, digest) for accepted files and the rejected ones
+    """
+    accepted, rejected = [], []
+    written = 0
+    
+    def save(filename: str, stream: BinaryIO, declared_size: Optional[int]):
+        nonlocal written
+        if len(accepted) >= MAX_BATCH_FILES:
+            rejected.append(BatchFileRejection(filename=filename, error=f"Batch is limited to {MAX_BATCH_FILES} files"))
+            return
+        if declared_size and declared_size > MAX_UPLOAD_BYTES:
+            rejected.append(BatchFileRejection(filename=filename, error=f"File exceeds {MAX_UPLOAD_BYTES} bytes"))
+            return
+        remaining = MAX_BATCH_UPLOAD_BYTES - written
+        if remaining <= 0 or (declared_size and declared_size > remaining):
+            rejected.append(BatchFileRejection(filename=filename, error=f"Batch exceeds {MAX_BATCH_UPLOAD_BYTES} bytes"))
+            return
+        # Declared zip sizes can lie, so the limit is enforced on the bytes actually written
+        max_bytes = min(MAX_UPLOAD_BYTES, remaining)
+        try:
+            saved_path, digest = save_stream(stream, os.path.join(UPLOAD_DIR, f"{batch_id}_{len(accepted)}"), max_bytes)
+        except HTTPException as e:
+            error = e.detail
+            if e.status_code == 413 and max_bytes < MAX_UPLOAD_BYTES:
+                error = f"Batch exceeds {MAX_BATCH_UPLOAD_BYTES} bytes"
+            rejected.append(BatchFileRejection(filename=filename, error=error))
+            return
+        written += os.path.getsize(saved_path)
+        accepted.append((filename, saved_path, digest))
+    
+    for file in files:
+        filename = file.filename or "upload"
+        if not filename.lower().endswith(".zip"):
+            save(filename, file.file, getattr(file, "size", None))
+            continue
+        
+        try:
+            with zipfile.ZipFile(file.file) as archive:
+                for member in archive.infolist():
+                    if member.is_dir() or member.filename.startswith("__MACOSX/"):
+                        continue
+                    with archive.open(member) as stream:
+                        save(member.filename, stream, member.file_size)
+        except zipfile.BadZipFile:
+            rejected.append(BatchFileRejection(filename=filename, error="Invalid zip archive"))
+    
+    return accepted, rejected
+
+@router.post("/ingest/batch", response_model=IngestBatchResponse)
+async def ingest_batch(
+    files: List[UploadFile] = File(...),
+    options: str = Form("{}"),
+    force_refresh: bool = Form(False)
+):
+    """
+    Ingest many CVs at once, from a zip archive or a multipart list of files
+    Creates one batch record and fans out a process_ingest_job task per CV
+    """
+    try:
+        options_dict = json.loads(options) if options else {}
+    except json.JSONDecodeError:
+        raise HTTPException(status_code=400, detail="Invalid options JSON")
+    
+    batch_id = uuid4()
+    accepted, rejected = await run_in_threadpool(_save_batch_files, files, batch_id)
+    if not accepted:
+        raise HTTPException(status_code=400, detail={
+            "message": "No supported files in batch",
+            "rejected": [{"filename": r.filename, "error": r.error} for r in rejected]
+        })
+    
+    content_hashes = [compute_content_hash(digest, None, options_dict) for _, _, digest in accepted]
+    
+    db = SessionLocal()
+    try:
+        cached_jobs = {} if force_refresh else find_fresh_jobs(db, content_hashes)
+        
+        batch = IngestBatch(id=batch_id, total_files=len(accepted), options=options_dict)
+        db.add(batch)
+        
+        jobs, to_process, finished = [], [], []
+        for (filename, saved_path, _), content_hash in zip(accepted, content_hashes):
+            cached_job = cached_jobs.get(content_hash)
+            job = Job(
+                id=uuid4(),
+                status="done" if cached_job else "queued",
+                payload={"filename": filename, "options": options_dict},
+                profile_id=cached_job.profile_id if cached_job else None,
+                source_job_id=cached_job.id if cached_job else None,
+                content_hash=content_hash,
+                batch_id=batch_id,
+                created_at=datetime.utcnow()
+            )
+            jobs.append(job)
+            if cached_job:
+                os.remove(saved_path)
+                finished.append(job.id)
+            else:
+                to_process.append((job.id, saved_path))
+        
+        # All jobs of the batch in one commit
+        job_ids = [str(job.id) for job in jobs]
+        db.add_all(jobs)
+        db.commit()
+    except Exception:
+        # No job will ever pick the saved files up
+        for _, saved_path, _ in accepted:
+            if os.path.exists(saved_path):
+                os.remove(saved_path)
+        raise
+    finally:
+        db.close()
+    
+    # Jobs served from the cache are finished already, tell their subscribers
+    for job_id in finished:
+        publish_job_status(job_id, "done")
+    
+    # Fan out one task per CV
+    if to_process:
+        group(
+            process_ingest_job.s(str(job_id), saved_path, None, options)
+            for job_id, saved_path in to_process
+        ).apply_async()
+    
+    return IngestBatchResponse(
+        batchId=str(batch_id),
+        jobIds=job_ids,
+        rejected=rejected,
+        estimatedSeconds=45 if to_process else 0
+    )
+
+@router.get("/ingest/batch/{batch_id}", response_model=IngestBatchStatus)
+async def get_batch_status(batch_id: str):
+    """Aggregate progress and per-file results of a batch"""
+    try:
+        batch_uuid = UUID(batch_id)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid batch ID format")
+    
+    db = SessionLocal()
+    try:
+        batch = db.query(IngestBatch).filter(IngestBatch.id == batch_uuid).first()
+        if not batch:
+            raise HTTPException(status_code=404, detail="Batch not found")
+        
+        jobs = db.query(
+            Job.id, Job.status, Job.profile_id, Job.payload, Job.error
+        ).filter(Job.batch_id == batch_uuid).all()
+    finally:
+        db.close()
+    
+    counts = {}
+    for job in jobs:
+        counts[job.status] = counts.get(job.status, 0) + 1
+    
+    finished = sum(counts.get(status, 0) for status in TERMINAL_STATUSES)
+    progress = sum(100 if job.status in TERMINAL_STATUSES else JOB_PROGRESS.get(job.status, 0) for job in jobs)
+    
+    return IngestBatchStatus(
+        batchId=batch_id,
+        status="done" if finished == len(jobs) else "processing",
+        total=len(jobs),
+        counts=counts,
+        progress=round(progress / len(jobs)) if jobs else 100,
+        files=[
+            BatchFileResult(
+                jobId=str(job.id),
+                filename=(job.payload or {}).get("filename"),
+                status=job.status,
+                profileId=str(job.profile_id) if job.profile_id else None,
+                error=job.error
+            ) for job in jobs
+        ]
+    )
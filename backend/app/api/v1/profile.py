@@ -1,12 +1,27 @@
 from fastapi import APIRouter, HTTPException
+from fastapi.responses import StreamingResponse
 from app.core.db import SessionLocal
+from app.core.events import get_job_events, job_event, JOB_PROGRESS, TERMINAL_STATUSES
 from app.core.models import Job, Profile, Skill, Evidence
-from app.core.schemas import JobStatus, ProfileResponse, EvidenceSchema, SkillSchema
+from app.core.schemas import (
+    JobStatus, ProfileResponse, EvidenceSchema, SkillSchema,
+    ProfileHighlights, SkillHighlights, MentionSpan
+)
+from app.services.mention_index import mention_counts, unpack_mentions
+from app.services.skill_ontology import SkillOntology, get_ontology
 import json
+import os
+import time
+from typing import Any, Dict, Optional, Tuple
 from uuid import UUID
 
 router = APIRouter()
 
+# SSE streams send a keepalive comment when idle and close after a while;
+# EventSource clients reconnect on their own
+SSE_KEEPALIVE_SECONDS = float(os.getenv("SSE_KEEPALIVE_SECONDS", "15"))
+SSE_MAX_STREAM_SECONDS = float(os.getenv("SSE_MAX_STREAM_SECONDS", "600"))
+
 @router.get("/status/{job_id}", response_model=JobStatus)
 async def get_job_status(job_id: str):
     db = SessionLocal()
@@ -21,58 +36,123 @@ async def get_job_status(job_id: str):
         if not job:
             raise HTTPException(status_code=404, detail="Job not found")
         
-        progress_map = {
-            "queued": 0,
-            "parsing": 25,
-            "extracting": 50,
-            "inferring": 75,
-            "scoring": 90,
-            "done": 100,
-            "error": -1
-        }
-        
         return JobStatus(
             jobId=job_id,
             status=job.status,
-            progress=progress_map.get(job.status, 0),
-            message=f"Processing job: {job.status}"
+            progress=JOB_PROGRESS.get(job.status, 0),
+            message=f"Processing job: {job.status}",
+            stageTimings=job.stage_timings
         )
     finally:
         db.close()
 
-@router.get("/profile/{job_id}", response_model=ProfileResponse)
-async def get_profile(job_id: str):
-    db = SessionLocal()
+@router.get("/status/{job_id}/stream")
+async def stream_job_status(job_id: str):
+    """Push job status transitions as server-sent events; the database is read at most once, when no event is cached"""
     try:
+        job_id = str(UUID(job_id))
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid job ID format")
+    
+    def current_event() -> Optional[Dict[str, Any]]:
+        # Jobs without a published event (created done, or expired) are read once from the database
+        db = SessionLocal()
         try:
-            job_uuid = UUID(job_id)
-        except ValueError:
-            raise HTTPException(status_code=400, detail="Invalid job ID format")
-            
-        job = db.query(Job).filter(Job.id == job_uuid).first()
-        
-        if not job:
-            raise HTTPException(status_code=404, detail="Job not found")
+            job = db.query(Job.status, Job.error).filter(Job.id == UUID(job_id)).first()
+        finally:
+            db.close()
+        return job_event(job_id, job.status, job.error) if job else None
+    
+    async def event_stream():
+        closes_at = time.monotonic() + SSE_MAX_STREAM_SECONDS
+        events = get_job_events().subscribe(job_id, timeout=SSE_KEEPALIVE_SECONDS, fallback=current_event)
+        async for event in events:
+            if event is None:
+                if time.monotonic() >= closes_at:
+                    return
+                yield ": keepalive\n\n"
+                continue
+            yield f"event: status\ndata: {json.dumps(event)}\n\n"
+            if event["status"] in TERMINAL_STATUSES:
+                return
+    
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+def load_job_profile(db, job_id: str) -> Tuple[Job, Profile]:
+    """Look up a job and its (possibly provisional) profile, raising HTTP errors"""
+    try:
+        job_uuid = UUID(job_id)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid job ID format")
         
+    job = db.query(Job).filter(Job.id == job_uuid).first()
+    
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+    
+    # A provisional profile is published once extraction finishes
+    if not job.profile_id:
         if job.status != "done":
             raise HTTPException(status_code=202, detail="Profile not ready yet")
-        
-        if not job.profile_id:
-            raise HTTPException(status_code=404, detail="Profile not found")
-        
-        profile = db.query(Profile).filter(Profile.id == job.profile_id).first()
-        
-        if not profile:
-            raise HTTPException(status_code=404, detail="Profile not found")
+        raise HTTPException(status_code=404, detail="Profile not found")
+    
+    profile = db.query(Profile).filter(Profile.id == job.profile_id).first()
+    
+    if not profile:
+        raise HTTPException(status_code=404, detail="Profile not found")
+    return job, profile
+
+def skill_graph(ontology: SkillOntology, skill_evidence_map: Dict[Any, Dict[str, Any]], ontology_index: Dict[Any, int]) -> Dict[str, Any]:
+    """The profile's skills as nodes, linked where the ontology relates them
+    
+    Edges come from each skill's precomputed neighbourhood, so this is linear
+    in the number of edges and runs no queries. "ancestor" edges skip
+    intermediate skills the profile does not have.
+    """
+    nodes = [
+        {"id": str(skill_id), "name": data['skill'].name, "type": data['skill'].type}
+        for skill_id, data in skill_evidence_map.items()
+    ]
+    skill_at = {index: skill_id for skill_id, index in ontology_index.items()}
+    edges = []
+    for skill_id, index in ontology_index.items():
+        parents = ontology.neighbours(index, "parent")
+        linked = []
+        for target in ontology.neighbours(index, "ancestor"):
+            # Only the nearest ancestors the profile has; farther ones are reachable through them
+            if target in skill_at and not any(target in ontology.neighbours(other, "ancestor") for other in linked):
+                linked.append(target)
+                kind = "parent" if target in parents else "ancestor"
+                edges.append({"source": str(skill_id), "target": str(skill_at[target]), "type": kind})
+        for target in ontology.neighbours(index, "related"):
+            # Related edges are symmetric: emit each pair once
+            if target in skill_at and index < target:
+                edges.append({"source": str(skill_id), "target": str(skill_at[target]), "type": "related"})
+    return {"nodes": nodes, "edges": edges}
+
+@router.get("/profile/{job_id}", response_model=ProfileResponse)
+async def get_profile(job_id: str):
+    db = SessionLocal()
+    try:
+        job, profile = load_job_profile(db, job_id)
+        mention_counts_by_skill = mention_counts(profile.mention_index)
         
         # Get skills and evidence
         skills_data = []
         evidence_list = db.query(Evidence).filter(Evidence.profile_id == profile.id).all()
         
-        # Group evidence by skill
+        # Group evidence by skill, loading every skill in one IN query
+        skills_by_id = {
+            skill.id: skill
+            for skill in db.query(Skill).filter(Skill.id.in_({ev.skill_id for ev in evidence_list})).all()
+        }
         skill_evidence_map = {}
         for ev in evidence_list:
-            skill = db.query(Skill).filter(Skill.id == ev.skill_id).first()
+            skill = skills_by_id.get(ev.skill_id)
             if skill:
                 if skill.id not in skill_evidence_map:
                     skill_evidence_map[skill.id] = {
@@ -81,6 +161,15 @@ async def get_profile(job_id: str):
                     }
                 skill_evidence_map[skill.id]['evidence'].append(ev)
         
+        ontology = get_ontology()
+        # Ontology position of each profile skill; rows predating ontology_ref resolve by name
+        ontology_index = {}
+        for skill_id, data in skill_evidence_map.items():
+            skill = data['skill']
+            index = ontology.index_of_id(skill.ontology_ref) if skill.ontology_ref else ontology.index_of(skill.name)
+            if index is not None:
+                ontology_index[skill_id] = index
+        
         # Build skills response
         for skill_id, data in skill_evidence_map.items():
             skill = data['skill']
@@ -99,13 +188,15 @@ async def get_profile(job_id: str):
             # Calculate overall confidence
             avg_confidence = sum(ev.confidence_weight for ev in evidence_items) / len(evidence_items)
             
+            index = ontology_index.get(skill_id)
             skills_data.append(SkillSchema(
                 id=str(skill.id),
                 name=skill.name,
                 type=skill.type,
                 confidence=round(avg_confidence, 2),
                 evidence=evidence_schemas,
-                related=[]  # Would be populated with related skills
+                related=[ontology.names[i] for i in ontology.neighbours(index)] if index is not None else [],
+                mentions=mention_counts_by_skill.get(skill.name, 0)
             ))
         
         # Parse top skills
@@ -120,8 +211,37 @@ async def get_profile(job_id: str):
             summary=profile.summary,
             topSkills=top_skills,
             skills=skills_data,
-            graph={"nodes": [], "edges": []},  # Would be populated with graph data
-            personaScores={"developer": 0.8, "product": 0.2}  # Would be calculated
+            graph=skill_graph(ontology, skill_evidence_map, ontology_index),
+            personaScores={"developer": 0.8, "product": 0.2},  # Would be calculated
+            partial=job.status != "done"
+        )
+    finally:
+        db.close()
+
+@router.get("/profile/{job_id}/highlights", response_model=ProfileHighlights)
+async def get_profile_highlights(job_id: str, skill: Optional[str] = None):
+    """Every mention span of the profile's skills, served from the packed index"""
+    db = SessionLocal()
+    try:
+        _, profile = load_job_profile(db, job_id)
+        sources = (profile.source_manifest or {}).get("sources", [])
+        mentions = unpack_mentions(profile.mention_index)
+        if skill is not None:
+            mentions = {skill: mentions.get(skill, [])}
+        
+        return ProfileHighlights(
+            profileId=str(profile.id),
+            sources=sources,
+            skills=[
+                SkillHighlights(
+                    skill=name,
+                    count=len(spans),
+                    spans=[
+                        MentionSpan(source=sources[source] if source < len(sources) else str(source), start=start, end=end)
+                        for start, end, source in spans
+                    ]
+                ) for name, spans in mentions.items()
+            ]
         )
     finally:
         db.close()
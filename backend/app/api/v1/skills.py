@@ -0,0 +1,17 @@
+"""
+Skill lookup endpoints
+"""
+from fastapi import APIRouter, Query
+from app.core.schemas import SkillSearchResponse
+from app.services.skill_search import get_skill_search, MAX_RESULTS
+
+router = APIRouter()
+
+@router.get("/search", response_model=SkillSearchResponse)
+def search_skills(
+    q: str = Query("", max_length=100),
+    limit: int = Query(10, ge=1, le=MAX_RESULTS)
+):
+    """Type-ahead suggestions: prefix matches on names, aliases and words, then typo-tolerant matches"""
+    # Plain def: the lookup is CPU-only and sub-millisecond, and the first call may build the index
+    return SkillSearchResponse(query=q, results=get_skill_search().search(q, limit))
@@ -1,4 +1,5 @@
-from sqlalchemy import create_engine
+from typing import List
+from sqlalchemy import create_engine, inspect, text
 from sqlalchemy.orm import sessionmaker
 from app.core.models import Base
 import os
@@ -23,3 +24,31 @@ def get_db():
 
 def create_tables():
     Base.metadata.create_all(bind=engine)
+
+def upgrade_tables(bind=engine) -> List[str]:
+    """
+    Bring a database created by an earlier release up to the models
+    create_all only creates missing tables, so columns added to existing tables
+    are added here, with their foreign keys and indexes. New columns must be
+    nullable. Safe to run repeatedly; returns the columns added.
+    """
+    Base.metadata.create_all(bind=bind)
+    existing = {table: {column["name"] for column in inspect(bind).get_columns(table)}
+                for table in Base.metadata.tables}
+    quote = bind.dialect.identifier_preparer
+    added = []
+    with bind.begin() as conn:
+        for table in Base.metadata.sorted_tables:
+            for column in table.columns:
+                if column.name in existing[table.name]:
+                    continue
+                ddl = (f"ALTER TABLE {quote.format_table(table)} ADD COLUMN "
+                       f"{quote.format_column(column)} {column.type.compile(bind.dialect)}")
+                for foreign_key in column.foreign_keys:
+                    target = foreign_key.column
+                    ddl += f" REFERENCES {quote.format_table(target.table)} ({quote.format_column(target)})"
+                conn.execute(text(ddl))
+                added.append(f"{table.name}.{column.name}")
+            for index in table.indexes:
+                index.create(conn, checkfirst=True)
+    return added
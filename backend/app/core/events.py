@@ -0,0 +1,143 @@
+"""
+Job progress events published by the ingest worker and pushed to SSE clients
+Uses Redis pub/sub across processes, or an in-process broker for tests
+"""
+import os
+import json
+import asyncio
+import threading
+from typing import Dict, Any, List, Optional, AsyncIterator, Callable, Tuple
+
+JOB_PROGRESS = {
+    "queued": 0,
+    "parsing": 25,
+    "extracting": 50,
+    "inferring": 75,
+    "scoring": 90,
+    "done": 100,
+    "error": -1
+}
+TERMINAL_STATUSES = {"done", "error"}
+
+# Last event per job is kept so late subscribers get the current state
+LAST_EVENT_TTL_SECONDS = 3600
+
+# Called when a job has no last event (it expired, or was never published) to load its current state
+EventFallback = Callable[[], Optional[Dict[str, Any]]]
+
+def job_event(job_id: str, status: str, error: Optional[str] = None) -> Dict[str, Any]:
+    """Build the event payload for a job status transition"""
+    event = {
+        "jobId": str(job_id),
+        "status": status,
+        "progress": JOB_PROGRESS.get(status, 0),
+        "message": f"Processing job: {status}"
+    }
+    if error:
+        event["error"] = error
+    return event
+
+class InMemoryJobEvents:
+    """Single-process broker, used for tests and when Redis is not configured"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._subscribers: Dict[str, List[Tuple[asyncio.AbstractEventLoop, asyncio.Queue]]] = {}
+        self._last: Dict[str, Dict[str, Any]] = {}
+
+    def publish(self, job_id: str, event: Dict[str, Any]):
+        with self._lock:
+            self._last[job_id] = event
+            subscribers = list(self._subscribers.get(job_id, []))
+        for loop, queue in subscribers:
+            loop.call_soon_threadsafe(queue.put_nowait, event)
+
+    async def subscribe(
+        self, job_id: str, timeout: float, fallback: Optional[EventFallback] = None
+    ) -> AsyncIterator[Optional[Dict[str, Any]]]:
+        """Yield events for a job as they arrive, or None after `timeout` idle seconds"""
+        queue = asyncio.Queue()
+        subscriber = (asyncio.get_running_loop(), queue)
+        with self._lock:
+            self._subscribers.setdefault(job_id, []).append(subscriber)
+            last = self._last.get(job_id)
+        try:
+            if not last and fallback:
+                last = await asyncio.to_thread(fallback)
+            if last:
+                yield last
+            while True:
+                try:
+                    yield await asyncio.wait_for(queue.get(), timeout)
+                except asyncio.TimeoutError:
+                    yield None
+        finally:
+            with self._lock:
+                self._subscribers[job_id].remove(subscriber)
+
+class RedisJobEvents:
+    """Redis pub/sub broker shared by the API and Celery workers"""
+
+    def __init__(self, url: str):
+        import redis
+        import redis.asyncio
+        self.url = url
+        self.client = redis.Redis.from_url(url)
+        self.async_client = redis.asyncio.Redis.from_url(url)
+
+    @staticmethod
+    def _channel(job_id: str) -> str:
+        return f"job-events:{job_id}"
+
+    @staticmethod
+    def _last_key(job_id: str) -> str:
+        return f"job-events:{job_id}:last"
+
+    def publish(self, job_id: str, event: Dict[str, Any]):
+        data = json.dumps(event)
+        pipe = self.client.pipeline()
+        pipe.set(self._last_key(job_id), data, ex=LAST_EVENT_TTL_SECONDS)
+        pipe.publish(self._channel(job_id), data)
+        pipe.execute()
+
+    async def subscribe(
+        self, job_id: str, timeout: float, fallback: Optional[EventFallback] = None
+    ) -> AsyncIterator[Optional[Dict[str, Any]]]:
+        """Yield events for a job as they arrive, or None after `timeout` idle seconds"""
+        pubsub = self.async_client.pubsub()
+        # Subscribe before reading the last event so no transition is missed
+        await pubsub.subscribe(self._channel(job_id))
+        try:
+            last = await self.async_client.get(self._last_key(job_id))
+            if last:
+                yield json.loads(last)
+            elif fallback:
+                current = await asyncio.to_thread(fallback)
+                if current:
+                    yield current
+            while True:
+                message = await pubsub.get_message(ignore_subscribe_messages=True, timeout=timeout)
+                yield json.loads(message["data"]) if message else None
+        finally:
+            await pubsub.unsubscribe(self._channel(job_id))
+            await pubsub.aclose()
+
+_job_events = None
+
+def get_job_events():
+    """Get the process-wide job event broker"""
+    global _job_events
+    if _job_events is None:
+        backend = os.getenv("JOB_EVENTS_BACKEND", "memory" if os.getenv("TESTING") else "redis")
+        if backend == "redis":
+            _job_events = RedisJobEvents(os.getenv("REDIS_URL", "redis://localhost:6379/0"))
+        else:
+            _job_events = InMemoryJobEvents()
+    return _job_events
+
+def publish_job_status(job_id: str, status: str, error: Optional[str] = None):
+    """Publish a status transition; delivery failures never fail the job"""
+    try:
+        get_job_events().publish(str(job_id), job_event(job_id, status, error))
+    except Exception as e:
+        print(f"Failed to publish event for job {job_id}: {e}")
@@ -0,0 +1,110 @@
+"""
+Opt-in process pool for the CPU-bound extraction of a single ingest job
+Each source of a job is extracted in its own pool process, so a multi-source
+job takes about as long as its largest source. Pool processes load the spaCy
+pipeline and the compiled matchers once, in the pool initializer, and live as
+long as the worker process that created them.
+
+Celery prefork children are daemonic and cannot start processes of their own;
+enable the pool with `celery worker --pool threads` (or `--pool solo`). Any
+failure to start or use the pool falls back to in-process extraction.
+"""
+import os
+import time
+import threading
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Dict, Any, Optional, Tuple
+from app.core.timing import add_cpu_time
+
+EXTRACTION_POOL_ENABLED = os.getenv("EXTRACTION_POOL_ENABLED", "false").lower() == "true"
+EXTRACTION_POOL_WORKERS = int(os.getenv("EXTRACTION_POOL_WORKERS", "0")) or os.cpu_count() or 1
+# "spawn" avoids forking a parent that already runs model threads
+EXTRACTION_POOL_START_METHOD = os.getenv("EXTRACTION_POOL_START_METHOD", "spawn")
+
+Extraction = Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]
+
+def _init_pool_process():
+    """Load and warm the extraction models once per pool process"""
+    from app.core.worker_bootstrap import WARMUP_TEXT
+    from app.services.nlp import get_nlp
+
+    get_nlp()
+    extract_source(WARMUP_TEXT)
+
+def extract_source(text: str, doc: Optional[Any] = None) -> Extraction:
+    """Explicit and implicit skills of one source text"""
+    from app.services.extractor import extract_explicit_skills, infer_implicit_skills
+
+    return extract_explicit_skills(text, doc), infer_implicit_skills(text)
+
+def _extract_source_timed(text: str) -> Tuple[Extraction, float]:
+    """Extract one source in a pool process, reporting the CPU time it took"""
+    cpu_start = time.thread_time()
+    result = extract_source(text)
+    return result, time.thread_time() - cpu_start
+
+_pool: Optional[ProcessPoolExecutor] = None
+_pool_lock = threading.Lock()
+
+def get_extraction_pool() -> ProcessPoolExecutor:
+    """Get this process's extraction pool, starting it on first use"""
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            if multiprocessing.current_process().daemon:
+                raise RuntimeError("daemonic processes cannot start an extraction pool")
+            _pool = ProcessPoolExecutor(
+                max_workers=EXTRACTION_POOL_WORKERS,
+                mp_context=multiprocessing.get_context(EXTRACTION_POOL_START_METHOD),
+                initializer=_init_pool_process
+            )
+        return _pool
+
+def shutdown_extraction_pool():
+    """Stop the pool; the next pooled extraction starts a fresh one"""
+    global _pool
+    with _pool_lock:
+        pool, _pool = _pool, None
+    if pool is not None:
+        pool.shutdown(wait=False, cancel_futures=True)
+
+def extract_sources(texts: List[str], use_pool: Optional[bool] = None) -> List[Extraction]:
+    """
+    Extract every source of a job; results keep input order
+    Cached sources are served from the extraction cache and only the rest are
+    extracted, in parallel when the pool is enabled
+    """
+    from app.services.extraction_cache import get_extraction_cache, extraction_cache_key
+
+    cache = get_extraction_cache()
+    keys = [extraction_cache_key("sources", text) for text in texts]
+    results = [cache.get(key) for key in keys]
+    missing = [i for i, result in enumerate(results) if result is None]
+    if missing:
+        extracted = _extract_uncached([texts[i] for i in missing], use_pool)
+        for i, result in zip(missing, extracted):
+            results[i] = cache.set(keys[i], result)
+    return [tuple(result) for result in results]
+
+def _extract_uncached(texts: List[str], use_pool: Optional[bool]) -> List[Extraction]:
+    use_pool = EXTRACTION_POOL_ENABLED if use_pool is None else use_pool
+    if use_pool and len(texts) > 1:
+        try:
+            pool = get_extraction_pool()
+            # Largest sources first, so the longest one never starts last
+            order = sorted(range(len(texts)), key=lambda i: len(texts[i]), reverse=True)
+            futures = {i: pool.submit(_extract_source_timed, texts[i]) for i in order}
+            timed = [futures[i].result() for i in range(len(texts))]
+            # Pool processes are invisible to the task's own CPU clock
+            add_cpu_time(sum(cpu for _, cpu in timed))
+            return [result for result, _ in timed]
+        except Exception as e:
+            print(f"Extraction pool failed, extracting in process: {e}")
+            shutdown_extraction_pool()
+
+    from app.services.nlp import parse_documents
+
+    # Parse every source in one batched spaCy pass, shared by both consumers
+    docs = parse_documents(texts)
+    return [extract_source(text, doc) for text, doc in zip(texts, docs)]
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, Integer, Float, Text, DateTime, ForeignKey, JSON, Enum, Boolean
+from sqlalchemy import Column, String, Integer, Float, Text, DateTime, ForeignKey, JSON, Enum, Boolean, LargeBinary
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
@@ -60,6 +60,17 @@ class Job(Base):
     profile_id = Column(UUID(as_uuid=True), nullable=True)
     payload = Column(JSON)
     error = Column(Text, nullable=True)
+    content_hash = Column(String(64), nullable=True, index=True)  # Dedup key for identical submissions
+    stage_timings = Column(JSON, nullable=True)  # Wall/CPU time and item counts per pipeline stage
+    batch_id = Column(UUID(as_uuid=True), ForeignKey('ingest_batches.id'), nullable=True, index=True)
+    source_job_id = Column(UUID(as_uuid=True), ForeignKey('jobs.id'), nullable=True)  # Job whose profile a dedup hit reuses
+
+class IngestBatch(Base):
+    __tablename__ = "ingest_batches"
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    total_files = Column(Integer, nullable=False)
+    options = Column(JSON)
+    created_at = Column(DateTime, default=datetime.utcnow)
 
 class Profile(Base):
     __tablename__ = "profiles"
@@ -70,6 +81,8 @@ class Profile(Base):
     generated_at = Column(DateTime, default=datetime.utcnow)
     source_manifest = Column(JSON)
     top_skills = Column(JSON)
+    # Packed spans of every skill mention (app.services.mention_index)
+    mention_index = Column(LargeBinary, nullable=True)
 
 class Skill(Base):
     __tablename__ = "skills"
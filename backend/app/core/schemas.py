@@ -10,11 +10,37 @@ class IngestResponse(BaseModel):
     jobId: str
     estimatedSeconds: int
 
+class BatchFileRejection(BaseModel):
+    filename: str
+    error: str
+
+class IngestBatchResponse(BaseModel):
+    batchId: str
+    jobIds: List[str]
+    rejected: List[BatchFileRejection]
+    estimatedSeconds: int
+
+class BatchFileResult(BaseModel):
+    jobId: str
+    filename: Optional[str] = None
+    status: str
+    profileId: Optional[str] = None
+    error: Optional[str] = None
+
+class IngestBatchStatus(BaseModel):
+    batchId: str
+    status: str
+    total: int
+    counts: Dict[str, int]
+    progress: int
+    files: List[BatchFileResult]
+
 class JobStatus(BaseModel):
     jobId: str
     status: str
     progress: int
     message: str
+    stageTimings: Optional[Dict[str, Any]] = None
 
 class EvidenceSchema(BaseModel):
     id: str
@@ -30,6 +56,7 @@ class SkillSchema(BaseModel):
     confidence: float
     evidence: List[EvidenceSchema]
     related: List[str]
+    mentions: int = 0
 
 class ProfileResponse(BaseModel):
     profileId: str
@@ -39,6 +66,34 @@ class ProfileResponse(BaseModel):
     skills: List[SkillSchema]
     graph: Dict[str, Any]
     personaScores: Dict[str, float]
+    partial: bool = False
+
+class MentionSpan(BaseModel):
+    source: str
+    start: int
+    end: int
+
+class SkillHighlights(BaseModel):
+    skill: str
+    count: int
+    spans: List[MentionSpan]
+
+class ProfileHighlights(BaseModel):
+    profileId: str
+    sources: List[str]
+    skills: List[SkillHighlights]
+
+class SkillSuggestion(BaseModel):
+    id: str
+    name: str
+    type: str
+    popularity: int
+    match: str
+    score: float
+
+class SkillSearchResponse(BaseModel):
+    query: str
+    results: List[SkillSuggestion]
 
 class SuggestBulletsRequest(BaseModel):
     profileId: str
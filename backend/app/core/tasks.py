@@ -1,127 +1,258 @@
 import os
 import json
 import uuid
+from typing import List, Dict, Any, Optional, Tuple
 from celery import Celery
+from celery.signals import worker_init
+from sqlalchemy import insert
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 from app.core.db import SessionLocal
 from app.core.models import Job, Profile, Skill, Evidence
-from app.services.parser import parse_file, fetch_urls_text
-from app.services.extractor import extract_explicit_skills, infer_implicit_skills
-from app.services.embeddings import embed_text, upsert_embedding, cosine_similarity, get_skill_embeddings
-from app.services.skill_ontology import get_local_skills
+from app.core.events import publish_job_status
+from app.core.timing import StageTimer
+from app.core.worker_bootstrap import preload_models, WORKER_PRELOAD_MODELS
+from app.core.extraction_pool import extract_sources
+from app.services.parser import parse_file, fetch_urls_concurrently
+from app.services.embeddings import upsert_embeddings
+from app.services.skill_ontology import get_ontology, canonical_skill_name
 from app.services.llm_provider import get_llm_provider
+from app.services.rule_engine import get_rule_engine
+from app.services.extraction_cache import get_extraction_cache, sources_cache_key, normalize_text
+from app.services.mention_index import collect_mentions, pack_mentions
 
 celery = Celery(__name__, broker=os.getenv("REDIS_URL", "redis://localhost:6379/0"))
 
+def _is_prefork_pool(pool_cls) -> bool:
+    """Whether a worker's pool setting (an alias such as "threads", or a class) resolves to prefork"""
+    from celery.concurrency import get_implementation
+    from celery.concurrency.prefork import TaskPool
+    try:
+        return issubclass(get_implementation(pool_cls or "prefork"), TaskPool)
+    except Exception:
+        return False
+
+@worker_init.connect
+def preload_worker_models(sender=None, **kwargs):
+    """Load models in the worker parent before the pool forks its children"""
+    if WORKER_PRELOAD_MODELS:
+        preload_models(getattr(sender, "concurrency", None), prefork=_is_prefork_pool(getattr(sender, "pool_cls", None)))
+
+def _source_type(source: str) -> str:
+    """Map an ingest source ("cv" or a URL) to an Evidence source_type"""
+    if source == "cv":
+        return "cv"
+    if "github.com" in source:
+        return "github"
+    if "linkedin.com" in source:
+        return "linkedin"
+    return "blog"
+
+def _skill_type(skill_name: str) -> str:
+    """Look up the ontology type of a skill, defaulting to hard skills"""
+    return get_ontology().skill_type(skill_name, "hard")
+
+def resolve_skill_ids(db, skill_items: List[Dict[str, Any]]) -> Dict[str, uuid.UUID]:
+    """Map skill names to Skill ids, creating missing skills in one bulk insert
+    
+    Aliases resolve to the row of their canonical skill ("k8s" -> "Kubernetes").
+    """
+    canonical_names = {}
+    skill_types = {}
+    for skill_data in skill_items:
+        skill_name = skill_data.get("skill", "")
+        if skill_name and skill_name not in canonical_names:
+            canonical = canonical_skill_name(skill_name)
+            canonical_names[skill_name] = canonical
+            skill_types.setdefault(canonical, _skill_type(canonical))
+    
+    if not skill_types:
+        return {}
+    
+    # One IN query for every name in the job
+    skill_ids = dict(
+        db.query(Skill.name, Skill.id).filter(Skill.name.in_(list(skill_types))).all()
+    )
+    
+    ontology = get_ontology()
+    missing = [
+        {"id": uuid.uuid4(), "name": name, "type": skill_type, "ontology_ref": ontology.skill_id(name)}
+        for name, skill_type in skill_types.items()
+        if name not in skill_ids
+    ]
+    if missing:
+        dialect = db.get_bind().dialect.name
+        if dialect == "postgresql":
+            stmt = pg_insert(Skill).values(missing).on_conflict_do_nothing(index_elements=["name"])
+        else:
+            # SQLite fallback (used by the test database)
+            stmt = sqlite_insert(Skill).values(missing).on_conflict_do_nothing(index_elements=["name"])
+        db.execute(stmt)
+        
+        # Re-read the ids: a concurrent job may have inserted some of the names first
+        skill_ids.update(
+            db.query(Skill.name, Skill.id).filter(Skill.name.in_([row["name"] for row in missing])).all()
+        )
+    
+    return {name: skill_ids[canonical] for name, canonical in canonical_names.items()}
+
+def persist_skill_evidence(db, profile_id, skill_items: List[Dict[str, Any]]) -> List[Tuple[Dict[str, Any], str, str]]:
+    """Resolve skills and write all Evidence rows for a profile in a single bulk insert
+    
+    Returns (evidence_row, skill_name, embedding_text) tuples for the rows written.
+    """
+    skill_ids = resolve_skill_ids(db, skill_items)
+    
+    evidence_rows = []
+    for skill_data in skill_items:
+        skill_name = skill_data.get("skill", "")
+        if not skill_name:
+            continue
+        
+        row = {
+            "id": uuid.uuid4(),
+            "profile_id": profile_id,
+            "skill_id": skill_ids[skill_name],
+            "source_type": skill_data.get("source_type", "cv"),
+            "snippet": skill_data.get("context", "")[:500],  # Limit length
+            "confidence_weight": skill_data.get("confidence", 0.5)
+        }
+        evidence_rows.append((row, skill_name, skill_data.get("context", skill_name)))
+    
+    if evidence_rows:
+        db.execute(insert(Evidence), [row for row, _, _ in evidence_rows])
+    
+    return evidence_rows
+
+def set_job_status(db, job: Job, status: str, timer: Optional[StageTimer] = None):
+    """Commit a job status transition and publish it to progress subscribers"""
+    job.status = status
+    if timer:
+        job.stage_timings = timer.snapshot()
+    db.commit()
+    publish_job_status(job.id, status, job.error)
+
+def persist_and_embed(db, profile_id, skill_items: List[Dict[str, Any]]) -> int:
+    """Persist evidence for a batch of extracted skills and store their embeddings
+    
+    Returns the number of evidence rows written.
+    """
+    evidence_rows = persist_skill_evidence(db, profile_id, skill_items)
+    
+    # Store embeddings for all evidence in one batch
+    upsert_embeddings([
+        (str(evidence_row["id"]), text, {"skill": skill_name, "profile_id": str(profile_id)})
+        for evidence_row, skill_name, text in evidence_rows
+    ])
+    return len(evidence_rows)
+
+def update_profile_summary(profile: Profile, explicit_skills: List[Dict[str, Any]], implicit_skills: List[Dict[str, Any]]):
+    """Refresh the profile summary and top skills from the skills found so far"""
+    profile.summary = f"Profile with {len(explicit_skills)} explicit and {len(implicit_skills)} implicit skills"
+    profile.top_skills = json.dumps([{
+        "name": skill.get("skill", ""),
+        "confidence": skill.get("confidence", 0.5)
+    } for skill in (explicit_skills + implicit_skills)[:5]])
+
 @celery.task(bind=True)
 def process_ingest_job(self, job_id, file_path, urls_json, options_json):
     db = SessionLocal()
-    job = db.query(Job).get(job_id)
+    job = db.query(Job).get(uuid.UUID(str(job_id)))
     if not job:
         print(f"Job {job_id} not found")
         return
     
+    timer = StageTimer()
+    # Extraction and the local provider scan each source once, for this job only
+    rule_engine = get_rule_engine()
+    rule_engine.share_scans()
     try:
-        job.status = "parsing"
-        db.commit()
+        set_job_status(db, job, "parsing", timer)
         
         # Parse inputs
-        texts = []
-        if file_path and os.path.exists(file_path):
-            text = parse_file(file_path)
-            texts.append(("cv", text))
-        
-        if urls_json:
-            try:
-                urls = json.loads(urls_json)
-                for url in urls:
-                    text = fetch_urls_text([url])
-                    texts.append((url, text))
-            except json.JSONDecodeError:
-                print("Invalid URLs JSON")
+        with timer.stage("parsing") as stats:
+            texts = []
+            if file_path and os.path.exists(file_path):
+                text = parse_file(file_path)
+                texts.append(("cv", text))
+            
+            if urls_json:
+                try:
+                    urls = json.loads(urls_json)
+                    texts.extend(fetch_urls_concurrently(urls))
+                except json.JSONDecodeError:
+                    print("Invalid URLs JSON")
+            # Canonical text: cache keys and mention offsets both refer to it
+            texts = [(source, normalize_text(text)) for source, text in texts]
+            stats["items"] = len(texts)
         
-        job.status = "extracting"
-        db.commit()
+        set_job_status(db, job, "extracting", timer)
         
         # Extract skills from all texts
-        all_explicit_skills = []
-        all_implicit_skills = []
+        with timer.stage("extracting") as stats:
+            all_explicit_skills = []
+            all_implicit_skills = []
+            
+            extracted = extract_sources([text for _, text in texts])
+            
+            for (source, _), (explicit, implicit) in zip(texts, extracted):
+                for skill in explicit + implicit:
+                    skill["source_type"] = _source_type(source)
+                all_explicit_skills.extend(explicit)
+                all_implicit_skills.extend(implicit)
+            stats["items"] = len(all_explicit_skills) + len(all_implicit_skills)
         
-        for source, text in texts:
-            explicit = extract_explicit_skills(text)
-            implicit = infer_implicit_skills(text)
-            all_explicit_skills.extend(explicit)
-            all_implicit_skills.extend(implicit)
+        # Publish a provisional profile with the keyword skills right away;
+        # the later stages enrich it in place
+        with timer.stage("persisting") as stats:
+            profile = Profile(
+                id=uuid.uuid4(),
+                name="Analyzed Profile",
+                source_manifest={"sources": [source for source, _ in texts]}
+            )
+            update_profile_summary(profile, all_explicit_skills, all_implicit_skills)
+            profile.mention_index = pack_mentions(
+                collect_mentions(explicit + implicit for explicit, implicit in extracted)
+            )
+            db.add(profile)
+            db.flush()
+            stats["items"] = persist_and_embed(db, profile.id, all_explicit_skills + all_implicit_skills)
+            job.profile_id = profile.id
         
-        job.status = "inferring"
-        db.commit()
+        set_job_status(db, job, "inferring", timer)
         
         # Use LLM provider for additional inference
-        llm_provider = get_llm_provider()
-        combined_text = " ".join([text for _, text in texts])
-        llm_inferred = llm_provider.infer_implicit_skills([combined_text])
-        all_implicit_skills.extend(llm_inferred)
-        
-        job.status = "scoring"
-        db.commit()
+        with timer.stage("inferring") as stats:
+            llm_provider = get_llm_provider()
+            source_texts = [text for _, text in texts]
+            cache = get_extraction_cache()
+            key = sources_cache_key(f"llm:{type(llm_provider).__name__}", source_texts)
+            llm_inferred = cache.get(key)
+            if llm_inferred is None:
+                llm_inferred = cache.set(key, llm_provider.infer_implicit_skills(source_texts))
+            for skill in llm_inferred:
+                skill["source_type"] = "llm"
+            all_implicit_skills.extend(llm_inferred)
+            stats["items"] = len(llm_inferred)
         
-        # Create profile
-        profile = Profile(
-            id=uuid.uuid4(),
-            name="Analyzed Profile",
-            summary=f"Profile with {len(all_explicit_skills)} explicit and {len(all_implicit_skills)} implicit skills",
-            source_manifest={"sources": [source for source, _ in texts]},
-            top_skills=json.dumps([{
-                "name": skill.get("skill", ""),
-                "confidence": skill.get("confidence", 0.5)
-            } for skill in (all_explicit_skills + all_implicit_skills)[:5]])
-        )
-        db.add(profile)
+        set_job_status(db, job, "scoring", timer)
         
-        # Create skills and evidence
-        skill_embeddings = get_skill_embeddings()
+        # Enrich the provisional profile with the inferred skills
+        with timer.stage("persisting") as stats:
+            stats["items"] = persist_and_embed(db, profile.id, llm_inferred)
         
-        for skill_data in all_explicit_skills + all_implicit_skills:
-            skill_name = skill_data.get("skill", "")
-            if not skill_name:
-                continue
-            
-            # Find or create skill
-            skill = db.query(Skill).filter(Skill.name == skill_name).first()
-            if not skill:
-                skill = Skill(
-                    id=uuid.uuid4(),
-                    name=skill_name,
-                    type=skill_data.get("type", "hard")[:4]  # Limit to enum values
-                )
-                db.add(skill)
-            
-            # Create evidence
-            evidence = Evidence(
-                id=uuid.uuid4(),
-                profile_id=profile.id,
-                skill_id=skill.id,
-                source_type=skill_data.get("type", "cv")[:20],  # Limit length
-                snippet=skill_data.get("context", "")[:500],  # Limit length
-                confidence_weight=skill_data.get("confidence", 0.5)
-            )
-            db.add(evidence)
-            
-            # Store embedding for evidence
-            upsert_embedding(
-                str(evidence.id),
-                skill_data.get("context", skill_name),
-                {"skill": skill_name, "profile_id": str(profile.id)}
-            )
+        with timer.stage("scoring") as stats:
+            update_profile_summary(profile, all_explicit_skills, all_implicit_skills)
+            stats["items"] = len(all_explicit_skills) + len(all_implicit_skills)
         
-        job.profile_id = profile.id
-        job.status = "done"
-        db.commit()
+        set_job_status(db, job, "done", timer)
         
     except Exception as e:
         print(f"Error processing job {job_id}: {e}")
-        job.status = "error"
+        db.rollback()
         job.error = str(e)
-        db.commit()
+        set_job_status(db, job, "error", timer)
         raise
     finally:
+        rule_engine.release_scans()
         db.close()
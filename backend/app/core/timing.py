@@ -0,0 +1,68 @@
+"""
+Per-stage timing instrumentation for ingest jobs
+CPU time is measured on the task's own thread, so tasks sharing a worker
+process (--pool threads) do not count each other's work. CPU spent for the
+task in helper threads or pool processes is credited with add_cpu_time.
+"""
+import math
+import time
+import threading
+from contextlib import contextmanager
+from typing import Dict, Any, List, Iterator
+
+STAGES = ["parsing", "extracting", "inferring", "scoring", "persisting"]
+PERCENTILES = [50, 90, 99]
+
+_credited = threading.local()
+
+def add_cpu_time(seconds: float):
+    """Credit CPU time spent elsewhere on behalf of the calling thread to its running stage"""
+    _credited.seconds = getattr(_credited, "seconds", 0.0) + seconds
+
+def task_cpu_time() -> float:
+    """CPU seconds of the calling thread, including credited time"""
+    return time.thread_time() + getattr(_credited, "seconds", 0.0)
+
+class StageTimer:
+    """Record wall time, CPU time and item counts per pipeline stage"""
+
+    def __init__(self):
+        self.timings: Dict[str, Dict[str, float]] = {}
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[Dict[str, int]]:
+        """Time a block; set stats["items"] inside it. Repeated stages accumulate."""
+        stats = {"items": 0}
+        wall_start = time.perf_counter()
+        cpu_start = task_cpu_time()
+        try:
+            yield stats
+        finally:
+            totals = self.timings.setdefault(name, {"wall_ms": 0.0, "cpu_ms": 0.0, "items": 0})
+            totals["wall_ms"] = round(totals["wall_ms"] + (time.perf_counter() - wall_start) * 1000, 3)
+            totals["cpu_ms"] = round(totals["cpu_ms"] + (task_cpu_time() - cpu_start) * 1000, 3)
+            totals["items"] += stats["items"]
+
+    def snapshot(self) -> Dict[str, Dict[str, float]]:
+        """Copy of the timings, suitable for a JSON column"""
+        return {name: dict(values) for name, values in self.timings.items()}
+
+def percentile(sorted_values: List[float], pct: float) -> float:
+    """Nearest-rank percentile of an already sorted list"""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, math.ceil(pct / 100 * len(sorted_values)))
+    return sorted_values[rank - 1]
+
+def summarize_stage_timings(job_timings: List[Dict[str, Dict[str, float]]]) -> Dict[str, Any]:
+    """Aggregate per-job stage timings into percentile summaries per stage and metric"""
+    summary = {}
+    for stage in STAGES:
+        samples = [timings[stage] for timings in job_timings if timings and stage in timings]
+        if not samples:
+            continue
+        summary[stage] = {"jobs": len(samples)}
+        for metric in ["wall_ms", "cpu_ms", "items"]:
+            values = sorted(sample.get(metric, 0) for sample in samples)
+            summary[stage][metric] = {f"p{pct}": percentile(values, pct) for pct in PERCENTILES}
+    return summary
@@ -6,8 +6,10 @@ from app.api.v1.profile import router as profile_router
 from app.api.v1.reasoning import router as reasoning_router
 from app.api.v1.coach import router as coach_router
 from app.api.v1.admin import router as admin_router
+from app.api.v1.skills import router as skills_router
 from app.core.db import engine
 from app.core.models import Base
+from app.services.sanity import is_sanity_available, get_sanity_sync
 
 # Initialize database tables on startup
 try:
@@ -49,6 +51,13 @@ app.include_router(profile_router, prefix="/api/v1", tags=["profile"])
 app.include_router(reasoning_router, prefix="/api/v1", tags=["reasoning"])
 app.include_router(coach_router, prefix="/api/v1", tags=["career-coach"])
 app.include_router(admin_router, prefix="/api/v1/admin", tags=["admin"])
+app.include_router(skills_router, prefix="/api/v1/skills", tags=["skills"])
+
+@app.on_event("startup")
+def warm_sanity_skills():
+    # Serve the last snapshot right away and revalidate it in the background
+    if is_sanity_available():
+        get_sanity_sync().warm()
 
 @app.get("/")
 async def root():
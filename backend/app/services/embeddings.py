@@ -1,12 +1,12 @@
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional, Tuple
 import numpy as np
 import os
+from app.services.vector_index import get_vector_index, normalize_rows
 
 # Try Groq first (free tier, no memory overhead)
 try:
     from app.services.groq_embeddings import (
-        embed_text as groq_embed_text,
-        extract_skills_with_groq,
+        embed_texts as groq_embed_texts,
         GROQ_AVAILABLE
     )
     if GROQ_AVAILABLE:
@@ -21,50 +21,73 @@ except ImportError:
 # Fallback to sentence transformers if Groq not available
 DISABLE_ML_MODELS = os.getenv('DISABLE_ML_MODELS', 'false').lower() == 'true'
 
-if not USE_GROQ and not DISABLE_ML_MODELS:
+SENTENCE_TRANSFORMER_MODEL = os.getenv('SENTENCE_TRANSFORMER_MODEL', 'all-MiniLM-L6-v2')
+
+# The sentence transformer is loaded on first use (or by the worker bootstrap),
+# so processes that never embed do not pay for it
+model = None
+_model_load_attempted = False
+EMBEDDINGS_AVAILABLE = USE_GROQ
+
+if DISABLE_ML_MODELS and not USE_GROQ:
+    print("⚠️ ML models disabled (DISABLE_ML_MODELS=true), using fallback embeddings")
+
+def get_embedding_model():
+    """Get the shared sentence transformer, loading it once per process"""
+    global model, _model_load_attempted, EMBEDDINGS_AVAILABLE
+    if _model_load_attempted or USE_GROQ or DISABLE_ML_MODELS:
+        return model
+    _model_load_attempted = True
+    
     try:
         from sentence_transformers import SentenceTransformer
-        os.environ['HF_HUB_TIMEOUT'] = '30'
-        os.environ['HF_HUB_CACHE'] = os.path.expanduser('~/.cache/huggingface')
-        os.environ['HF_HUB_DISABLE_PROGRESS_BARS'] = '1'
-
-        try:
-            model = SentenceTransformer('all-MiniLM-L6-v2', cache_folder=os.path.expanduser('~/.cache/huggingface'))
-            EMBEDDINGS_AVAILABLE = True
-            print("✅ Sentence transformers model loaded successfully")
-        except Exception as e:
-            print(f"⚠️ Failed to load sentence transformers: {e}")
-            model = None
-            EMBEDDINGS_AVAILABLE = False
     except ImportError:
-        EMBEDDINGS_AVAILABLE = False
-        model = None
         print("⚠️ sentence-transformers not available, using fallback embeddings")
-else:
-    EMBEDDINGS_AVAILABLE = USE_GROQ
-    model = None
-    if DISABLE_ML_MODELS:
-        print("⚠️ ML models disabled (DISABLE_ML_MODELS=true), using fallback embeddings")
+        return None
+    
+    os.environ['HF_HUB_TIMEOUT'] = '30'
+    os.environ['HF_HUB_CACHE'] = os.path.expanduser('~/.cache/huggingface')
+    os.environ['HF_HUB_DISABLE_PROGRESS_BARS'] = '1'
+    
+    try:
+        model = SentenceTransformer(SENTENCE_TRANSFORMER_MODEL, cache_folder=os.path.expanduser('~/.cache/huggingface'))
+        EMBEDDINGS_AVAILABLE = True
+        print("✅ Sentence transformers model loaded successfully")
+    except Exception as e:
+        print(f"⚠️ Failed to load sentence transformers: {e}")
+        model = None
+    return model
+
+EMBEDDING_DIM = 384
+EMBEDDING_BATCH_SIZE = int(os.getenv('EMBEDDING_BATCH_SIZE', '64'))
 
 def embed_text(text: str) -> List[float]:
     """Generate embeddings for text using Groq or sentence transformers"""
+    return embed_texts([text])[0].tolist()
+
+def embed_texts(texts: List[str]) -> np.ndarray:
+    """Generate embeddings for many texts at once, returning a (len(texts), dim) array"""
+    if not texts:
+        return np.zeros((0, EMBEDDING_DIM), dtype=np.float32)
+    
     # Try Groq first (free tier, API-based)
     if USE_GROQ:
         try:
-            return groq_embed_text(text)
+            return np.asarray(groq_embed_texts(texts), dtype=np.float32)
         except Exception as e:
             print(f"Groq embedding error: {e}, falling back")
     
-    # Try sentence transformers
-    if EMBEDDINGS_AVAILABLE and model:
+    # Try sentence transformers, batching the encode calls
+    encoder = get_embedding_model()
+    if encoder:
         try:
-            embedding = model.encode(text, convert_to_numpy=True)
-            return embedding.tolist()
+            embeddings = encoder.encode(texts, batch_size=EMBEDDING_BATCH_SIZE, convert_to_numpy=True)
+            return embeddings.astype(np.float32)
         except Exception as e:
             print(f"Embedding error: {e}")
     
-    # Final fallback: zero vector
-    return [0.0] * 384
+    # Final fallback: zero vectors
+    return np.zeros((len(texts), EMBEDDING_DIM), dtype=np.float32)
 
 def cosine_similarity(vec1: List[float], vec2: List[float]) -> float:
     """Calculate cosine similarity between two vectors"""
@@ -85,17 +108,15 @@ def cosine_similarity(vec1: List[float], vec2: List[float]) -> float:
 
 def find_similar_skills(text_embedding: List[float], skill_embeddings: Dict[str, List[float]], threshold: float = 0.3) -> List[Dict[str, Any]]:
     """Find skills similar to the given text embedding"""
-    similar_skills = []
-    
-    for skill_name, skill_embedding in skill_embeddings.items():
-        similarity = cosine_similarity(text_embedding, skill_embedding)
-        if similarity >= threshold:
-            similar_skills.append({
-                'skill': skill_name,
-                'similarity': similarity
-            })
+    if not skill_embeddings:
+        return []
     
-    return sorted(similar_skills, key=lambda x: x['similarity'], reverse=True)
+    # One matrix-vector product over the normalized skill embeddings
+    names = list(skill_embeddings)
+    similarities = normalize_rows(list(skill_embeddings.values())) @ normalize_rows(text_embedding)[0]
+    matching = np.flatnonzero(similarities >= threshold)
+    matching = matching[np.argsort(-similarities[matching], kind="stable")]
+    return [{'skill': names[i], 'similarity': float(similarities[i])} for i in matching]
 
 # Pre-computed skill embeddings (would be loaded from a file in production)
 SKILL_EMBEDDINGS = {}
@@ -115,35 +136,26 @@ def get_skill_embeddings() -> Dict[str, List[float]]:
     return SKILL_EMBEDDINGS
 
 def upsert_embedding(evidence_id: str, text: str, metadata: Dict[str, Any] = None):
-    """Store embedding for evidence (in-memory for now, would use vector DB in production)"""
-    # In a real implementation, this would store in Chroma/Pinecone
-    embedding = embed_text(text)
-    
-    # For now, just store in memory
-    if not hasattr(upsert_embedding, 'embeddings_store'):
-        upsert_embedding.embeddings_store = {}
+    """Store the embedding of one evidence row in the shared vector index"""
+    upsert_embeddings([(evidence_id, text, metadata)])
+
+def upsert_embeddings(items: List[Tuple[str, str, Optional[Dict[str, Any]]]]):
+    """Embed and store many (evidence_id, text, metadata) items with one batched encode"""
+    if not items:
+        return
     
-    upsert_embedding.embeddings_store[evidence_id] = {
-        'embedding': embedding,
-        'text': text,
-        'metadata': metadata or {}
-    }
+    embeddings = embed_texts([text for _, text, _ in items])
+    get_vector_index().add([
+        (evidence_id, embedding, text, metadata)
+        for (evidence_id, text, metadata), embedding in zip(items, embeddings)
+    ])
 
 def search_similar_evidence(query_text: str, limit: int = 5) -> List[Dict[str, Any]]:
-    """Find evidence similar to query text"""
-    if not hasattr(upsert_embedding, 'embeddings_store'):
+    """Find evidence similar to query text, across everything any process has indexed"""
+    return search_similar_evidence_batch([query_text], limit)[0]
+
+def search_similar_evidence_batch(query_texts: List[str], limit: int = 5) -> List[List[Dict[str, Any]]]:
+    """Similar evidence for many queries, with one batched encode and one index search"""
+    if not query_texts:
         return []
-    
-    query_embedding = embed_text(query_text)
-    results = []
-    
-    for evidence_id, data in upsert_embedding.embeddings_store.items():
-        similarity = cosine_similarity(query_embedding, data['embedding'])
-        results.append({
-            'evidence_id': evidence_id,
-            'similarity': similarity,
-            'text': data['text'],
-            'metadata': data['metadata']
-        })
-    
-    return sorted(results, key=lambda x: x['similarity'], reverse=True)[:limit]
+    return get_vector_index().search(embed_texts(query_texts), limit)
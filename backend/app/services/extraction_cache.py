@@ -0,0 +1,149 @@
+"""
+Two-tier cache of extraction results
+Results are keyed by the SHA-256 of the text and stamped with the ontology and
+rule set versions, so editing either invalidates every cached entry. An
+in-process LRU answers repeat texts within a worker; a Redis or on-disk store
+shares results across workers and restarts.
+"""
+import os
+import json
+import hashlib
+import threading
+import unicodedata
+from collections import OrderedDict
+from typing import Any, Callable, Iterable, Optional
+
+EXTRACTION_CACHE_SIZE = int(os.getenv("EXTRACTION_CACHE_SIZE", "256"))
+EXTRACTION_CACHE_TTL_SECONDS = int(os.getenv("EXTRACTION_CACHE_TTL_SECONDS", str(30 * 24 * 3600)))
+EXTRACTION_CACHE_DIR = os.getenv("EXTRACTION_CACHE_DIR", "cache/extraction")
+# Bumped when the shape of cached results changes
+CACHE_SCHEMA_VERSION = "2"
+
+def normalize_text(text: str) -> str:
+    """Canonical form of an extracted text: NFC, Unix newlines, no outer whitespace"""
+    return unicodedata.normalize("NFC", text).replace("\r\n", "\n").replace("\r", "\n").strip()
+
+def extraction_version() -> str:
+    """Version stamp of everything extraction results depend on"""
+    from .skill_ontology import ontology_version
+    from .rule_engine import get_rule_engine
+
+    return f"{CACHE_SCHEMA_VERSION}:{ontology_version()}:{get_rule_engine().version}"
+
+def text_digest(text: str) -> str:
+    """SHA-256 hex digest of a text"""
+    return hashlib.sha256(text.encode("utf-8", "surrogatepass")).hexdigest()
+
+def extraction_cache_key(namespace: str, text: str) -> str:
+    """Cache key of one extractor's result for a text"""
+    return f"extraction:{extraction_version()}:{namespace}:{text_digest(text)}"
+
+def sources_cache_key(namespace: str, texts: Iterable[str]) -> str:
+    """Cache key of a result over several texts, hashed from their digests so the texts are never joined"""
+    digest = hashlib.sha256(" ".join(text_digest(text) for text in texts).encode("ascii")).hexdigest()
+    return f"extraction:{extraction_version()}:{namespace}:{digest}"
+
+class RedisExtractionStore:
+    """Shared store in Redis; entries expire after the TTL"""
+
+    def __init__(self, url: str, ttl: int = EXTRACTION_CACHE_TTL_SECONDS):
+        import redis
+        # Short timeouts: a slow cache must not be slower than extracting
+        self.client = redis.Redis.from_url(url, socket_connect_timeout=1, socket_timeout=1)
+        self.ttl = ttl
+
+    def get(self, key: str) -> Optional[str]:
+        value = self.client.get(key)
+        return value.decode("utf-8") if value is not None else None
+
+    def set(self, key: str, value: str):
+        self.client.set(key, value, ex=self.ttl)
+
+class DiskExtractionStore:
+    """One JSON file per entry; writes go through a rename so readers never see partial files"""
+
+    def __init__(self, directory: str = EXTRACTION_CACHE_DIR):
+        self.directory = directory
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, hashlib.sha256(key.encode("utf-8")).hexdigest() + ".json")
+
+    def get(self, key: str) -> Optional[str]:
+        try:
+            with open(self._path(key), encoding="utf-8") as f:
+                return f.read()
+        except FileNotFoundError:
+            return None
+
+    def set(self, key: str, value: str):
+        os.makedirs(self.directory, exist_ok=True)
+        path = self._path(key)
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.write(value)
+        os.replace(tmp_path, path)
+
+class ExtractionCache:
+    """In-process LRU in front of an optional shared store"""
+
+    def __init__(self, store=None, maxsize: int = EXTRACTION_CACHE_SIZE):
+        self.store = store
+        self.maxsize = maxsize
+        self._lock = threading.Lock()
+        # Serialized values, so every hit hands out a fresh copy callers may mutate
+        self._entries: "OrderedDict[str, str]" = OrderedDict()
+
+    def _remember(self, key: str, value: str):
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def get(self, key: str) -> Optional[Any]:
+        with self._lock:
+            value = self._entries.get(key)
+            if value is not None:
+                self._entries.move_to_end(key)
+        if value is None and self.store is not None:
+            try:
+                value = self.store.get(key)
+            except Exception as e:
+                print(f"Extraction cache read failed: {e}")
+            if value is not None:
+                self._remember(key, value)
+        return json.loads(value) if value is not None else None
+
+    def set(self, key: str, result: Any) -> Any:
+        """Store a result, returning it in the same JSON shape a later hit returns"""
+        value = json.dumps(result)
+        self._remember(key, value)
+        if self.store is not None:
+            try:
+                self.store.set(key, value)
+            except Exception as e:
+                print(f"Extraction cache write failed: {e}")
+        return json.loads(value)
+
+    def get_or_compute(self, namespace: str, text: str, compute: Callable[[], Any]) -> Any:
+        """Cached result of `compute` for this text, computing and storing it on a miss"""
+        key = extraction_cache_key(namespace, text)
+        result = self.get(key)
+        if result is None:
+            result = self.set(key, compute())
+        return result
+
+_extraction_cache = None
+
+def get_extraction_cache() -> ExtractionCache:
+    """Get the process-wide extraction cache"""
+    global _extraction_cache
+    if _extraction_cache is None:
+        backend = os.getenv("EXTRACTION_CACHE_BACKEND", "none" if os.getenv("TESTING") else "redis")
+        store = None
+        if backend == "redis":
+            store = RedisExtractionStore(os.getenv("REDIS_URL", "redis://localhost:6379/0"))
+        elif backend == "disk":
+            store = DiskExtractionStore()
+        _extraction_cache = ExtractionCache(store)
+    return _extraction_cache
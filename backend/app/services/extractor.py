@@ -1,48 +1,54 @@
 import re
-from typing import List, Dict, Any
-from .skill_ontology import get_local_skills, normalize_skill
+from typing import List, Dict, Any, Optional, Iterable, Union, Tuple
+from .skill_ontology import canonical_skill_name, get_skill_matcher
+from .nlp import parse_windows
+from .rule_engine import get_rule_engine
+from . import text_windows
+from .text_windows import TextWindow, iter_text_windows
 
-# Try to import spaCy, make it optional
-try:
-    import spacy
-    nlp = spacy.load("en_core_web_sm")
-    SPACY_AVAILABLE = True
-except (ImportError, OSError):
-    nlp = None
-    SPACY_AVAILABLE = False
-    print("Warning: spaCy not available, using basic text processing")
-
-def extract_explicit_skills(text: str) -> List[Dict[str, Any]]:
-    """Extract explicit skills mentioned in text using NLP and keyword matching"""
+def extract_explicit_skills(text: Union[str, Iterable[str]], doc: Optional[Any] = None) -> List[Dict[str, Any]]:
+    """Extract explicit skills mentioned in text using NLP and keyword matching
+    
+    `text` may be a string or a stream of chunks; either way it is processed in
+    overlapping windows, so memory is bounded by the window size. Pass `doc` when
+    a text of at most one window was already parsed with spaCy.
+    """
     if not text:
         return []
     
-    skills_found = []
-    text_lower = text.lower()
+    matcher = get_skill_matcher()
+    windows = iter_text_windows(text)
+    if doc is not None and isinstance(text, str) and len(text) <= text_windows.WINDOW_SIZE:
+        parsed = ((window, doc) for window in windows)
+    else:
+        # Without spaCy this pairs every window with None
+        parsed = parse_windows(windows)
     
-    # Get all known skills
-    all_skills = get_local_skills()
-    
-    # Direct keyword matching (case-insensitive)
-    for skill in all_skills:
-        skill_lower = skill.lower()
-        if skill_lower in text_lower:
-            # Count occurrences
-            count = text_lower.count(skill_lower)
-            # Find context around the skill mention
-            context = extract_context(text, skill, 100)
-            
-            skills_found.append({
-                'skill': skill,
-                'confidence': min(0.9, 0.5 + (count * 0.1)),  # Higher confidence for multiple mentions
-                'mentions': count,
-                'context': context,
-                'type': 'explicit'
-            })
+    # Skill -> (document spans of every mention, context of the first one)
+    explicit: Dict[str, Tuple[List[Tuple[int, int]], str]] = {}
+    nlp_skills = []
+    for window, window_doc in parsed:
+        # Word-bounded keyword matching (case-insensitive), all skills in one scan
+        for skill, start, end in matcher.iter_matches(window.text):
+            if not window.owns(window.offset + start):
+                continue
+            if skill not in explicit:
+                explicit[skill] = ([], context_around(window.text, start, end, 100))
+            explicit[skill][0].append((window.offset + start, window.offset + end))
+        
+        # NLP-based extraction if spaCy is available
+        if window_doc is not None:
+            nlp_skills.extend(_noun_chunk_skills(window, window_doc))
     
-    # NLP-based extraction if spaCy is available
-    if SPACY_AVAILABLE and nlp:
-        skills_found.extend(extract_with_spacy(text))
+    skills_found = [{
+        'skill': skill,
+        'confidence': min(0.9, 0.5 + (len(spans) * 0.1)),  # Higher confidence for multiple mentions
+        'mentions': len(spans),
+        'context': context,
+        'type': 'explicit',
+        'spans': spans
+    } for skill, (spans, context) in explicit.items()]
+    skills_found.extend(nlp_skills)
     
     # Remove duplicates and sort by confidence
     unique_skills = {}
@@ -53,26 +59,38 @@ def extract_explicit_skills(text: str) -> List[Dict[str, Any]]:
     
     return sorted(unique_skills.values(), key=lambda x: x['confidence'], reverse=True)
 
-def extract_with_spacy(text: str) -> List[Dict[str, Any]]:
+def extract_with_spacy(text: str, doc: Optional[Any] = None) -> List[Dict[str, Any]]:
     """Use spaCy for more sophisticated skill extraction"""
-    if not SPACY_AVAILABLE or not nlp:
+    if doc is not None:
+        return _noun_chunk_skills(TextWindow(0, text, 0, len(text)), doc)
+    
+    skills_found = []
+    for window, window_doc in parse_windows(iter_text_windows(text)):
+        skills_found.extend(_noun_chunk_skills(window, window_doc))
+    return skills_found
+
+def _noun_chunk_skills(window: TextWindow, doc: Optional[Any]) -> List[Dict[str, Any]]:
+    # Noun chunks need the dependency parse
+    if doc is None or not doc.has_annotation("DEP"):
         return []
-        
-    doc = nlp(text)
+    
     skills_found = []
     
     # Look for noun phrases that might be skills
     for chunk in doc.noun_chunks:
+        if not window.owns(window.offset + chunk.start_char):
+            continue
         phrase = chunk.text.strip()
         if len(phrase.split()) <= 4 and len(phrase) > 2:  # Reasonable length
             # Check if it matches any known skill patterns
             if is_technical_term(phrase):
                 skills_found.append({
-                    'skill': phrase,
+                    'skill': canonical_skill_name(phrase),
                     'confidence': 0.6,  # Lower confidence for NLP-extracted
                     'mentions': 1,
-                    'context': extract_context(text, phrase, 100),
-                    'type': 'nlp_extracted'
+                    'context': context_around(window.text, chunk.start_char, chunk.end_char, 100),
+                    'type': 'nlp_extracted',
+                    'spans': [(window.offset + chunk.start_char, window.offset + chunk.end_char)]
                 })
     
     return skills_found
@@ -96,53 +114,20 @@ def extract_context(text: str, term: str, context_length: int = 100) -> str:
         match = pattern.search(text)
         
         if match:
-            start = max(0, match.start() - context_length)
-            end = min(len(text), match.end() + context_length)
-            context = text[start:end]
-            return f"...{context}..."
+            return context_around(text, match.start(), match.end(), context_length)
     except:
         pass
     
     return text[:200]  # Fallback to beginning of text
 
-def infer_implicit_skills(text: str) -> List[Dict[str, Any]]:
+def context_around(text: str, start: int, end: int, context_length: int = 100) -> str:
+    """Extract context around a known mention span"""
+    context = text[max(0, start - context_length):min(len(text), end + context_length)]
+    return f"...{context}..."
+
+def infer_implicit_skills(text: Union[str, Iterable[str]]) -> List[Dict[str, Any]]:
     """Infer implicit skills from context and achievements"""
-    implicit_skills = []
-    
-    # Leadership indicators
-    if re.search(r'\b(led|managed|coordinated|directed|supervised|mentored)\b', text, re.IGNORECASE):
-        implicit_skills.append({
-            'skill': 'Leadership',
-            'confidence': 0.7,
-            'evidence': 'Found leadership action verbs',
-            'type': 'inferred'
-        })
-    
-    # Communication indicators
-    if re.search(r'\b(presented|explained|collaborated|discussed|negotiated)\b', text, re.IGNORECASE):
-        implicit_skills.append({
-            'skill': 'Communication',
-            'confidence': 0.6,
-            'evidence': 'Found communication action verbs',
-            'type': 'inferred'
-        })
-    
-    # Problem solving indicators
-    if re.search(r'\b(solved|optimized|improved|debugged|resolved|fixed)\b', text, re.IGNORECASE):
-        implicit_skills.append({
-            'skill': 'Problem Solving',
-            'confidence': 0.65,
-            'evidence': 'Found problem-solving action verbs',
-            'type': 'inferred'
-        })
-    
-    # Project management indicators
-    if re.search(r'\b(project|timeline|deadline|milestone|deliverable)\b', text, re.IGNORECASE):
-        implicit_skills.append({
-            'skill': 'Project Management',
-            'confidence': 0.6,
-            'evidence': 'Found project management terminology',
-            'type': 'inferred'
-        })
-    
+    implicit_skills = get_rule_engine().infer(text, "extractor")
+    for skill in implicit_skills:
+        skill['type'] = 'inferred'
     return implicit_skills
@@ -3,12 +3,64 @@ GitHub repository analyzer for skill extraction
 Analyzes repos, commits, and languages to infer technical skills
 """
 import os
+import re
 import requests
 from typing import List, Dict, Any
 from collections import Counter
+from .skill_matcher import SkillMatcher
+from .skill_ontology import get_ontology, canonical_skill_name
 
 GITHUB_TOKEN = os.getenv("GITHUB_TOKEN")
 
+# Ontology skills looked for in repo names and descriptions, matched by name and
+# aliases. Languages come from the language stats instead, and broad terms
+# ("go", "ai", soft skills) say little about a repo when they appear in its text
+REPO_FRAMEWORKS = (
+    "React", "Vue.js", "Angular", "Node.js", "Express.js", "Tailwind CSS",
+    "Django", "Flask", "FastAPI", "TensorFlow", "PyTorch",
+    "PostgreSQL", "MySQL", "MongoDB", "Redis", "Docker", "Kubernetes",
+    "GraphQL", "REST APIs"
+)
+
+# Repo names join words with "_", "-" or camelCase ("react_portfolio", "DjangoBlog")
+_NAME_SEPARATORS = re.compile(r"[_\-]+")
+# "GraphQLServer" reads as "Graph QLServer" at lower-to-upper boundaries and as
+# "GraphQL Server" where an acronym ends, so both splits are matched
+_CAMEL_CASE_BOUNDARIES = [
+    re.compile(r"(?<=[a-z0-9])(?=[A-Z])"),
+    re.compile(r"(?<=[A-Z])(?=[A-Z][a-z])")
+]
+
+def repo_name_words(name: str) -> str:
+    """
+    Repo name as space-separated words, for word-bounded skill matching
+    The camelCase splits are appended to the unsplit name, so names that are
+    camelCase themselves ("FastAPI", "PyTorch") still match
+    """
+    words = _NAME_SEPARATORS.sub(" ", name)
+    variants = [words]
+    for boundary in _CAMEL_CASE_BOUNDARIES:
+        split = boundary.sub(" ", words)
+        if split not in variants:
+            variants.append(split)
+    return " ".join(variants)
+
+_framework_matcher = None
+
+def get_framework_matcher() -> SkillMatcher:
+    """Matcher for REPO_FRAMEWORKS and their ontology aliases, rebuilt when the ontology changes"""
+    global _framework_matcher
+    ontology = get_ontology()
+    if _framework_matcher is None or _framework_matcher[0] != ontology.version:
+        positions = [ontology.index_of(name) for name in REPO_FRAMEWORKS]
+        positions = [index for index in positions if index is not None]
+        aliases = {alias: ontology.names[index] for index in positions for alias in ontology.aliases[index]}
+        _framework_matcher = (
+            ontology.version,
+            SkillMatcher([ontology.names[index] for index in positions], aliases=aliases)
+        )
+    return _framework_matcher[1]
+
 class GitHubAnalyzer:
     """Analyze GitHub profile and repositories to extract skills"""
     
@@ -85,12 +137,13 @@ class GitHubAnalyzer:
     def _extract_skills(self, repos: List[Dict], languages: Dict[str, int]) -> List[Dict]:
         """Extract skills from repositories and languages"""
         skills = []
+        ontology = get_ontology()
         
         # Language-based skills
         for language, percentage in languages.items():
             confidence = min(95, 60 + (percentage * 0.5))  # 60-95% confidence
             skills.append({
-                "name": language,
+                "name": canonical_skill_name(language),
                 "category": "hard",
                 "confidence": round(confidence, 1),
                 "source": "github",
@@ -99,11 +152,14 @@ class GitHubAnalyzer:
         
         # Framework detection from repo names and descriptions
         frameworks = self._detect_frameworks(repos)
+        found = {skill["name"] for skill in skills}
         for framework, count in frameworks.items():
+            if framework in found:
+                continue
             confidence = min(90, 50 + (count * 10))
             skills.append({
                 "name": framework,
-                "category": "hard",
+                "category": ontology.skill_type(framework, "hard"),
                 "confidence": round(confidence, 1),
                 "source": "github",
                 "evidence": f"Found in {count} repositories"
@@ -133,37 +189,14 @@ class GitHubAnalyzer:
         return skills
     
     def _detect_frameworks(self, repos: List[Dict]) -> Counter:
-        """Detect frameworks from repo names and descriptions"""
+        """Detect frameworks and tools from repo names and descriptions"""
         frameworks = Counter()
-        
-        framework_keywords = {
-            "React": ["react", "nextjs", "next.js", "gatsby"],
-            "Vue": ["vue", "vuejs", "nuxt"],
-            "Angular": ["angular", "@angular"],
-            "Django": ["django"],
-            "Flask": ["flask"],
-            "FastAPI": ["fastapi"],
-            "Express": ["express", "expressjs"],
-            "Node.js": ["node", "nodejs"],
-            "Docker": ["docker", "dockerfile", "container"],
-            "Kubernetes": ["k8s", "kubernetes"],
-            "TensorFlow": ["tensorflow", "tf"],
-            "PyTorch": ["pytorch", "torch"],
-            "MongoDB": ["mongo", "mongodb"],
-            "PostgreSQL": ["postgres", "postgresql"],
-            "Redis": ["redis"],
-            "GraphQL": ["graphql"],
-            "REST API": ["rest", "api", "restful"],
-            "TypeScript": ["typescript", "ts"],
-            "Tailwind": ["tailwind", "tailwindcss"],
-        }
+        matcher = get_framework_matcher()
         
         for repo in repos:
-            text = f"{repo.get('name', '')} {repo.get('description', '')}".lower()
-            
-            for framework, keywords in framework_keywords.items():
-                if any(keyword in text for keyword in keywords):
-                    frameworks[framework] += 1
+            text = f"{repo_name_words(repo.get('name', ''))} {repo.get('description') or ''}"
+            # Each framework counts once per repo, under its canonical name
+            frameworks.update({framework for framework, _, _ in matcher.iter_matches(text)})
         
         return frameworks
     
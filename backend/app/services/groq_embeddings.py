@@ -143,3 +143,15 @@ def embed_text(text: str, use_cache: bool = True) -> List[float]:
         _embedding_cache[text] = embedding
     
     return embedding
+
+def embed_texts(texts: List[str], use_cache: bool = True) -> List[List[float]]:
+    """
+    Generate embeddings for many texts using Groq
+    Groq has no batch embedding endpoint, so each distinct text is analyzed once
+    """
+    embeddings_by_text = {}
+    for text in texts:
+        if text not in embeddings_by_text:
+            embeddings_by_text[text] = embed_text(text, use_cache=use_cache)
+    
+    return [embeddings_by_text[text] for text in texts]
@@ -2,13 +2,7 @@ import os
 from abc import ABC, abstractmethod
 from typing import List, Dict, Any
 import re
-import spacy
-
-# Load spaCy model for local processing
-try:
-    nlp = spacy.load("en_core_web_sm")
-except:
-    nlp = None
+from app.services.rule_engine import get_rule_engine
 
 class LLMProvider(ABC):
     @abstractmethod
@@ -34,32 +28,17 @@ class OpenAIProvider(LLMProvider):
 
 class LocalProvider(LLMProvider):
     def infer_implicit_skills(self, documents: List[str]) -> List[Dict]:
-        """Simple rule-based inference using spaCy"""
-        if not nlp:
-            return []
-
-        implicit_skills = []
-        for doc in documents:
-            doc_obj = nlp(doc.lower())
-
-            # Simple patterns for implicit skills
-            patterns = {
-                "leadership": ["led", "managed", "coordinated", "directed"],
-                "communication": ["presented", "explained", "collaborated", "discussed"],
-                "problem_solving": ["solved", "optimized", "improved", "debugged"],
-                "mentoring": ["mentored", "trained", "taught", "guided"]
-            }
-
-            for skill, keywords in patterns.items():
-                if any(keyword in doc.lower() for keyword in keywords):
-                    implicit_skills.append({
-                        "skill": skill,
-                        "confidence": 0.6,
-                        "source": "inferred",
-                        "evidence": f"Found keywords: {', '.join(keywords)}"
-                    })
-
-        return implicit_skills
+        """Simple rule-based inference with the shared rule engine"""
+        engine = get_rule_engine()
+
+        implicit_skills = {}
+        for document in documents:
+            for skill in engine.infer(document, "local_provider"):
+                if skill["skill"] not in implicit_skills:
+                    skill["source"] = "inferred"
+                    implicit_skills[skill["skill"]] = skill
+
+        return list(implicit_skills.values())
 
     def generate_cv_bullets(self, evidence: List[Dict], tone: str) -> List[str]:
         """Generate CV bullets using template-based approach"""
@@ -0,0 +1,103 @@
+"""
+Packed per-profile index of every skill mention
+Layout (little-endian): a header, a table of skills with their mention counts,
+then three columns for all spans, grouped by skill in table order:
+start offsets (uint32), end offsets (uint32) and source indexes (uint16).
+Source indexes point into the profile's source manifest. Counts are read from
+the table alone, without decoding any span.
+"""
+import sys
+import struct
+from array import array
+from typing import Dict, Iterable, List, Tuple, Any
+
+MAGIC = b"SKMI"
+FORMAT_VERSION = 1
+_HEADER = struct.Struct("<4sBII")  # magic, version, skill count, span count
+_SKILL_NAME = struct.Struct("<H")
+_SKILL_COUNT = struct.Struct("<I")
+
+# (start, end, source index)
+Mention = Tuple[int, int, int]
+
+def _le(values: array) -> bytes:
+    if sys.byteorder == "big":
+        values = array(values.typecode, values)
+        values.byteswap()
+    return values.tobytes()
+
+def _column(typecode: str, data: bytes) -> array:
+    values = array(typecode)
+    values.frombytes(data)
+    if sys.byteorder == "big":
+        values.byteswap()
+    return values
+
+def collect_mentions(extracted: Iterable[List[Dict[str, Any]]]) -> Dict[str, List[Mention]]:
+    """Gather the spans of extracted skills, one list of skills per source in manifest order"""
+    mentions: Dict[str, set] = {}
+    for source_index, skills in enumerate(extracted):
+        for skill in skills:
+            for start, end in skill.get("spans", []):
+                mentions.setdefault(skill["skill"], set()).add((start, end, source_index))
+    return {skill: sorted(spans, key=lambda m: (m[2], m[0], m[1])) for skill, spans in mentions.items()}
+
+def pack_mentions(mentions: Dict[str, Iterable[Mention]]) -> bytes:
+    """Pack skill -> mentions into the binary index"""
+    table = []
+    starts, ends, sources = array("I"), array("I"), array("H")
+    for skill, spans in mentions.items():
+        spans = list(spans)
+        name = skill.encode("utf-8")
+        table.append(_SKILL_NAME.pack(len(name)) + name + _SKILL_COUNT.pack(len(spans)))
+        for start, end, source in spans:
+            starts.append(start)
+            ends.append(end)
+            sources.append(source)
+    header = _HEADER.pack(MAGIC, FORMAT_VERSION, len(table), len(starts))
+    return b"".join([header, *table, _le(starts), _le(ends), _le(sources)])
+
+def _read_table(data: bytes) -> Tuple[List[Tuple[str, int]], int, int]:
+    magic, version, skill_count, span_count = _HEADER.unpack_from(data, 0)
+    if magic != MAGIC or version != FORMAT_VERSION:
+        raise ValueError("Not a mention index")
+    offset = _HEADER.size
+    table = []
+    for _ in range(skill_count):
+        (name_length,) = _SKILL_NAME.unpack_from(data, offset)
+        offset += _SKILL_NAME.size
+        name = data[offset:offset + name_length].decode("utf-8")
+        offset += name_length
+        (count,) = _SKILL_COUNT.unpack_from(data, offset)
+        offset += _SKILL_COUNT.size
+        table.append((name, count))
+    return table, span_count, offset
+
+def mention_counts(data: bytes) -> Dict[str, int]:
+    """Mention count per skill"""
+    if not data:
+        return {}
+    table, _, _ = _read_table(data)
+    return dict(table)
+
+def unpack_mentions(data: bytes) -> Dict[str, List[Mention]]:
+    """Decode the full index back to skill -> mentions"""
+    if not data:
+        return {}
+    table, span_count, offset = _read_table(data)
+    starts = _column("I", data[offset:offset + 4 * span_count])
+    offset += 4 * span_count
+    ends = _column("I", data[offset:offset + 4 * span_count])
+    offset += 4 * span_count
+    sources = _column("H", data[offset:offset + 2 * span_count])
+
+    mentions = {}
+    position = 0
+    for name, count in table:
+        mentions[name] = list(zip(
+            starts[position:position + count],
+            ends[position:position + count],
+            sources[position:position + count]
+        ))
+        position += count
+    return mentions
@@ -0,0 +1,71 @@
+"""
+Shared spaCy pipeline, loaded once per process on first use
+Only the components the extractor needs (tagger and parser for noun chunks)
+are kept; documents are processed in batches with nlp.pipe, and documents
+longer than one extraction window are parsed window by window
+"""
+import os
+from typing import List, Optional, Any, Iterable, Iterator, Tuple
+from . import text_windows
+from .text_windows import TextWindow
+
+# Try to import spaCy, make it optional
+try:
+    import spacy
+    SPACY_INSTALLED = True
+except ImportError:
+    spacy = None
+    SPACY_INSTALLED = False
+
+SPACY_MODEL = os.getenv("SPACY_MODEL", "en_core_web_sm")
+# Components no consumer reads; excluding them skips their compute and memory
+SPACY_EXCLUDE = [c for c in os.getenv("SPACY_EXCLUDE", "ner,lemmatizer").split(",") if c]
+SPACY_BATCH_SIZE = int(os.getenv("SPACY_BATCH_SIZE", "16"))
+# Windows are large, so only a few are parsed (and held as Docs) at a time
+SPACY_WINDOW_BATCH_SIZE = int(os.getenv("SPACY_WINDOW_BATCH_SIZE", "2"))
+
+_nlp = None
+_load_attempted = False
+
+def get_nlp():
+    """Get the shared spaCy pipeline, or None if spaCy or the model is missing"""
+    global _nlp, _load_attempted
+    if not _load_attempted:
+        _load_attempted = True
+        if SPACY_INSTALLED:
+            try:
+                _nlp = spacy.load(SPACY_MODEL, exclude=SPACY_EXCLUDE)
+            except OSError:
+                _nlp = None
+        if _nlp is None:
+            print("Warning: spaCy not available, using basic text processing")
+    return _nlp
+
+def parse_documents(texts: List[str], batch_size: int = SPACY_BATCH_SIZE) -> List[Optional[Any]]:
+    """
+    Parse all texts of a job in batches, returning one Doc per text
+    Texts longer than one window get None and are parsed window by window by
+    the extractor (as is everything when spaCy is unavailable)
+    """
+    nlp = get_nlp()
+    if not nlp:
+        return [None] * len(texts)
+    short = [i for i, text in enumerate(texts) if len(text) <= text_windows.WINDOW_SIZE]
+    docs: List[Optional[Any]] = [None] * len(texts)
+    for i, doc in zip(short, nlp.pipe((texts[i] for i in short), batch_size=batch_size)):
+        docs[i] = doc
+    return docs
+
+def parse_windows(
+    windows: Iterable[TextWindow],
+    batch_size: int = SPACY_WINDOW_BATCH_SIZE
+) -> Iterator[Tuple[TextWindow, Optional[Any]]]:
+    """Lazily pair each window with its Doc (None without spaCy)"""
+    nlp = get_nlp()
+    if not nlp:
+        for window in windows:
+            yield window, None
+        return
+    pairs = ((window.text, window) for window in windows)
+    for doc, window in nlp.pipe(pairs, as_tuples=True, batch_size=batch_size):
+        yield window, doc
@@ -1,12 +1,22 @@
 import os
+import time
+import threading
 import requests
-from typing import List, Optional
+from concurrent.futures import ThreadPoolExecutor, wait
+from typing import List, Optional, Tuple
 from urllib.parse import urlparse
+from app.core.timing import add_cpu_time
 import pdfminer.high_level
 from io import BytesIO
 import docx
 import re
 
+# Concurrent URL fetching limits
+FETCH_DEADLINE_SECONDS = float(os.getenv("FETCH_DEADLINE_SECONDS", "20"))
+FETCH_PER_HOST_LIMIT = int(os.getenv("FETCH_PER_HOST_LIMIT", "2"))
+FETCH_MAX_WORKERS = int(os.getenv("FETCH_MAX_WORKERS", "8"))
+FETCH_REQUEST_TIMEOUT = 10
+
 def parse_file(file_path: str) -> str:
     """Parse PDF or DOCX file to text"""
     if file_path.endswith('.pdf'):
@@ -45,7 +55,66 @@ def fetch_urls_text(urls: List[str]) -> str:
     
     return combined_text
 
-def fetch_single_url(url: str) -> str:
+def fetch_urls_concurrently(
+    urls: List[str],
+    deadline: float = FETCH_DEADLINE_SECONDS,
+    per_host_limit: int = FETCH_PER_HOST_LIMIT,
+    max_workers: int = FETCH_MAX_WORKERS
+) -> List[Tuple[str, str]]:
+    """
+    Fetch URLs in parallel within a total deadline
+    Returns (url, text) pairs in input order for the URLs that succeeded in time;
+    failed or timed-out URLs are logged and skipped
+    """
+    if not urls:
+        return []
+    
+    expires_at = time.monotonic() + deadline
+    host_limits = {}
+    for url in urls:
+        host = urlparse(url).netloc.lower()
+        if host not in host_limits:
+            host_limits[host] = threading.BoundedSemaphore(per_host_limit)
+    
+    def fetch(url: str) -> Tuple[str, float]:
+        cpu_start = time.thread_time()
+        host_limit = host_limits[urlparse(url).netloc.lower()]
+        if not host_limit.acquire(timeout=max(0.0, expires_at - time.monotonic())):
+            raise TimeoutError("per-host slot not available before deadline")
+        try:
+            remaining = expires_at - time.monotonic()
+            if remaining <= 0:
+                raise TimeoutError("deadline reached before request started")
+            text = fetch_single_url(url, timeout=min(FETCH_REQUEST_TIMEOUT, remaining))
+            return text, time.thread_time() - cpu_start
+        finally:
+            host_limit.release()
+    
+    executor = ThreadPoolExecutor(max_workers=min(max_workers, len(urls)))
+    try:
+        futures = [executor.submit(fetch, url) for url in urls]
+        wait(futures, timeout=deadline)
+    finally:
+        # Do not block on stragglers; their own request timeouts end them
+        executor.shutdown(wait=False, cancel_futures=True)
+    
+    results = []
+    for url, future in zip(urls, futures):
+        if not future.done() or future.cancelled():
+            print(f"Timed out fetching {url}")
+            continue
+        error = future.exception()
+        if error:
+            print(f"Error fetching {url}: {error}")
+            continue
+        text, cpu = future.result()
+        # Credit the fetch thread's CPU to the calling task's stage timings
+        add_cpu_time(cpu)
+        results.append((url, text))
+    
+    return results
+
+def fetch_single_url(url: str, timeout: float = FETCH_REQUEST_TIMEOUT) -> str:
     """Fetch content from a single URL"""
     headers = {
         'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
@@ -55,17 +124,17 @@ def fetch_single_url(url: str) -> str:
     if 'github.com' in url and os.getenv('GITHUB_TOKEN'):
         headers['Authorization'] = f'token {os.getenv("GITHUB_TOKEN")}'
     
-    response = requests.get(url, headers=headers, timeout=10)
+    response = requests.get(url, headers=headers, timeout=timeout)
     response.raise_for_status()
     
     # For GitHub repos, try to get README
     if 'github.com' in url and '/blob/' not in url:
-        return fetch_github_readme(url, headers)
+        return fetch_github_readme(url, headers, timeout=timeout)
     
     # For other URLs, return basic text extraction
     return extract_text_from_html(response.text)
 
-def fetch_github_readme(repo_url: str, headers: dict) -> str:
+def fetch_github_readme(repo_url: str, headers: dict, timeout: float = FETCH_REQUEST_TIMEOUT) -> str:
     """Fetch README content from GitHub repository"""
     # Convert repo URL to raw README URL
     parsed = urlparse(repo_url)
@@ -80,7 +149,7 @@ def fetch_github_readme(repo_url: str, headers: dict) -> str:
         
         for readme_url in readme_urls:
             try:
-                response = requests.get(readme_url, headers=headers, timeout=10)
+                response = requests.get(readme_url, headers=headers, timeout=timeout)
                 if response.status_code == 200:
                     return f"Repository: {repo_url}\n\nREADME Content:\n{response.text}"
             except:
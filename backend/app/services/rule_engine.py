@@ -0,0 +1,106 @@
+"""
+Data-driven implicit skill inference
+Rule sets are loaded from a JSON file and every trigger term of every rule is
+compiled into one matcher, so a document is scanned once no matter how many
+rules or rule sets exist. Strings are scanned whole (a regex scan holds no copy
+of the text); chunk streams are scanned in overlapping windows
+"""
+import os
+import json
+import hashlib
+import threading
+from typing import List, Dict, Any, Tuple, Iterable, Union
+from .skill_matcher import SkillMatcher, normalize_term
+from .text_windows import TextWindow, iter_text_windows
+
+IMPLICIT_RULES_PATH = os.getenv(
+    "IMPLICIT_RULES_PATH",
+    os.path.join(os.path.dirname(os.path.dirname(__file__)), "data", "implicit_skill_rules.json")
+)
+CONTEXT_LENGTH = 100
+
+class RuleEngine:
+    """Compiled rule sets mapping trigger terms to implicit skills"""
+
+    def __init__(self, rule_sets: Dict[str, List[Dict[str, Any]]], version: str = ""):
+        self.version = version
+        self.rule_sets = rule_sets
+        # Normalized trigger term -> (rule set, rule index) pairs it fires
+        self.term_rules: Dict[str, List[Tuple[str, int]]] = {}
+        for set_name, rules in rule_sets.items():
+            for index, rule in enumerate(rules):
+                for term in rule["terms"]:
+                    self.term_rules.setdefault(normalize_term(term), []).append((set_name, index))
+        self.matcher = SkillMatcher(self.term_rules)
+        # Scans by text digest, kept per thread between share_scans and release_scans
+        self._shared = threading.local()
+
+    def share_scans(self):
+        """Let every consumer on this thread reuse a document's scan until release_scans (one job's lifetime)"""
+        self._shared.scans = {}
+
+    def release_scans(self):
+        self._shared.scans = None
+
+    def _scan(self, text: str) -> Dict[Tuple[str, int], Dict[str, Any]]:
+        scans = getattr(self._shared, "scans", None)
+        if scans is None:
+            return self._scan_windows([TextWindow(0, text, 0, len(text))])
+        # Keyed by digest, so the memo holds no copy of the document
+        key = hashlib.sha256(text.encode("utf-8", "surrogatepass")).digest()
+        hits = scans.get(key)
+        if hits is None:
+            hits = scans[key] = self._scan_windows([TextWindow(0, text, 0, len(text))])
+        return hits
+
+    def _scan_windows(self, windows: Iterable[TextWindow]) -> Dict[Tuple[str, int], Dict[str, Any]]:
+        # Rule -> context of its first span, matched words and document spans
+        hits: Dict[Tuple[str, int], Dict[str, Any]] = {}
+        for window in windows:
+            for term, start, end in self.matcher.iter_matches(window.text):
+                if not window.owns(window.offset + start):
+                    continue
+                for rule_key in self.term_rules[term]:
+                    hit = hits.get(rule_key)
+                    if hit is None:
+                        context = window.text[max(0, start - CONTEXT_LENGTH):end + CONTEXT_LENGTH]
+                        hit = hits[rule_key] = {"context": context, "evidence": [], "spans": []}
+                    hit["evidence"].append(window.text[start:end])
+                    hit["spans"].append((window.offset + start, window.offset + end))
+        return hits
+
+    def infer(self, text: Union[str, Iterable[str]], rule_set: str) -> List[Dict[str, Any]]:
+        """Fire the rules of one rule set, returning every triggering span as evidence"""
+        if not text:
+            return []
+
+        hits = self._scan(text) if isinstance(text, str) else self._scan_windows(iter_text_windows(text))
+        inferred = []
+        for index, rule in enumerate(self.rule_sets.get(rule_set, [])):
+            hit = hits.get((rule_set, index))
+            if not hit:
+                continue
+            inferred.append({
+                "skill": rule["skill"],
+                "confidence": rule["confidence"],
+                "mentions": len(hit["spans"]),
+                "context": f"...{hit['context']}...",
+                "evidence": list(hit["evidence"]),
+                "spans": list(hit["spans"])
+            })
+        return inferred
+
+def load_rule_engine(path: str = IMPLICIT_RULES_PATH) -> RuleEngine:
+    """Load and compile rule sets from a JSON file"""
+    with open(path, "rb") as f:
+        raw = f.read()
+    return RuleEngine(json.loads(raw)["rule_sets"], version=hashlib.sha256(raw).hexdigest()[:16])
+
+_rule_engine = None
+
+def get_rule_engine() -> RuleEngine:
+    """Get the process-wide rule engine, compiled once"""
+    global _rule_engine
+    if _rule_engine is None:
+        _rule_engine = load_rule_engine()
+    return _rule_engine
@@ -1,39 +1,221 @@
+"""
+Sanity skill dataset, synced in the background and served from memory
+The full dataset is pulled with conditional requests (ETag / Last-Modified)
+and written to a versioned local snapshot. query_skills never waits on the
+network once data is loaded: a stale dataset triggers a background refresh,
+and the last good snapshot keeps being served while Sanity is unreachable.
+"""
 import os
+import json
+import time
+import hashlib
+import threading
 import requests
-from typing import List, Dict, Any
-from .skill_ontology import get_local_skills
+from typing import List, Dict, Any, Optional
+from .skill_ontology import get_ontology
 
 SANITY_PROJECT = os.getenv("SANITY_PROJECT")
 SANITY_DATASET = os.getenv("SANITY_DATASET", "production")
 SANITY_TOKEN = os.getenv("SANITY_TOKEN")
+# Overridable so the sync can run against a local stub
+SANITY_API_URL = os.getenv("SANITY_API_URL")
+SANITY_SYNC_TTL_SECONDS = float(os.getenv("SANITY_SYNC_TTL_SECONDS", "3600"))
+SANITY_TIMEOUT_SECONDS = float(os.getenv("SANITY_TIMEOUT_SECONDS", "10"))
+# Minimum gap between sync attempts, so an unreachable Sanity is not hammered
+SANITY_RETRY_SECONDS = float(os.getenv("SANITY_RETRY_SECONDS", "60"))
+SANITY_SNAPSHOT_PATH = os.getenv("SANITY_SNAPSHOT_PATH", "cache/sanity_skills.json")
+SKILLS_QUERY = '*[_type == "skill"] { _id, name, category, synonyms }'
 
 def is_sanity_available() -> bool:
     """Check if Sanity credentials are configured"""
     return all([SANITY_PROJECT, SANITY_TOKEN])
 
+def sanity_query_url() -> str:
+    return SANITY_API_URL or f"https://{SANITY_PROJECT}.api.sanity.io/v2021-06-07/data/query/{SANITY_DATASET}"
+
+def _dataset_version(skills: List[Dict[str, Any]]) -> str:
+    raw = json.dumps(skills, sort_keys=True).encode("utf-8")
+    return hashlib.sha256(raw).hexdigest()[:16]
+
+class SanitySkillSync:
+    """In-memory copy of the Sanity skill dataset, backed by a local snapshot"""
+
+    def __init__(
+        self,
+        url: str,
+        token: Optional[str] = None,
+        snapshot_path: str = SANITY_SNAPSHOT_PATH,
+        ttl: float = SANITY_SYNC_TTL_SECONDS,
+        timeout: float = SANITY_TIMEOUT_SECONDS,
+        retry_interval: float = SANITY_RETRY_SECONDS
+    ):
+        self.url = url
+        self.token = token
+        self.snapshot_path = snapshot_path
+        self.ttl = ttl
+        self.timeout = timeout
+        self.retry_interval = retry_interval
+        self.skills: Optional[List[Dict[str, Any]]] = None
+        self.version: Optional[str] = None
+        self.etag: Optional[str] = None
+        self.last_modified: Optional[str] = None
+        # Monotonic times of the last successful sync (200 or 304) and the last attempt
+        self.synced_at: Optional[float] = None
+        self.attempted_at: Optional[float] = None
+        self._search_names: List[str] = []
+        self._lock = threading.Lock()
+        self._refreshing = False
+
+    def _install(self, skills: List[Dict[str, Any]], version: str, etag: Optional[str], last_modified: Optional[str]):
+        # Lowercased name and synonyms per skill, for substring search
+        search_names = [
+            " ".join([skill.get("name") or "", *(skill.get("synonyms") or [])]).lower()
+            for skill in skills
+        ]
+        with self._lock:
+            self.skills, self._search_names = skills, search_names
+            self.version, self.etag, self.last_modified = version, etag, last_modified
+
+    def load_snapshot(self) -> bool:
+        """Load the last snapshot written by a sync, if there is one"""
+        try:
+            with open(self.snapshot_path, encoding="utf-8") as f:
+                snapshot = json.load(f)
+        except (OSError, ValueError):
+            return False
+        self._install(snapshot["skills"], snapshot["version"], snapshot.get("etag"), snapshot.get("lastModified"))
+        return True
+
+    def _write_snapshot(self):
+        directory = os.path.dirname(self.snapshot_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp_path = f"{self.snapshot_path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({
+                "version": self.version,
+                "etag": self.etag,
+                "lastModified": self.last_modified,
+                "syncedAt": time.time(),
+                "skills": self.skills
+            }, f)
+        os.replace(tmp_path, self.snapshot_path)
+
+    def sync(self) -> bool:
+        """Pull the dataset if it changed; on failure the current data is kept"""
+        self.attempted_at = time.monotonic()
+        headers = {"Authorization": f"Bearer {self.token}"} if self.token else {}
+        # Only revalidate data we actually hold
+        if self.skills is not None:
+            if self.etag:
+                headers["If-None-Match"] = self.etag
+            if self.last_modified:
+                headers["If-Modified-Since"] = self.last_modified
+        try:
+            resp = requests.get(self.url, params={"query": SKILLS_QUERY}, headers=headers, timeout=self.timeout)
+            if resp.status_code == 304:
+                self.synced_at = time.monotonic()
+                return True
+            resp.raise_for_status()
+            skills = resp.json().get("result", [])
+        except (requests.RequestException, ValueError) as e:
+            print(f"Sanity sync failed: {e}, serving the last snapshot")
+            return False
+
+        version = _dataset_version(skills)
+        changed = version != self.version
+        self._install(skills, version, resp.headers.get("ETag"), resp.headers.get("Last-Modified"))
+        self.synced_at = time.monotonic()
+        if changed:
+            try:
+                self._write_snapshot()
+            except OSError as e:
+                print(f"Failed to write Sanity snapshot: {e}")
+        return True
+
+    def is_stale(self) -> bool:
+        return self.synced_at is None or time.monotonic() - self.synced_at > self.ttl
+
+    def _may_retry(self) -> bool:
+        return self.attempted_at is None or time.monotonic() - self.attempted_at > self.retry_interval
+
+    def warm(self):
+        """Load the snapshot and revalidate it in the background; used at startup"""
+        if self.skills is None:
+            self.load_snapshot()
+        if self.is_stale():
+            self.refresh_in_background()
+
+    def refresh_in_background(self) -> Optional[threading.Thread]:
+        """Start a sync thread unless one is already running"""
+        with self._lock:
+            if self._refreshing:
+                return None
+            self._refreshing = True
+
+        def run():
+            try:
+                self.sync()
+            finally:
+                with self._lock:
+                    self._refreshing = False
+
+        thread = threading.Thread(target=run, name="sanity-sync", daemon=True)
+        thread.start()
+        return thread
+
+    def get_skills(self) -> Optional[List[Dict[str, Any]]]:
+        """Current dataset; only the very first call without a snapshot waits for Sanity"""
+        if self.skills is None:
+            self.load_snapshot()
+        if self.skills is None:
+            if self._may_retry():
+                self.sync()
+        elif self.is_stale() and self._may_retry():
+            self.refresh_in_background()
+        return self.skills
+
+    def query(self, term: Optional[str] = None) -> Optional[List[Dict[str, Any]]]:
+        """Skills whose name or synonyms contain `term`, or None when no data was ever loaded"""
+        skills = self.get_skills()
+        if skills is None:
+            return None
+        if not term:
+            return list(skills)
+        term = term.lower()
+        with self._lock:
+            skills, search_names = self.skills, self._search_names
+        return [skill for skill, names in zip(skills, search_names) if term in names]
+
+_sanity_sync = None
+
+def get_sanity_sync() -> SanitySkillSync:
+    """Get the process-wide Sanity dataset"""
+    global _sanity_sync
+    if _sanity_sync is None:
+        _sanity_sync = SanitySkillSync(sanity_query_url(), SANITY_TOKEN)
+    return _sanity_sync
+
+def query_local_skills(term: Optional[str] = None) -> List[Dict[str, Any]]:
+    """Local ontology skills matching the term, in the Sanity result shape"""
+    ontology = get_ontology()
+    if term:
+        term = term.lower()
+        matching = [i for i, name in enumerate(ontology.normalized) if term in name][:10]
+    else:
+        matching = range(min(20, len(ontology)))
+    return [
+        {"_id": f"local_{ontology.ids[i]}", "name": ontology.names[i], "category": ontology.types[i]}
+        for i in matching
+    ]
+
 def query_skills(term: str = None) -> List[Dict[str, Any]]:
-    """Query Sanity for skills, fallback to local if not available"""
+    """Query the synced Sanity skills, fallback to local if not available"""
     if not is_sanity_available():
-        # Return local skills matching the term
-        all_skills = get_local_skills()
-        if term:
-            matching = [s for s in all_skills if term.lower() in s.lower()]
-            return [{"_id": f"local_{i}", "name": skill, "category": "hard"} for i, skill in enumerate(matching[:10])]
-        else:
-            return [{"_id": f"local_{i}", "name": skill, "category": "hard"} for i, skill in enumerate(all_skills[:20])]
-
-    try:
-        q = '*[_type == "skill"'
-        if term:
-            q += f' && name match "*{term}*"'
-        q += '] { _id, name, category, synonyms }'
-
-        resp = requests.post(
-            f"https://{SANITY_PROJECT}.api.sanity.io/v2021-06-07/data/query/{SANITY_DATASET}",
-            json={"query": q, "params": {"term": term} if term else {}}
-        )
-        resp.raise_for_status()
-        return resp.json().get("result", [])
-    except Exception as e:
-        print(f"Sanity query failed: {e}, using local fallback")
-        return query_skills(term)  # Recursive call to use local fallback
+        return query_local_skills(term)
+
+    result = get_sanity_sync().query(term)
+    if result is None:
+        print("Sanity data unavailable, using local fallback")
+        return query_local_skills(term)
+    return result
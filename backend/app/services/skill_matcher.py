@@ -0,0 +1,78 @@
+"""
+Single-pass, word-bounded multi-term matching
+Terms are compiled into one regex whose alternation is factored as a character
+trie, so each text position is tested against one branch per character rather
+than against every term, and the scan cost stays flat as the term list grows
+"""
+import re
+from typing import Dict, List, Tuple, Iterable, Mapping, Optional
+
+_END = ""  # Trie key marking the end of a term
+
+def normalize_term(term: str) -> str:
+    """Lowercase and collapse whitespace so surface forms compare equal"""
+    return " ".join(term.lower().split())
+
+def build_trie_pattern(terms: Iterable[str]) -> str:
+    """Build a regex alternation for normalized terms, factored as a trie"""
+    trie = {}
+    for term in terms:
+        node = trie
+        for char in term:
+            node = node.setdefault(char, {})
+        node[_END] = {}
+    return _trie_to_regex(trie)
+
+def _trie_to_regex(node: Dict[str, dict]) -> str:
+    branches = []
+    for char in sorted(key for key in node if key != _END):
+        # Spaces inside multi-word terms match any whitespace run
+        head = r"\s+" if char == " " else re.escape(char)
+        branches.append(head + _trie_to_regex(node[char]))
+
+    if not branches:
+        return ""
+    if len(branches) == 1 and _END not in node:
+        return branches[0]
+    alternation = "(?:" + "|".join(branches) + ")"
+    # Greedy optional: prefer the longest term, backtrack to the shorter one
+    return alternation + "?" if _END in node else alternation
+
+class SkillMatcher:
+    """Find every word-bounded mention of a set of terms in one scan"""
+
+    def __init__(self, terms: Iterable[str], aliases: Optional[Mapping[str, str]] = None):
+        """`aliases` maps extra surface forms to the term they are reported as"""
+        # Normalized surface form -> the term as given (first one wins)
+        self.canonical: Dict[str, str] = {}
+        for term in terms:
+            normalized = normalize_term(term)
+            if normalized:
+                self.canonical.setdefault(normalized, term)
+        for alias, term in (aliases or {}).items():
+            normalized = normalize_term(alias)
+            if normalized:
+                self.canonical.setdefault(normalized, term)
+
+        self.pattern: Optional[re.Pattern] = None
+        if self.canonical:
+            self.pattern = re.compile(
+                r"(?<!\w)" + build_trie_pattern(self.canonical) + r"(?!\w)",
+                re.IGNORECASE
+            )
+
+    def iter_matches(self, text: str) -> Iterable[Tuple[str, int, int]]:
+        """Yield (term, start, end) for every mention, in text order"""
+        if not self.pattern or not text:
+            return
+        for match in self.pattern.finditer(text):
+            term = self.canonical.get(normalize_term(match.group()))
+            if term:
+                yield term, match.start(), match.end()
+
+    def find_mentions(self, text: str) -> Dict[str, List[Tuple[int, int]]]:
+        """Map each mentioned term to the (start, end) offsets of all its mentions"""
+        mentions: Dict[str, List[Tuple[int, int]]] = {}
+        for term, start, end in self.iter_matches(text):
+            mentions.setdefault(term, []).append((start, end))
+        return mentions
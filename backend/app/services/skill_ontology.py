@@ -1,35 +1,290 @@
+"""
+Skill ontology, loaded once per process from a local JSON or CSV file
+The loaded ontology is immutable and indexed (name -> id, type, normalized
+form, aliases), and every consumer shares the same instance. Its version is a
+hash of the file, so derived structures (the skill matcher, cached
+extractions) are rebuilt or invalidated when the file changes.
+Parent and related-to edges are kept as compressed adjacency arrays (one
+offsets array and one targets array per edge kind), together with their
+precomputed transitive closure, so any skill's neighbourhood is one slice.
+"""
 import os
-from typing import List
-
-# Local skill ontology fallback when Sanity is not available
-LOCAL_SKILL_ONTOLOGY = {
-    "hard": [
-        "Python", "JavaScript", "Java", "C++", "C#", "Go", "Rust", "TypeScript",
-        "React", "Vue.js", "Angular", "Node.js", "Django", "Flask", "FastAPI",
-        "PostgreSQL", "MySQL", "MongoDB", "Redis", "Docker", "Kubernetes",
-        "AWS", "Azure", "GCP", "Linux", "Git", "REST APIs", "GraphQL"
-    ],
-    "soft": [
-        "Leadership", "Communication", "Problem Solving", "Teamwork",
-        "Project Management", "Agile", "Scrum", "Mentoring", "Teaching"
-    ],
-    "emerging": [
-        "Machine Learning", "AI", "Data Science", "Blockchain", "Web3",
-        "IoT", "AR/VR", "Quantum Computing", "Edge Computing"
-    ]
-}
-
-def get_local_skills() -> List[str]:
-    """Get all skills from local ontology"""
-    all_skills = []
-    for category in LOCAL_SKILL_ONTOLOGY.values():
-        all_skills.extend(category)
-    return all_skills
-
-def get_skills_by_type(skill_type: str) -> List[str]:
+import io
+import csv
+import sys
+import json
+import hashlib
+from array import array
+from types import MappingProxyType
+from typing import Dict, Iterable, Iterator, List, Mapping, Optional, Sequence, Tuple
+from .skill_matcher import SkillMatcher, normalize_term
+
+# Local skill ontology, used when Sanity is not available
+SKILL_ONTOLOGY_PATH = os.getenv(
+    "SKILL_ONTOLOGY_PATH",
+    os.path.join(os.path.dirname(os.path.dirname(__file__)), "data", "skill_ontology.json")
+)
+SKILL_TYPES = ("hard", "soft", "emerging")
+# "related" is symmetric; "ancestor" and "descendant" are the closures of "parent" and "child"
+EDGE_KINDS = ("parent", "child", "related", "ancestor", "descendant", "neighbourhood")
+
+def _compress(adjacency: List[List[int]]) -> Tuple[array, array]:
+    """Per-node target lists as (offsets, targets): node i's targets are targets[offsets[i]:offsets[i + 1]]"""
+    offsets = array("I", [0])
+    targets = array("I")
+    for node_targets in adjacency:
+        targets.extend(node_targets)
+        offsets.append(len(targets))
+    return offsets, targets
+
+def _closure(adjacency: List[List[int]], names: Sequence[str]) -> List[List[int]]:
+    """Every node reachable from each node, direct targets first; raises on cycles"""
+    closure: List[Optional[List[int]]] = [None] * len(adjacency)
+    visiting = set()
+
+    def reach(node: int) -> List[int]:
+        if closure[node] is not None:
+            return closure[node]
+        if node in visiting:
+            raise ValueError(f"Cycle in skill hierarchy at {names[node]!r}")
+        visiting.add(node)
+        reached = list(adjacency[node])
+        seen = set(reached)
+        for target in adjacency[node]:
+            for further in reach(target):
+                if further not in seen:
+                    seen.add(further)
+                    reached.append(further)
+        visiting.discard(node)
+        closure[node] = reached
+        return reached
+
+    return [reach(node) for node in range(len(adjacency))]
+
+class SkillOntology:
+    """Immutable, indexed set of skills; look up by id, exact name or any surface form"""
+
+    __slots__ = (
+        "version", "ids", "names", "types", "normalized", "aliases",
+        "_index_by_id", "_index_by_name", "_edges", "_names_by_type"
+    )
+
+    def __init__(self, entries: Iterable[Sequence], version: str):
+        """`entries` are (id, name, type[, aliases[, parent ids[, related ids]]]) tuples"""
+        ids, names, types, normalized, aliases = [], [], [], [], []
+        # (skill position, target id) pairs, resolved once every id is known
+        parent_refs, related_refs = [], []
+        index_by_id: Dict[str, int] = {}
+        # Normalized name or alias -> skill position
+        index_by_name: Dict[str, int] = {}
+        for skill_id, name, skill_type, *rest in entries:
+            key = normalize_term(name)
+            # Surface-form duplicates keep the first entry
+            if not key or key in index_by_name or skill_id in index_by_id:
+                continue
+            if skill_type not in SKILL_TYPES:
+                raise ValueError(f"Unknown skill type {skill_type!r} for {name!r}")
+            index = len(names)
+            index_by_id[skill_id] = index_by_name[key] = index
+            parent_refs.extend((index, parent) for parent in (rest[1] if len(rest) > 1 else ()))
+            related_refs.extend((index, other) for other in (rest[2] if len(rest) > 2 else ()))
+            skill_aliases = []
+            for alias in (rest[0] if rest else ()):
+                alias_key = normalize_term(alias)
+                if alias_key and alias_key not in index_by_name:
+                    index_by_name[alias_key] = index
+                    skill_aliases.append(alias)
+            ids.append(skill_id)
+            names.append(name)
+            types.append(skill_type)
+            normalized.append(key)
+            aliases.append(tuple(skill_aliases))
+
+        self.version = version
+        self.ids: Tuple[str, ...] = tuple(ids)
+        self.names: Tuple[str, ...] = tuple(names)
+        self.types: Tuple[str, ...] = tuple(types)
+        self.normalized: Tuple[str, ...] = tuple(normalized)
+        self.aliases: Tuple[Tuple[str, ...], ...] = tuple(aliases)
+        self._index_by_id: Mapping[str, int] = MappingProxyType(index_by_id)
+        self._index_by_name: Mapping[str, int] = MappingProxyType(index_by_name)
+        self._edges: Mapping[str, Tuple[array, array]] = MappingProxyType(
+            self._build_edges(parent_refs, related_refs, index_by_id)
+        )
+        # Set last: marks the instance as fully built (see __setattr__)
+        self._names_by_type: Mapping[str, Tuple[str, ...]] = MappingProxyType({
+            skill_type: tuple(name for name, t in zip(names, types) if t == skill_type)
+            for skill_type in SKILL_TYPES
+        })
+
+    def _build_edges(self, parent_refs, related_refs, index_by_id) -> Dict[str, Tuple[array, array]]:
+        def resolve(refs):
+            for index, target_id in refs:
+                target = index_by_id.get(target_id)
+                if target is None:
+                    raise ValueError(f"Unknown skill id {target_id!r} in edges of {self.names[index]!r}")
+                yield index, target
+
+        parents = [[] for _ in self.names]
+        children = [[] for _ in self.names]
+        for index, target in resolve(parent_refs):
+            if target not in parents[index]:
+                parents[index].append(target)
+                children[target].append(index)
+        related = [[] for _ in self.names]
+        for index, target in resolve(related_refs):
+            if target != index and target not in related[index]:
+                related[index].append(target)
+                related[target].append(index)
+        ancestors = _closure(parents, self.names)
+        descendants = _closure(children, self.names)
+        # Everything a skill is related to: direct links, then its hierarchy nearest first
+        neighbourhood = [
+            list(dict.fromkeys(related[i] + ancestors[i] + descendants[i]))
+            for i in range(len(self.names))
+        ]
+        return {
+            kind: _compress(adjacency) for kind, adjacency in zip(
+                EDGE_KINDS, (parents, children, related, ancestors, descendants, neighbourhood)
+            )
+        }
+
+    def __setattr__(self, name, value):
+        if hasattr(self, "_names_by_type"):
+            raise AttributeError("SkillOntology is immutable")
+        object.__setattr__(self, name, value)
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.names)
+
+    def __contains__(self, name: str) -> bool:
+        return normalize_term(name) in self._index_by_name
+
+    def index_of(self, name: str) -> Optional[int]:
+        """Position of a skill by any surface form of its name or aliases"""
+        return self._index_by_name.get(normalize_term(name))
+
+    def index_of_id(self, skill_id: str) -> Optional[int]:
+        return self._index_by_id.get(skill_id)
+
+    def skill_id(self, name: str) -> Optional[str]:
+        index = self.index_of(name)
+        return self.ids[index] if index is not None else None
+
+    def canonical_name(self, name: str) -> Optional[str]:
+        index = self.index_of(name)
+        return self.names[index] if index is not None else None
+
+    def name_of(self, skill_id: str) -> Optional[str]:
+        index = self._index_by_id.get(skill_id)
+        return self.names[index] if index is not None else None
+
+    def skill_type(self, name: str, default: Optional[str] = None) -> Optional[str]:
+        index = self.index_of(name)
+        return self.types[index] if index is not None else default
+
+    def names_of_type(self, skill_type: str) -> Tuple[str, ...]:
+        return self._names_by_type.get(skill_type, ())
+
+    def neighbours(self, index: int, kind: str = "neighbourhood") -> array:
+        """Positions linked to the skill at `index` by one edge kind (see EDGE_KINDS)"""
+        offsets, targets = self._edges[kind]
+        return targets[offsets[index]:offsets[index + 1]]
+
+    def related_skills(self, name: str, kind: str = "neighbourhood") -> Tuple[str, ...]:
+        """Names linked to a skill: related skills, then ancestors and descendants nearest first"""
+        index = self.index_of(name)
+        if index is None:
+            return ()
+        return tuple(self.names[target] for target in self.neighbours(index, kind))
+
+    def alias_map(self) -> Dict[str, str]:
+        """Every alias mapped to its canonical skill name"""
+        return {alias: name for name, skill_aliases in zip(self.names, self.aliases) for alias in skill_aliases}
+
+    def footprint_bytes(self) -> int:
+        """Memory held by the ontology's containers and strings (shared objects counted once)"""
+        seen = set()
+        total = 0
+        pending = [self.ids, self.names, self.types, self.normalized, self.aliases,
+                   dict(self._index_by_id), dict(self._index_by_name), dict(self._names_by_type),
+                   *(arr for pair in self._edges.values() for arr in pair)]
+        while pending:
+            obj = pending.pop()
+            if id(obj) in seen:
+                continue
+            seen.add(id(obj))
+            total += sys.getsizeof(obj)
+            if isinstance(obj, dict):
+                pending.extend(obj.keys())
+                pending.extend(obj.values())
+            elif isinstance(obj, tuple):
+                pending.extend(obj)
+        return total
+
+def _split(cell: Optional[str]) -> List[str]:
+    return [value.strip() for value in (cell or "").split("|") if value.strip()]
+
+def _read_entries(raw: bytes, path: str) -> Iterator[Tuple[str, str, str, List[str], List[str], List[str]]]:
+    if path.lower().endswith(".csv"):
+        # Columns: id, name, type and optionally aliases, parents and related, each separated by "|"
+        for row in csv.DictReader(io.StringIO(raw.decode("utf-8"))):
+            yield (
+                row["id"].strip(), row["name"].strip(), row["type"].strip(),
+                _split(row.get("aliases")), _split(row.get("parents")), _split(row.get("related"))
+            )
+    else:
+        for skill in json.loads(raw)["skills"]:
+            yield (
+                skill["id"], skill["name"], skill["type"],
+                skill.get("aliases", []), skill.get("parents", []), skill.get("related", [])
+            )
+
+def load_ontology(path: str = SKILL_ONTOLOGY_PATH) -> SkillOntology:
+    """Load and index an ontology file (JSON with a "skills" list, or CSV with id,name,type[,aliases,parents,related])"""
+    with open(path, "rb") as f:
+        raw = f.read()
+    return SkillOntology(_read_entries(raw, path), version=hashlib.sha256(raw).hexdigest()[:16])
+
+_ontology = None
+
+def get_ontology() -> SkillOntology:
+    """Get the process-wide ontology, loaded once"""
+    global _ontology
+    if _ontology is None:
+        _ontology = load_ontology()
+    return _ontology
+
+def ontology_version() -> str:
+    """Version of the loaded ontology; changes whenever the file changes"""
+    return get_ontology().version
+
+def get_local_skills() -> Tuple[str, ...]:
+    """Get all skills from local ontology (shared, immutable)"""
+    return get_ontology().names
+
+def get_skills_by_type(skill_type: str) -> Tuple[str, ...]:
     """Get skills by type (hard, soft, emerging)"""
-    return LOCAL_SKILL_ONTOLOGY.get(skill_type, [])
+    return get_ontology().names_of_type(skill_type)
+
+def canonical_skill_name(skill: str) -> str:
+    """Ontology name for any known surface form or alias; unknown names only have whitespace tidied"""
+    return get_ontology().canonical_name(skill) or " ".join(skill.split())
 
 def normalize_skill(skill: str) -> str:
-    """Simple normalization - in real app, this would use more sophisticated matching"""
-    return skill.lower().strip()
+    """Comparison key for a skill: aliases of one skill share the key of its canonical name"""
+    return normalize_term(canonical_skill_name(skill))
+
+_skill_matcher: Optional[Tuple[str, SkillMatcher]] = None
+
+def get_skill_matcher() -> SkillMatcher:
+    """Get the matcher compiled from the local ontology, rebuilt only when its version changes"""
+    global _skill_matcher
+    ontology = get_ontology()
+    if _skill_matcher is None or _skill_matcher[0] != ontology.version:
+        # Aliases are matched too and reported under the canonical name
+        _skill_matcher = (ontology.version, SkillMatcher(ontology.names, aliases=ontology.alias_map()))
+    return _skill_matcher[1]
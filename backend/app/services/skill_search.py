@@ -0,0 +1,336 @@
+"""
+Type-ahead skill search over the ontology
+Prefix matches come from a sorted array of surface forms (names, aliases and
+their word suffixes, so "learn" finds "Machine Learning"), which acts as a
+flattened trie: a prefix is a contiguous range found by bisection. Prefixes
+with large ranges have their top results precomputed, so no query ranks more
+than PREFIX_TOPK_THRESHOLD candidates.
+Typos are corrected word by word: a character bigram index of the ontology's
+vocabulary proposes candidates, which are ranked by edit distance (counting a
+swap of adjacent characters as one edit, which bigrams penalize heavily), then
+the corrected prefixes go through the same prefix search. Results are ranked
+by popularity (evidence count), then name length.
+"""
+import os
+import math
+import time
+import heapq
+import threading
+from array import array
+from bisect import bisect_left
+from collections import Counter
+from itertools import product
+from typing import Callable, Dict, List, Any, Optional, Tuple
+from .skill_matcher import normalize_term
+from .skill_ontology import SkillOntology, get_ontology
+
+# Prefix ranges above this size get precomputed top results
+PREFIX_TOPK_THRESHOLD = 64
+MAX_RESULTS = 50
+# Minimum bigram Jaccard similarity between a query word and its correction
+FUZZY_THRESHOLD = 0.3
+FUZZY_MIN_WORD_LENGTH = 3
+FUZZY_CORRECTIONS_PER_WORD = 3
+# Bigram candidates per word that are re-ranked by edit distance
+FUZZY_CANDIDATES_PER_WORD = 6
+FUZZY_MAX_VARIANTS = 6
+SKILL_POPULARITY_TTL_SECONDS = float(os.getenv("SKILL_POPULARITY_TTL_SECONDS", "300"))
+
+def bigrams(word: str, complete: bool = True) -> set:
+    """Character bigrams of a word, padded at the start (and at the end when the word is complete)"""
+    padded = f" {word} " if complete else f" {word}"
+    return {padded[i:i + 2] for i in range(len(padded) - 1)}
+
+def edit_distance(a: str, b: str) -> int:
+    """Optimal string alignment distance: insertions, deletions, substitutions and adjacent swaps"""
+    # A typo leaves most of the word intact, so the common ends are skipped
+    start = 0
+    while start < len(a) and start < len(b) and a[start] == b[start]:
+        start += 1
+    end_a, end_b = len(a), len(b)
+    while end_a > start and end_b > start and a[end_a - 1] == b[end_b - 1]:
+        end_a -= 1
+        end_b -= 1
+    a, b = a[start:end_a], b[start:end_b]
+    if not a or not b:
+        return len(a) + len(b)
+
+    before, previous = None, list(range(len(b) + 1))
+    last = None
+    for i, char in enumerate(a, 1):
+        current = [i]
+        for j, other in enumerate(b, 1):
+            distance = previous[j - 1] + (char != other)
+            if previous[j] < distance:
+                distance = previous[j] + 1
+            if current[j - 1] < distance:
+                distance = current[j - 1] + 1
+            # Adjacent swap
+            if last == other and j > 1 and char == b[j - 2] and before[j - 2] < distance:
+                distance = before[j - 2] + 1
+            current.append(distance)
+        before, previous, last = previous, current, char
+    return previous[-1]
+
+class _GramIndex:
+    """Bigram posting lists over a sorted list of terms"""
+
+    __slots__ = ("terms", "complete", "sizes", "postings")
+
+    def __init__(self, terms: List[str], complete: bool):
+        self.terms = terms
+        self.complete = complete
+        self.sizes = array("H")
+        postings: Dict[str, List[int]] = {}
+        for position, term in enumerate(terms):
+            grams = bigrams(term, complete)
+            self.sizes.append(len(grams))
+            for gram in grams:
+                postings.setdefault(gram, []).append(position)
+        self.postings = {gram: array("I", positions) for gram, positions in postings.items()}
+
+    def similar(self, term: str, limit: int, threshold: float = FUZZY_THRESHOLD) -> List[Tuple[str, float]]:
+        """Terms whose bigram Jaccard similarity with `term` reaches the threshold, best first"""
+        grams = bigrams(term, self.complete)
+        # Shared bigrams are counted straight off the posting lists
+        overlaps = Counter()
+        for gram in grams:
+            positions = self.postings.get(gram)
+            if positions is not None:
+                overlaps.update(positions)
+        required = math.ceil(threshold * len(grams))
+        scored = []
+        for position, overlap in overlaps.items():
+            if overlap >= required:
+                similarity = overlap / (len(grams) + self.sizes[position] - overlap)
+                if similarity >= threshold:
+                    scored.append((self.terms[position], similarity))
+        return heapq.nsmallest(limit, scored, key=lambda item: (-item[1], item[0]))
+
+class SkillSearchIndex:
+    """Immutable prefix and n-gram indexes over an ontology, ranked by popularity"""
+
+    def __init__(self, ontology: SkillOntology, popularity: Optional[Dict[str, int]] = None):
+        self.ontology = ontology
+        popularity = popularity or {}
+        self.popularity = array("I", (popularity.get(name, 0) for name in ontology.names))
+        # Rank 0 is the best skill overall
+        order = sorted(
+            range(len(ontology)),
+            key=lambda i: (-self.popularity[i], len(ontology.names[i]), ontology.normalized[i])
+        )
+        self.rank = array("I", bytes(4 * len(order)))
+        for position, skill in enumerate(order):
+            self.rank[skill] = position
+        self.top = order[:MAX_RESULTS]
+
+        # Every surface form, and each of its word suffixes, pointing at its skill
+        surface_forms = []
+        vocabulary = set()
+        for skill, (name, aliases) in enumerate(zip(ontology.normalized, ontology.aliases)):
+            for form in (name, *(normalize_term(alias) for alias in aliases)):
+                words = form.split(" ")
+                vocabulary.update(words)
+                for start in range(len(words)):
+                    surface_forms.append((" ".join(words[start:]), skill))
+        surface_forms.sort()
+        self.forms = [form for form, _ in surface_forms]
+        self.form_skill = array("I", (skill for _, skill in surface_forms))
+
+        self.prefix_top: Dict[str, List[int]] = {}
+        self._precompute_prefixes(0, len(self.forms), 0)
+
+        self.words = sorted(vocabulary)
+        self.word_grams = _GramIndex(self.words, complete=True)
+        # Words still being typed are compared with vocabulary prefixes of the same length
+        self.prefix_grams: Dict[int, _GramIndex] = {}
+        for length in range(FUZZY_MIN_WORD_LENGTH - 1, max(map(len, self.words), default=0) + 1):
+            prefixes = sorted({word[:length] for word in self.words if len(word) >= length})
+            self.prefix_grams[length] = _GramIndex(prefixes, complete=False)
+
+    def _top_skills(self, lo: int, hi: int, limit: int = MAX_RESULTS) -> List[int]:
+        skills = set(self.form_skill[lo:hi])
+        return heapq.nsmallest(limit, skills, key=self.rank.__getitem__)
+
+    def _precompute_prefixes(self, lo: int, hi: int, depth: int):
+        # forms[lo:hi] share their first `depth` characters
+        if hi - lo <= PREFIX_TOPK_THRESHOLD:
+            return
+        prefix = self.forms[lo][:depth]
+        if depth:
+            self.prefix_top[prefix] = self._top_skills(lo, hi)
+        start = lo
+        while start < hi and len(self.forms[start]) == depth:
+            start += 1
+        while start < hi:
+            child = prefix + self.forms[start][depth]
+            end = bisect_left(self.forms, prefix + chr(ord(child[-1]) + 1), start, hi)
+            self._precompute_prefixes(start, end, depth + 1)
+            start = end
+
+    def prefix_search(self, prefix: str, limit: int) -> List[int]:
+        """Best skills having a name, alias or word starting with `prefix`"""
+        if not prefix:
+            return self.top[:limit]
+        top = self.prefix_top.get(prefix)
+        if top is not None:
+            return top[:limit]
+        lo = bisect_left(self.forms, prefix)
+        hi = bisect_left(self.forms, prefix + "\U0010ffff", lo)
+        return self._top_skills(lo, hi, limit)
+
+    def _is_known(self, word: str, complete: bool) -> bool:
+        position = bisect_left(self.words, word)
+        if position == len(self.words):
+            return False
+        return self.words[position] == word if complete else self.words[position].startswith(word)
+
+    def corrections(self, word: str, complete: bool = True) -> List[Tuple[str, float]]:
+        """Closest vocabulary words (word prefixes, for an incomplete word) with their similarity"""
+        if complete:
+            return self._ranked(word, self.word_grams.similar(word, FUZZY_CANDIDATES_PER_WORD))
+        same_length = self.prefix_grams.get(len(word))
+        candidates = same_length.similar(word, FUZZY_CANDIDATES_PER_WORD) if same_length else []
+        ranked = self._ranked(word, candidates)
+        # One replaced or swapped character is as close as a typo gets, so prefixes
+        # one character shorter or longer (for an added or dropped character) are
+        # only searched when no same-length prefix is a single edit away
+        if ranked and ranked[0][1] >= 1 - 1 / len(word):
+            return ranked
+        for length in (len(word) - 1, len(word) + 1):
+            if length in self.prefix_grams:
+                candidates.extend(self.prefix_grams[length].similar(word, FUZZY_CANDIDATES_PER_WORD))
+        candidates = heapq.nsmallest(FUZZY_CANDIDATES_PER_WORD, candidates, key=lambda item: (-item[1], item[0]))
+        return self._ranked(word, candidates)
+
+    @staticmethod
+    def _ranked(word: str, candidates: List[Tuple[str, float]]) -> List[Tuple[str, float]]:
+        """Best candidates by edit distance similarity"""
+        scored = [
+            (candidate, 1 - edit_distance(word, candidate) / max(len(word), len(candidate)), similarity)
+            for candidate, similarity in candidates
+        ]
+        # Bigram similarity breaks ties between equally distant candidates
+        scored = heapq.nsmallest(FUZZY_CORRECTIONS_PER_WORD, scored, key=lambda item: (-item[1], -item[2], item[0]))
+        return [(candidate, similarity) for candidate, similarity, _ in scored]
+
+    def fuzzy_search(self, query: str, limit: int) -> List[Tuple[int, float]]:
+        """Skills matching `query` once its misspelled words are corrected, with the corrections' similarity"""
+        words = query.split(" ")
+        options = []
+        misspelled = False
+        for position, word in enumerate(words):
+            # The last word is still being typed, so it only has to be a prefix
+            complete = position < len(words) - 1
+            if len(word) < FUZZY_MIN_WORD_LENGTH or self._is_known(word, complete):
+                options.append([(word, 1.0)])
+            else:
+                options.append(self.corrections(word, complete))
+                misspelled = True
+        if not misspelled:
+            return []
+
+        best: Dict[int, float] = {}
+        variants = heapq.nlargest(FUZZY_MAX_VARIANTS, product(*options), key=lambda variant: sum(s for _, s in variant))
+        for variant in variants:
+            similarity = sum(s for _, s in variant) / len(variant)
+            for skill in self.prefix_search(" ".join(w for w, _ in variant), limit):
+                if similarity > best.get(skill, 0.0):
+                    best[skill] = similarity
+        return heapq.nsmallest(limit, best.items(), key=lambda item: (-item[1], self.rank[item[0]]))
+
+    def search(self, query: str, limit: int = 10) -> List[Dict[str, Any]]:
+        """Prefix matches first, topped up with typo-corrected matches when there are too few"""
+        limit = max(1, min(limit, MAX_RESULTS))
+        normalized = normalize_term(query)
+        results = [(skill, "prefix", 1.0) for skill in self.prefix_search(normalized, limit)]
+        if len(results) < limit and len(normalized) >= FUZZY_MIN_WORD_LENGTH:
+            seen = {skill for skill, _, _ in results}
+            for skill, similarity in self.fuzzy_search(normalized, limit + len(seen)):
+                if skill not in seen and len(results) < limit:
+                    results.append((skill, "fuzzy", round(similarity, 3)))
+        return [
+            {
+                "id": self.ontology.ids[skill],
+                "name": self.ontology.names[skill],
+                "type": self.ontology.types[skill],
+                "popularity": self.popularity[skill],
+                "match": match,
+                "score": score
+            }
+            for skill, match, score in results
+        ]
+
+class SkillSearchService:
+    """Serves the current index; rebuilds it in the background when popularity is stale or the ontology changes"""
+
+    def __init__(self, popularity_loader: Callable[[], Dict[str, int]], ttl: float = SKILL_POPULARITY_TTL_SECONDS):
+        self.popularity_loader = popularity_loader
+        self.ttl = ttl
+        self.index: Optional[SkillSearchIndex] = None
+        self.built_at = 0.0
+        self._lock = threading.Lock()
+        self._rebuilding = False
+
+    def _build(self) -> SkillSearchIndex:
+        try:
+            popularity = self.popularity_loader()
+        except Exception as e:
+            print(f"Failed to load skill popularity: {e}")
+            popularity = self.index and dict(zip(self.index.ontology.names, self.index.popularity)) or {}
+        index = SkillSearchIndex(get_ontology(), popularity)
+        self.index, self.built_at = index, time.monotonic()
+        return index
+
+    def _rebuild_in_background(self):
+        with self._lock:
+            if self._rebuilding:
+                return
+            self._rebuilding = True
+
+        def run():
+            try:
+                self._build()
+            finally:
+                with self._lock:
+                    self._rebuilding = False
+
+        threading.Thread(target=run, name="skill-search-index", daemon=True).start()
+
+    def get_index(self) -> SkillSearchIndex:
+        index = self.index
+        if index is None or index.ontology is not get_ontology():
+            # First use, or the ontology was reloaded: old results would be wrong
+            return self._build()
+        if time.monotonic() - self.built_at > self.ttl:
+            self._rebuild_in_background()
+        return index
+
+    def search(self, query: str, limit: int = 10) -> List[Dict[str, Any]]:
+        return self.get_index().search(query, limit)
+
+def load_skill_popularity() -> Dict[str, int]:
+    """Evidence rows per skill name"""
+    from sqlalchemy import func
+    from app.core.db import SessionLocal
+    from app.core.models import Skill, Evidence
+
+    db = SessionLocal()
+    try:
+        return dict(
+            db.query(Skill.name, func.count(Evidence.id))
+            .join(Evidence, Evidence.skill_id == Skill.id)
+            .group_by(Skill.name)
+            .all()
+        )
+    finally:
+        db.close()
+
+_skill_search = None
+
+def get_skill_search() -> SkillSearchService:
+    """Get the process-wide skill search service"""
+    global _skill_search
+    if _skill_search is None:
+        _skill_search = SkillSearchService(load_skill_popularity)
+    return _skill_search
@@ -0,0 +1,59 @@
+"""
+Overlapping text windows for bounded-memory extraction
+Each window owns the mentions starting in its half of the overlaps on either
+side, so a mention near a boundary is counted once, by the window in which it
+has at least overlap/2 characters of surrounding text
+"""
+import os
+import sys
+from typing import Iterable, Iterator, NamedTuple, Optional, Union
+
+WINDOW_SIZE = int(os.getenv("EXTRACTION_WINDOW_CHARS", "100000"))
+WINDOW_OVERLAP = int(os.getenv("EXTRACTION_WINDOW_OVERLAP", "400"))
+
+class TextWindow(NamedTuple):
+    offset: int       # Position of the window's first character in the document
+    text: str
+    owned_start: int  # Document offsets of the mentions this window reports
+    owned_end: int
+
+    def owns(self, position: int) -> bool:
+        """Whether a mention starting at this document offset belongs to this window"""
+        return self.owned_start <= position < self.owned_end
+
+def iter_text_windows(
+    source: Union[str, Iterable[str]],
+    size: Optional[int] = None,
+    overlap: Optional[int] = None
+) -> Iterator[TextWindow]:
+    """
+    Yield overlapping windows over a string or a stream of text chunks
+    Consecutive windows share `overlap` characters; only about one window of text
+    is held at a time when the source is a stream
+    """
+    size = WINDOW_SIZE if size is None else size
+    overlap = WINDOW_OVERLAP if overlap is None else overlap
+    if overlap < 0 or overlap * 2 >= size:
+        raise ValueError("overlap must be non-negative and less than half the window size")
+
+    if isinstance(source, str):
+        chunks = (source[i:i + size] for i in range(0, len(source), size))
+    else:
+        chunks = source
+
+    half_overlap = overlap // 2
+    buffer = ""
+    offset = 0
+    owned_start = 0
+    for chunk in chunks:
+        buffer += chunk
+        # Only emit a full window once we know more text follows it
+        while len(buffer) > size:
+            next_offset = offset + size - overlap
+            owned_end = next_offset + half_overlap
+            yield TextWindow(offset, buffer[:size], owned_start, owned_end)
+            buffer = buffer[size - overlap:]
+            offset, owned_start = next_offset, owned_end
+
+    if buffer:
+        yield TextWindow(offset, buffer, owned_start, sys.maxsize)
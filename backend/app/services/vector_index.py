@@ -0,0 +1,436 @@
+"""
+Persistent evidence vector index, shared by the API and the Celery workers
+Vectors are L2-normalized, so inner product is cosine similarity. Each vector
+has a sequential int64 id; the evidence id, text and metadata behind it are
+appended to a JSON-lines record file.
+
+The vectors are a compacted base, a FAISS IndexIDMap2(IndexFlatIP) (without
+faiss-cpu, one contiguous float32 matrix plus an id column in a numpy file),
+and an append-only segment of fixed-size (id, vector) rows. Under a file lock,
+writers (workers) append records and then rows, so an add costs as much as
+what it writes. Once the segment holds VECTOR_INDEX_COMPACT_ROWS rows, the
+writer folds it into a new base, drops replaced vectors and their records,
+and switches the manifest to that generation.
+
+Readers (any process) map the base read-only, keep the segment in memory and
+read appended rows and records incrementally, so a search never waits on a
+writer. In memory they keep the vector id of each evidence and the record file
+offset of each vector id; the text and metadata of a hit are read from disk.
+"""
+import os
+import json
+import threading
+import numpy as np
+from contextlib import contextmanager
+from typing import List, Dict, Any, Optional, Tuple
+
+try:
+    import faiss
+    FAISS_AVAILABLE = True
+except ImportError:
+    faiss = None
+    FAISS_AVAILABLE = False
+
+try:
+    import fcntl
+except ImportError:  # Windows: writers are only serialized within a process
+    fcntl = None
+
+# Absolute, so the API and the workers agree whatever their working directory
+VECTOR_INDEX_DIR = os.getenv(
+    "VECTOR_INDEX_DIR",
+    os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))), "cache", "vector_index")
+)
+VECTOR_INDEX_BACKEND = os.getenv("VECTOR_INDEX_BACKEND", "faiss" if FAISS_AVAILABLE else "numpy")
+# Segment rows that trigger a compaction into a new base
+VECTOR_INDEX_COMPACT_ROWS = int(os.getenv("VECTOR_INDEX_COMPACT_ROWS", "4096"))
+
+def normalize_rows(vectors: np.ndarray) -> np.ndarray:
+    """Contiguous float32 copy with unit-length rows (zero rows stay zero)"""
+    vectors = np.array(vectors, dtype=np.float32, ndmin=2, order="C")
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    np.divide(vectors, norms, out=vectors, where=norms > 0)
+    return vectors
+
+class FaissVectors:
+    """IndexIDMap2 over an exact inner-product index"""
+
+    extension = ".faiss"
+
+    def __init__(self, dim: int, index=None):
+        self.dim = dim
+        self.index = index if index is not None else faiss.IndexIDMap2(faiss.IndexFlatIP(dim))
+
+    @classmethod
+    def read(cls, path: str, dim: int, mmap: bool = False) -> "FaissVectors":
+        # A mapped index is read-only: FAISS aborts on any attempt to modify it
+        flags = getattr(faiss, "IO_FLAG_MMAP_IFC", faiss.IO_FLAG_MMAP) if mmap else 0
+        return cls(dim, faiss.read_index(path, flags))
+
+    def write(self, path: str):
+        faiss.write_index(self.index, path)
+
+    def __len__(self) -> int:
+        return self.index.ntotal
+
+    @property
+    def ids(self) -> np.ndarray:
+        return faiss.vector_to_array(self.index.id_map)
+
+    def add(self, ids: np.ndarray, vectors: np.ndarray):
+        self.index.add_with_ids(vectors, ids)
+
+    def remove(self, ids: np.ndarray):
+        self.index.remove_ids(ids)
+
+    def search(self, queries: np.ndarray, k: int) -> Tuple[np.ndarray, np.ndarray]:
+        return self.index.search(queries, k)
+
+# Similarity scores computed at once per batch of queries (float32 cells)
+SEARCH_CHUNK_CELLS = 1 << 24
+
+def _write_arrays(path: str, *arrays: np.ndarray):
+    """Several .npy arrays back to back in one file, so they are replaced together"""
+    with open(path, "wb") as f:
+        for values in arrays:
+            np.lib.format.write_array(f, np.ascontiguousarray(values), allow_pickle=False)
+
+def _read_arrays(path: str, count: int, mmap: bool = False) -> List[np.ndarray]:
+    arrays = []
+    with open(path, "rb") as f:
+        for _ in range(count):
+            version = np.lib.format.read_magic(f)
+            read_header = np.lib.format.read_array_header_1_0 if version == (1, 0) else np.lib.format.read_array_header_2_0
+            shape, _, dtype = read_header(f)
+            offset = f.tell()
+            if mmap and shape[0]:
+                values = np.memmap(path, dtype=dtype, mode="r", offset=offset, shape=shape)
+            else:
+                values = np.fromfile(f, dtype=dtype, count=int(np.prod(shape))).reshape(shape)
+            f.seek(offset + int(np.prod(shape)) * dtype.itemsize)
+            arrays.append(values)
+    return arrays
+
+def top_k(scores: np.ndarray, k: int) -> np.ndarray:
+    """Column positions of the k best scores of each row, best first"""
+    if k < scores.shape[1]:
+        # Linear-time selection of the k best, then only those k are sorted
+        candidates = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+    else:
+        candidates = np.broadcast_to(np.arange(scores.shape[1]), scores.shape)
+    order = np.argsort(-np.take_along_axis(scores, candidates, axis=1), axis=1, kind="stable")
+    return np.take_along_axis(candidates, order, axis=1)
+
+class NumpyVectors:
+    """The same operations over a contiguous float32 matrix and its id column
+
+    Adds grow a preallocated buffer (doubling), so incremental adds are
+    amortized O(1) per row and the matrix stays one contiguous block.
+    """
+
+    extension = ".npy"
+
+    def __init__(self, dim: int, ids: Optional[np.ndarray] = None, matrix: Optional[np.ndarray] = None):
+        self.dim = dim
+        self.ids = ids if ids is not None else np.zeros(0, dtype=np.int64)
+        self._buffer = matrix if matrix is not None else np.zeros((0, dim), dtype=np.float32)
+
+    @property
+    def matrix(self) -> np.ndarray:
+        return self._buffer[:len(self.ids)]
+
+    @classmethod
+    def read(cls, path: str, dim: int, mmap: bool = False) -> "NumpyVectors":
+        ids, matrix = _read_arrays(path, 2, mmap)
+        return cls(dim, ids, matrix)
+
+    def write(self, path: str):
+        _write_arrays(path, self.ids, self.matrix)
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def add(self, ids: np.ndarray, vectors: np.ndarray):
+        size = len(self.ids)
+        if size + len(ids) > len(self._buffer) or not self._buffer.flags.writeable:
+            buffer = np.zeros((max(2 * len(self._buffer), size + len(ids), 1024), self.dim), dtype=np.float32)
+            buffer[:size] = self.matrix
+            self._buffer = buffer
+        self._buffer[size:size + len(ids)] = vectors
+        self.ids = np.concatenate([self.ids, ids])
+
+    def remove(self, ids: np.ndarray):
+        keep = ~np.isin(self.ids, ids)
+        matrix = self.matrix[keep]
+        self.ids = self.ids[keep]
+        self._buffer = matrix
+
+    def search(self, queries: np.ndarray, k: int) -> Tuple[np.ndarray, np.ndarray]:
+        """One matrix product per chunk of queries, then an argpartition top-k"""
+        matrix = self.matrix
+        scores_out = np.empty((len(queries), k), dtype=np.float32)
+        ids_out = np.empty((len(queries), k), dtype=np.int64)
+        chunk = max(1, SEARCH_CHUNK_CELLS // max(1, len(matrix)))
+        for start in range(0, len(queries), chunk):
+            scores = queries[start:start + chunk] @ matrix.T
+            best = top_k(scores, k)
+            scores_out[start:start + chunk] = np.take_along_axis(scores, best, axis=1)
+            ids_out[start:start + chunk] = self.ids[best]
+        return scores_out, ids_out
+
+BACKENDS = {"faiss": FaissVectors, "numpy": NumpyVectors}
+
+class EvidenceVectorIndex:
+    """Evidence embeddings on disk, with separate write and read paths"""
+
+    def __init__(
+        self,
+        directory: str = VECTOR_INDEX_DIR,
+        dim: int = 384,
+        backend: str = VECTOR_INDEX_BACKEND,
+        compact_rows: int = VECTOR_INDEX_COMPACT_ROWS
+    ):
+        self.directory = directory
+        self.dim = dim
+        self.vectors_class = BACKENDS[backend]
+        self.compact_rows = compact_rows
+        self.manifest_path = os.path.join(directory, "manifest.json")
+        self.lock_path = os.path.join(directory, "evidence.lock")
+        self.row_dtype = np.dtype([("id", "<i8"), ("vector", "<f4", (dim,))])
+        # _write_lock serializes this process's writers, _lock guards the state below
+        self._write_lock = threading.Lock()
+        self._lock = threading.Lock()
+        self._manifest_stamp = None
+        self._load_generation(None, 0)
+
+    def _path(self, kind: str, generation: int) -> str:
+        extension = {"base": self.vectors_class.extension, "segment": ".bin", "records": ".jsonl"}[kind]
+        return os.path.join(self.directory, f"{kind}-{generation}{extension}")
+
+    def _load_generation(self, generation: Optional[int], next_id: int):
+        self._generation = generation
+        self._base = None
+        if generation is not None and os.path.exists(self._path("base", generation)):
+            self._base = self.vectors_class.read(self._path("base", generation), self.dim, mmap=True)
+        self._segment = NumpyVectors(self.dim)
+        self._segment_offset = 0
+        self._ids_by_evidence: Dict[str, int] = {}
+        self._record_offsets: Dict[int, int] = {}
+        self._records_offset = 0
+        # Replaced vectors still in the base or the segment, until the next compaction
+        self._removed = 0
+        self._next_id = next_id
+
+    @staticmethod
+    def _stamp(path: str):
+        try:
+            stat = os.stat(path)
+        except FileNotFoundError:
+            return None
+        return stat.st_mtime_ns, stat.st_size, stat.st_ino
+
+    @staticmethod
+    def _size(path: str) -> int:
+        try:
+            return os.path.getsize(path)
+        except FileNotFoundError:
+            return 0
+
+    @contextmanager
+    def _file_lock(self):
+        os.makedirs(self.directory, exist_ok=True)
+        with self._write_lock, open(self.lock_path, "a") as lock_file:
+            if fcntl:
+                fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                if fcntl:
+                    fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def _sync(self):
+        """Catch up with the files, under self._lock: a new generation is loaded afresh, otherwise only appends are read"""
+        stamp = self._stamp(self.manifest_path)
+        if stamp != self._manifest_stamp or self._generation is None:
+            try:
+                with open(self.manifest_path, encoding="utf-8") as f:
+                    manifest = json.load(f)
+            except FileNotFoundError:
+                manifest = {"generation": 0, "nextId": 0}
+            if manifest["generation"] != self._generation:
+                self._load_generation(manifest["generation"], manifest["nextId"])
+            self._manifest_stamp = stamp
+        self._read_records()
+        self._read_segment()
+
+    def _read_records(self):
+        """Index records appended since the last read; the newest record for an evidence id wins"""
+        path = self._path("records", self._generation)
+        size = self._size(path)
+        if size <= self._records_offset:
+            return
+        with open(path, "rb") as f:
+            f.seek(self._records_offset)
+            chunk = f.read(size - self._records_offset)
+        # A writer may be mid-append: only consume complete lines
+        offset = self._records_offset
+        for line in chunk[:chunk.rfind(b"\n") + 1].splitlines(keepends=True):
+            record = json.loads(line)
+            previous = self._ids_by_evidence.get(record["evidenceId"])
+            if previous is not None and self._record_offsets.pop(previous, None) is not None:
+                self._removed += 1
+            self._ids_by_evidence[record["evidenceId"]] = record["id"]
+            self._record_offsets[record["id"]] = offset
+            self._next_id = max(self._next_id, record["id"] + 1)
+            offset += len(line)
+        self._records_offset = offset
+
+    def _read_segment(self):
+        """Load segment rows appended since the last read"""
+        path = self._path("segment", self._generation)
+        rows = (self._size(path) - self._segment_offset) // self.row_dtype.itemsize
+        if rows <= 0:
+            return
+        with open(path, "rb") as f:
+            f.seek(self._segment_offset)
+            data = np.frombuffer(f.read(rows * self.row_dtype.itemsize), dtype=self.row_dtype)
+        self._segment.add(data["id"].copy(), data["vector"])
+        self._segment_offset += rows * self.row_dtype.itemsize
+
+    @staticmethod
+    def _append(path: str, data: bytes, valid_size: int):
+        with open(path, "ab") as f:
+            # Drop the partial tail a crashed writer may have left
+            if f.tell() > valid_size:
+                f.truncate(valid_size)
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+
+    def add(self, items: List[Tuple[str, np.ndarray, str, Optional[Dict[str, Any]]]]) -> int:
+        """Add or replace (evidence_id, vector, text, metadata) items; returns the number stored"""
+        if not items:
+            return 0
+        vectors = normalize_rows([vector for _, vector, _, _ in items])
+        with self._file_lock():
+            with self._lock:
+                self._sync()
+                generation = self._generation
+                ids = np.arange(self._next_id, self._next_id + len(items), dtype=np.int64)
+                records_offset, segment_offset = self._records_offset, self._segment_offset
+
+            # Records first: a row is only returned once its record is known
+            lines = "".join(
+                json.dumps({"id": int(vector_id), "evidenceId": evidence_id, "text": text, "metadata": metadata or {}}) + "\n"
+                for vector_id, (evidence_id, _, text, metadata) in zip(ids, items)
+            )
+            self._append(self._path("records", generation), lines.encode("utf-8"), records_offset)
+            rows = np.empty(len(items), dtype=self.row_dtype)
+            rows["id"], rows["vector"] = ids, vectors
+            self._append(self._path("segment", generation), rows.tobytes(), segment_offset)
+
+            with self._lock:
+                self._sync()
+                if len(self._segment) >= self.compact_rows:
+                    self._compact()
+        return len(items)
+
+    def _compact(self):
+        """Fold the segment into a new base generation, without replaced vectors or their records"""
+        generation = self._generation + 1
+        live_ids = np.fromiter(self._record_offsets, dtype=np.int64, count=len(self._record_offsets))
+
+        base_path = self._path("base", self._generation)
+        base = self.vectors_class.read(base_path, self.dim) if os.path.exists(base_path) else self.vectors_class(self.dim)
+        if self._removed:
+            base.remove(base.ids[~np.isin(base.ids, live_ids)])
+        live = np.isin(self._segment.ids, live_ids)
+        base.add(self._segment.ids[live], self._segment.matrix[live])
+        tmp_path = f"{self._path('base', generation)}.{os.getpid()}.tmp"
+        base.write(tmp_path)
+        os.replace(tmp_path, self._path("base", generation))
+
+        tmp_path = f"{self._path('records', generation)}.{os.getpid()}.tmp"
+        with open(self._path("records", self._generation), "rb") as source, open(tmp_path, "wb") as target:
+            for offset in sorted(self._record_offsets.values()):
+                source.seek(offset)
+                target.write(source.readline())
+        os.replace(tmp_path, self._path("records", generation))
+        open(self._path("segment", generation), "wb").close()
+
+        tmp_path = f"{self.manifest_path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"generation": generation, "nextId": self._next_id}, f)
+        os.replace(tmp_path, self.manifest_path)
+
+        # The previous generation stays for readers still switching over from it
+        for kind in ("base", "segment", "records"):
+            try:
+                os.remove(self._path(kind, generation - 2))
+            except FileNotFoundError:
+                pass
+        self._sync()
+
+    def __len__(self) -> int:
+        with self._lock:
+            self._sync()
+            return len(self._record_offsets)
+
+    def search(self, queries: np.ndarray, limit: int = 5) -> List[List[Dict[str, Any]]]:
+        """Top `limit` evidence per query vector, by cosine similarity"""
+        queries = normalize_rows(queries)
+        with self._lock:
+            self._sync()
+            base, record_offsets = self._base, self._record_offsets
+            records_path = self._path("records", self._generation)
+            # The rows read so far; later reads never modify them
+            segment = NumpyVectors(self.dim, self._segment.ids, self._segment.matrix)
+            # Replaced vectors can take places in the top results, so fetch that many more
+            k = limit + self._removed
+
+        scores, ids = [], []
+        for vectors in (base, segment):
+            if vectors is not None and len(vectors):
+                part_scores, part_ids = vectors.search(queries, min(k, len(vectors)))
+                scores.append(part_scores)
+                ids.append(part_ids)
+        if not scores:
+            return [[] for _ in queries]
+        scores, ids = np.concatenate(scores, axis=1), np.concatenate(ids, axis=1)
+        best = top_k(scores, min(k, scores.shape[1]))
+        scores, ids = np.take_along_axis(scores, best, axis=1), np.take_along_axis(ids, best, axis=1)
+
+        results = []
+        records: Dict[int, Dict[str, Any]] = {}
+        with open(records_path, "rb") as f:
+            for query_scores, query_ids in zip(scores, ids):
+                matches = []
+                for score, vector_id in zip(query_scores, query_ids):
+                    vector_id = int(vector_id)
+                    offset = record_offsets.get(vector_id)
+                    if offset is None:
+                        continue
+                    if vector_id not in records:
+                        f.seek(offset)
+                        records[vector_id] = json.loads(f.readline())
+                    record = records[vector_id]
+                    matches.append({
+                        "evidence_id": record["evidenceId"],
+                        "similarity": float(score),
+                        "text": record["text"],
+                        "metadata": record["metadata"]
+                    })
+                    if len(matches) == limit:
+                        break
+                results.append(matches)
+        return results
+
+_vector_index = None
+
+def get_vector_index() -> EvidenceVectorIndex:
+    """Get the process-wide handle on the shared evidence index"""
+    global _vector_index
+    if _vector_index is None:
+        from .embeddings import EMBEDDING_DIM
+        _vector_index = EvidenceVectorIndex(VECTOR_INDEX_DIR, EMBEDDING_DIM)
+    return _vector_index
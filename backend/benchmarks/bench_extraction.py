@@ -0,0 +1,162 @@
+"""
+Throughput and peak memory of the extraction functions on synthetic CVs
+Run from backend/:
+
+    python -m benchmarks.bench_extraction                  # full matrix, compared with the baseline
+    python -m benchmarks.bench_extraction --quick          # small documents and ontologies only
+    python -m benchmarks.bench_extraction --save-baseline  # record this machine's baseline
+
+The baseline is machine-specific and stays local; a case regresses when its
+throughput drops, or its peak memory grows, by more than the tolerance.
+"""
+import os
+import sys
+import json
+import time
+import argparse
+import platform
+import tracemalloc
+from typing import Callable, Dict, Any, List, Optional
+
+from app.services import skill_ontology
+from app.services.nlp import get_nlp
+from app.services.skill_ontology import SkillOntology
+from app.services.extractor import extract_explicit_skills, extract_with_spacy, infer_implicit_skills
+from app.services.llm_provider import LocalProvider
+from benchmarks.corpus import synthetic_cv, synthetic_ontology
+
+KB = 1024
+MB = 1024 * KB
+DOC_SIZES = [1 * KB, 100 * KB, 1 * MB, 5 * MB]
+QUICK_DOC_SIZES = [1 * KB, 100 * KB]
+ONTOLOGY_SIZES = [50, 5000, 50000]
+QUICK_ONTOLOGY_SIZES = [50, 5000]
+MIN_RUN_SECONDS = float(os.getenv("BENCH_MIN_RUN_SECONDS", "0.5"))
+MAX_RUNS = 1000
+BASELINE_PATH = os.path.join(os.path.dirname(__file__), "baseline.json")
+REGRESSION_TOLERANCE = 0.2
+
+def _label(size: int) -> str:
+    return f"{size // MB}MB" if size >= MB else f"{size // KB}KB"
+
+def measure(fn: Callable[[str], Any], text: str, min_seconds: float = MIN_RUN_SECONDS) -> Dict[str, float]:
+    """Time repeated calls for at least `min_seconds`, then trace one call for peak memory"""
+    fn(text)  # Warm-up: lazy loading and first-call caches are not measured
+    runs = 0
+    started = time.perf_counter()
+    elapsed = 0.0
+    while runs < MAX_RUNS and (runs == 0 or elapsed < min_seconds):
+        fn(text)
+        runs += 1
+        elapsed = time.perf_counter() - started
+    seconds_per_doc = elapsed / runs
+
+    tracemalloc.start()
+    try:
+        fn(text)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return {
+        "runs": runs,
+        "seconds_per_doc": round(seconds_per_doc, 6),
+        "docs_per_s": round(1 / seconds_per_doc, 3),
+        "chars_per_s": round(len(text) / seconds_per_doc),
+        "peak_memory_kb": round(peak / KB, 1)
+    }
+
+def run_benchmarks(doc_sizes: List[int], ontology_sizes: List[int], min_seconds: float = MIN_RUN_SECONDS) -> Dict[str, Dict[str, float]]:
+    """Measure every function over the document sizes (and ontology sizes where relevant)"""
+    results = {}
+    original_ontology = skill_ontology.get_ontology()
+    try:
+        for ontology_size in ontology_sizes:
+            ontology = synthetic_ontology(ontology_size)
+            # A new version makes get_skill_matcher compile this ontology
+            skill_ontology._ontology = SkillOntology(
+                ((f"bench-{i}", name, "hard") for i, name in enumerate(ontology)),
+                version=f"bench-{ontology_size}"
+            )
+            results[f"SkillOntology[size={ontology_size}]"] = {
+                "footprint_kb": round(skill_ontology._ontology.footprint_bytes() / KB, 1)
+            }
+            print(f"SkillOntology[size={ontology_size}]: {results[f'SkillOntology[size={ontology_size}]']}")
+            for doc_size in doc_sizes:
+                text = synthetic_cv(doc_size, skills=ontology)
+                name = f"extract_explicit_skills[ontology={ontology_size},doc={_label(doc_size)}]"
+                results[name] = measure(extract_explicit_skills, text, min_seconds)
+                print(f"{name}: {results[name]}")
+    finally:
+        skill_ontology._ontology = original_ontology
+
+    functions = {
+        "infer_implicit_skills": infer_implicit_skills,
+        "LocalProvider.infer_implicit_skills": lambda text: LocalProvider().infer_implicit_skills([text])
+    }
+    if get_nlp() is not None:
+        functions["extract_with_spacy"] = extract_with_spacy
+    else:
+        print("extract_with_spacy: skipped, no spaCy model installed")
+
+    for doc_size in doc_sizes:
+        text = synthetic_cv(doc_size)
+        for function_name, fn in functions.items():
+            name = f"{function_name}[doc={_label(doc_size)}]"
+            results[name] = measure(fn, text, min_seconds)
+            print(f"{name}: {results[name]}")
+    return results
+
+def compare(results: Dict[str, Dict[str, float]], baseline: Dict[str, Dict[str, float]], tolerance: float = REGRESSION_TOLERANCE) -> List[str]:
+    """Describe every case that is slower or uses more memory than the baseline allows"""
+    regressions = []
+    for name, current in results.items():
+        reference = baseline.get(name)
+        if not reference:
+            continue
+        if "footprint_kb" in current:
+            if current["footprint_kb"] > reference["footprint_kb"] * (1 + tolerance):
+                regressions.append(f"{name}: {current['footprint_kb']}KB vs baseline {reference['footprint_kb']}KB")
+            continue
+        if current["chars_per_s"] < reference["chars_per_s"] * (1 - tolerance):
+            regressions.append(f"{name}: {current['chars_per_s']} chars/s vs baseline {reference['chars_per_s']}")
+        if current["peak_memory_kb"] > reference["peak_memory_kb"] * (1 + tolerance):
+            regressions.append(f"{name}: {current['peak_memory_kb']}KB peak vs baseline {reference['peak_memory_kb']}KB")
+    return regressions
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Extraction micro-benchmarks")
+    parser.add_argument("--quick", action="store_true", help="small documents and ontologies only")
+    parser.add_argument("--save-baseline", action="store_true", help="write the results as the new baseline")
+    parser.add_argument("--baseline", default=BASELINE_PATH)
+    parser.add_argument("--tolerance", type=float, default=REGRESSION_TOLERANCE)
+    args = parser.parse_args(argv)
+
+    results = run_benchmarks(
+        QUICK_DOC_SIZES if args.quick else DOC_SIZES,
+        QUICK_ONTOLOGY_SIZES if args.quick else ONTOLOGY_SIZES
+    )
+
+    if args.save_baseline:
+        baseline = {"machine": {"python": platform.python_version(), "platform": platform.platform()}, "results": results}
+        # Keep cases measured only by an earlier full run
+        if os.path.exists(args.baseline):
+            with open(args.baseline) as f:
+                baseline["results"] = {**json.load(f).get("results", {}), **results}
+        with open(args.baseline, "w") as f:
+            json.dump(baseline, f, indent=2, sort_keys=True)
+        print(f"Baseline written to {args.baseline}")
+        return 0
+
+    if not os.path.exists(args.baseline):
+        print("No baseline yet; run with --save-baseline to record one")
+        return 0
+    with open(args.baseline) as f:
+        regressions = compare(results, json.load(f).get("results", {}), args.tolerance)
+    for regression in regressions:
+        print(f"REGRESSION {regression}")
+    print(f"{len(regressions)} regression(s) against {args.baseline}")
+    return 1 if regressions else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
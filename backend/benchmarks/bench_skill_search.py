@@ -0,0 +1,83 @@
+"""
+Latency of the skill autocomplete index on a synthetic ontology
+Run from backend/:
+
+    python -m benchmarks.bench_skill_search              # 50k skills
+    python -m benchmarks.bench_skill_search --size 5000
+
+Queries are prefixes (1 to 8 characters) of random skill names, and the same
+prefixes with one character replaced, which exercises the fuzzy path.
+Garbage collection stays on while timing, so the tail includes the collection
+passes a serving process would see.
+"""
+import sys
+import time
+import random
+import argparse
+from typing import Dict, List, Optional
+
+from app.core.timing import percentile
+from app.services.skill_ontology import SkillOntology
+from app.services.skill_search import SkillSearchIndex
+from benchmarks.corpus import synthetic_ontology
+
+ONTOLOGY_SIZE = 50000
+QUERIES = 5000
+P99_BUDGET_MS = 1.0
+
+def _queries(names: List[str], count: int, seed: int = 0) -> Dict[str, List[str]]:
+    rng = random.Random(seed)
+    prefixes, typos = [], []
+    for _ in range(count):
+        name = rng.choice(names).lower()
+        prefix = name[:rng.randint(1, min(8, len(name)))]
+        prefixes.append(prefix)
+        position = rng.randrange(len(prefix))
+        typos.append(prefix[:position] + rng.choice("aeioustxz") + prefix[position + 1:])
+    return {"prefix": prefixes, "typo": typos}
+
+def run_benchmark(size: int = ONTOLOGY_SIZE, queries: int = QUERIES, limit: int = 10, seed: int = 0) -> Dict[str, Dict[str, float]]:
+    """Build time, then p50/p99/max latency per query kind, in milliseconds"""
+    rng = random.Random(seed)
+    names = synthetic_ontology(size, seed)
+    ontology = SkillOntology(((f"bench-{i}", name, "hard") for i, name in enumerate(names)), version=f"bench-{size}")
+    popularity = {name: rng.randint(0, 1000) for name in names}
+
+    started = time.perf_counter()
+    index = SkillSearchIndex(ontology, popularity)
+    results = {"build": {"ms": round((time.perf_counter() - started) * 1000, 1)}}
+
+    for kind, batch in _queries(names, queries, seed).items():
+        for query in batch[:100]:
+            index.search(query, limit)
+        latencies = []
+        for query in batch:
+            started = time.perf_counter()
+            index.search(query, limit)
+            latencies.append((time.perf_counter() - started) * 1000)
+        latencies.sort()
+        results[kind] = {
+            "p50_ms": round(percentile(latencies, 50), 4),
+            "p99_ms": round(percentile(latencies, 99), 4),
+            "max_ms": round(latencies[-1], 4)
+        }
+    return results
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Skill autocomplete latency")
+    parser.add_argument("--size", type=int, default=ONTOLOGY_SIZE)
+    parser.add_argument("--queries", type=int, default=QUERIES)
+    parser.add_argument("--budget-ms", type=float, default=P99_BUDGET_MS, help="p99 budget per query kind")
+    args = parser.parse_args(argv)
+
+    results = run_benchmark(args.size, args.queries)
+    over_budget = 0
+    for kind, values in results.items():
+        print(f"{kind}[size={args.size}]: {values}")
+        if values.get("p99_ms", 0) > args.budget_ms:
+            over_budget += 1
+            print(f"OVER BUDGET {kind}: p99 {values['p99_ms']}ms > {args.budget_ms}ms")
+    return 1 if over_budget else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,63 @@
+"""
+Deterministic synthetic CVs and skill ontologies for benchmarks
+The same (size, seed) always produces the same text, so runs on one machine
+are comparable over time
+"""
+import random
+from typing import List, Optional
+from app.services.skill_ontology import get_local_skills
+
+SECTION_HEADERS = ["Experience", "Projects", "Education", "Skills", "Publications", "Volunteering"]
+ROLES = ["Software Engineer", "Data Scientist", "Platform Engineer", "Tech Lead", "Product Engineer"]
+COMPANIES = ["Acme Corp", "Globex", "Initech", "Umbrella Labs", "Hooli", "Stark Industries"]
+VERBS = ["Built", "Designed", "Led", "Migrated", "Optimized", "Maintained", "Mentored", "Presented", "Debugged", "Shipped"]
+OBJECTS = [
+    "a billing platform", "the data pipeline", "internal APIs", "a search service",
+    "the onboarding flow", "monitoring dashboards", "a recommendation engine", "CI pipelines"
+]
+OUTCOMES = [
+    "cutting latency by 40%", "serving 2M daily users", "ahead of the deadline",
+    "with a team of five", "reducing costs by a third", "for three product teams"
+]
+FILLER = [
+    "collaborated", "stakeholders", "delivered", "requirements", "quarterly", "roadmap",
+    "customers", "reliability", "documentation", "reviewed", "on-call", "incidents"
+]
+
+def synthetic_ontology(size: int, seed: int = 0) -> List[str]:
+    """`size` distinct skill names: the real ontology first, then generated terms"""
+    rng = random.Random(seed)
+    skills = list(get_local_skills())[:size]
+    seen = {skill.lower() for skill in skills}
+    syllables = ["data", "flow", "stack", "cloud", "graph", "byte", "core", "sync", "ops", "lens", "mesh", "forge"]
+    while len(skills) < size:
+        name = "".join(rng.choice(syllables) for _ in range(rng.randint(2, 3))).capitalize()
+        if rng.random() < 0.3:
+            name += f" {rng.choice(['DB', 'JS', 'ML', 'Kit', 'Cloud'])}"
+        if name.lower() in seen:
+            # Versioned variants keep the name space large enough for 50k skills
+            name += f" {rng.randint(2, 99)}"
+        if name.lower() not in seen:
+            seen.add(name.lower())
+            skills.append(name)
+    return skills
+
+def _sentence(rng: random.Random, skills: List[str]) -> str:
+    used = ", ".join(rng.sample(skills, k=min(len(skills), rng.randint(1, 3))))
+    filler = " ".join(rng.choice(FILLER) for _ in range(rng.randint(3, 8)))
+    return f"{rng.choice(VERBS)} {rng.choice(OBJECTS)} using {used}, {rng.choice(OUTCOMES)}; {filler}."
+
+def synthetic_cv(size_bytes: int, seed: int = 0, skills: Optional[List[str]] = None) -> str:
+    """A CV-like text of exactly `size_bytes` ASCII characters"""
+    rng = random.Random(seed)
+    skills = skills or get_local_skills()
+    parts = []
+    length = 0
+    while length < size_bytes:
+        header = rng.choice(SECTION_HEADERS)
+        block = [f"\n{header}\n{rng.choice(ROLES)} at {rng.choice(COMPANIES)} ({rng.randint(2010, 2024)})\n"]
+        block.extend(f"- {_sentence(rng, skills)}\n" for _ in range(rng.randint(3, 8)))
+        chunk = "".join(block)
+        parts.append(chunk)
+        length += len(chunk)
+    return "".join(parts)[:size_bytes]
@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""
+One-off merge of Skill rows that are aliases or case variants of one skill
+("k8s", "kubernetes" -> "Kubernetes"). Evidence is repointed to the surviving
+row and the duplicates are deleted, one batch of skill groups per transaction.
+
+    python merge_duplicate_skills.py [--dry-run] [--batch-size 500]
+"""
+import argparse
+from typing import Dict, List
+from sqlalchemy import update, delete
+from app.core.db import SessionLocal
+from app.core.models import Skill, Evidence
+from app.services.skill_ontology import canonical_skill_name, normalize_skill
+
+def find_duplicate_groups(db) -> Dict[str, List[Skill]]:
+    """Group skills by comparison key, keeping only groups that need merging or renaming"""
+    groups: Dict[str, List[Skill]] = {}
+    for skill in db.query(Skill).order_by(Skill.name).all():
+        groups.setdefault(normalize_skill(skill.name), []).append(skill)
+    return {
+        key: skills for key, skills in groups.items()
+        if len(skills) > 1 or skills[0].name != canonical_skill_name(skills[0].name)
+    }
+
+def merge_duplicate_skills(db, batch_size: int = 500, dry_run: bool = False) -> Dict[str, int]:
+    """Merge every duplicate group into one row named after the canonical skill"""
+    groups = list(find_duplicate_groups(db).values())
+    merged = renamed = moved = 0
+    for start in range(0, len(groups), batch_size):
+        for skills in groups[start:start + batch_size]:
+            canonical = canonical_skill_name(skills[0].name)
+            # Keep the row already carrying the canonical name, if any
+            keeper = next((skill for skill in skills if skill.name == canonical), skills[0])
+            duplicate_ids = [skill.id for skill in skills if skill is not keeper]
+            if duplicate_ids:
+                moved += db.execute(
+                    update(Evidence).where(Evidence.skill_id.in_(duplicate_ids)).values(skill_id=keeper.id)
+                ).rowcount
+                db.execute(delete(Skill).where(Skill.id.in_(duplicate_ids)))
+                merged += len(duplicate_ids)
+            if keeper.name != canonical:
+                # Flush the deletes first so the unique name is free
+                db.flush()
+                keeper.name = canonical
+                renamed += 1
+        if dry_run:
+            db.rollback()
+        else:
+            db.commit()
+    return {"groups": len(groups), "merged": merged, "renamed": renamed, "evidence_moved": moved}
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--dry-run", action="store_true", help="report what would change without writing")
+    parser.add_argument("--batch-size", type=int, default=500, help="skill groups per transaction")
+    args = parser.parse_args()
+
+    db = SessionLocal()
+    try:
+        result = merge_duplicate_skills(db, args.batch_size, args.dry_run)
+    finally:
+        db.close()
+    prefix = "Would merge" if args.dry_run else "Merged"
+    print(
+        f"{prefix} {result['merged']} duplicate skills in {result['groups']} groups "
+        f"({result['renamed']} renamed, {result['evidence_moved']} evidence rows moved)"
+    )
@@ -1,6 +1,8 @@
 import os
+import tempfile
 # Set testing environment BEFORE any other imports
 os.environ["TESTING"] = "1"
+os.environ.setdefault("VECTOR_INDEX_DIR", tempfile.mkdtemp(prefix="skillsense-vectors-"))
 
 import pytest
 import sys
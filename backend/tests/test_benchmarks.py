@@ -0,0 +1,41 @@
+from benchmarks.corpus import synthetic_cv, synthetic_ontology
+from benchmarks.bench_extraction import compare, run_benchmarks
+
+def test_corpus_is_deterministic_and_sized():
+    ontology = synthetic_ontology(500)
+    assert len(ontology) == len({skill.lower() for skill in ontology}) == 500
+    assert ontology == synthetic_ontology(500)
+    
+    text = synthetic_cv(10_000, seed=3, skills=ontology)
+    assert len(text) == 10_000
+    assert text == synthetic_cv(10_000, seed=3, skills=ontology)
+    assert text != synthetic_cv(10_000, seed=4, skills=ontology)
+
+def test_benchmarks_report_throughput_memory_and_regressions():
+    results = run_benchmarks([1024], [50], min_seconds=0)
+    case = results["extract_explicit_skills[ontology=50,doc=1KB]"]
+    assert case["chars_per_s"] > 0 and case["peak_memory_kb"] > 0
+    assert "infer_implicit_skills[doc=1KB]" in results
+    
+    assert results["SkillOntology[size=50]"]["footprint_kb"] > 0
+    
+    timed = {name: values for name, values in results.items() if "chars_per_s" in values}
+    faster_baseline = {name: dict(values, chars_per_s=values["chars_per_s"] * 2) for name, values in timed.items()}
+    assert compare(results, results) == []
+    assert len(compare(results, faster_baseline)) == len(timed)
+
+def test_skill_search_benchmark_reports_latency_percentiles():
+    from benchmarks.bench_skill_search import run_benchmark
+    
+    results = run_benchmark(size=500, queries=200)
+    assert results["build"]["ms"] > 0
+    for kind in ("prefix", "typo"):
+        assert 0 < results[kind]["p50_ms"] <= results[kind]["p99_ms"] <= results[kind]["max_ms"]
+
+def test_vector_search_benchmark_compares_backends_with_the_loop():
+    from benchmarks.bench_vector_search import run_benchmark
+    
+    results = run_benchmark(rows=500, batch_size=4)
+    assert results["loop"]["ms_per_query"] > 0
+    assert results["numpy"]["ms_per_query"] > 0 and results["numpy"]["batched_ms_per_query"] > 0
+    assert results["numpy"]["add_20_ms"] > 0 and results["numpy"]["index_ms_per_query"] > 0
@@ -0,0 +1,40 @@
+import pytest
+import numpy as np
+from app.services.embeddings import (
+    embed_text, embed_texts, upsert_embeddings, search_similar_evidence,
+    search_similar_evidence_batch, find_similar_skills, EMBEDDING_DIM
+)
+from app.services.vector_index import get_vector_index
+
+def test_embed_texts_returns_one_row_per_text():
+    embeddings = embed_texts(["Python developer", "Led a team", "Python developer"])
+    assert isinstance(embeddings, np.ndarray)
+    assert embeddings.shape == (3, EMBEDDING_DIM)
+    assert embed_texts([]).shape == (0, EMBEDDING_DIM)
+
+def test_embed_text_matches_batch_row():
+    assert embed_text("Docker") == embed_texts(["Docker"])[0].tolist()
+
+def test_upsert_embeddings_stores_every_item():
+    index = get_vector_index()
+    before = len(index)
+    upsert_embeddings([
+        ("ev-batch-1", "Built REST APIs", {"skill": "REST APIs"}),
+        ("ev-batch-2", "Deployed with Docker", None)
+    ])
+    assert len(index) == before + 2
+    
+    results = {result["evidence_id"]: result for result in search_similar_evidence("REST APIs", limit=len(index))}
+    assert results["ev-batch-1"]["metadata"] == {"skill": "REST APIs"}
+    assert results["ev-batch-2"]["metadata"] == {}
+    assert results["ev-batch-2"]["text"] == "Deployed with Docker"
+    
+    batch = search_similar_evidence_batch(["REST APIs", "Docker"], limit=1)
+    assert len(batch) == 2 and all(len(matches) == 1 for matches in batch)
+    assert search_similar_evidence_batch([]) == []
+
+def test_find_similar_skills_ranks_by_cosine_similarity():
+    similar = find_similar_skills([1.0, 0.0], {"A": [2.0, 0.0], "B": [0.0, 1.0], "C": [1.0, 1.0], "Zero": [0.0, 0.0]})
+    assert [s["skill"] for s in similar] == ["A", "C"]
+    assert similar[0]["similarity"] == pytest.approx(1.0)
+    assert find_similar_skills([1.0, 0.0], {}) == []
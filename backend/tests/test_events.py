@@ -0,0 +1,64 @@
+import pytest
+import json
+import time
+import threading
+from uuid import uuid4
+from app.core.events import get_job_events, publish_job_status, InMemoryJobEvents
+from app.core.models import Job
+
+def _read_events(response):
+    events = []
+    for line in response.iter_lines():
+        if line.startswith("data: "):
+            events.append(json.loads(line[len("data: "):]))
+    return events
+
+def test_testing_uses_in_memory_broker():
+    assert isinstance(get_job_events(), InMemoryJobEvents)
+
+def test_stream_replays_last_event(client):
+    job_id = str(uuid4())
+    publish_job_status(job_id, "done")
+    
+    with client.stream("GET", f"/api/v1/status/{job_id}/stream") as response:
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/event-stream")
+        events = _read_events(response)
+    
+    assert [event["status"] for event in events] == ["done"]
+    assert events[0]["progress"] == 100
+
+def test_stream_pushes_transitions_until_terminal(client):
+    job_id = str(uuid4())
+    publish_job_status(job_id, "parsing")
+    
+    def publish_rest():
+        # Wait for the SSE endpoint to subscribe before publishing
+        while not get_job_events()._subscribers.get(job_id):
+            time.sleep(0.01)
+        for status in ["extracting", "inferring", "scoring", "error"]:
+            publish_job_status(job_id, status, "boom" if status == "error" else None)
+    
+    publisher = threading.Thread(target=publish_rest, daemon=True)
+    publisher.start()
+    with client.stream("GET", f"/api/v1/status/{job_id}/stream") as response:
+        events = _read_events(response)
+    publisher.join(timeout=5)
+    
+    assert [event["status"] for event in events] == ["parsing", "extracting", "inferring", "scoring", "error"]
+    assert events[-1]["error"] == "boom"
+
+def test_stream_reads_job_without_cached_event(db, client):
+    # Jobs created as done, or whose last event expired, have nothing to replay
+    job = Job(id=uuid4(), status="error", error="parse failed")
+    db.add(job)
+    db.commit()
+    
+    with client.stream("GET", f"/api/v1/status/{job.id}/stream") as response:
+        events = _read_events(response)
+    
+    assert [event["status"] for event in events] == ["error"]
+    assert events[0]["error"] == "parse failed"
+
+def test_stream_rejects_invalid_job_id(client):
+    assert client.get("/api/v1/status/not-a-uuid/stream").status_code == 400
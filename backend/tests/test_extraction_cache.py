@@ -0,0 +1,71 @@
+from app.core import extraction_pool
+from app.services import skill_ontology
+from app.services.extraction_cache import (
+    ExtractionCache, DiskExtractionStore, extraction_cache_key, sources_cache_key, normalize_text
+)
+
+def test_lru_evicts_oldest_and_hands_out_copies():
+    cache = ExtractionCache(maxsize=2)
+    cache.set("a", [{"skill": "Python"}])
+    cache.set("b", [])
+    cache.get("a")
+    cache.set("c", [])
+    
+    assert cache.get("b") is None
+    hit = cache.get("a")
+    hit[0]["source_type"] = "cv"
+    assert cache.get("a") == [{"skill": "Python"}]
+
+def test_disk_tier_survives_a_new_process_cache(tmp_path):
+    ExtractionCache(DiskExtractionStore(str(tmp_path))).set("key", [[{"skill": "Go", "spans": [(0, 2)]}], []])
+    
+    fresh = ExtractionCache(DiskExtractionStore(str(tmp_path)))
+    assert fresh.get("key") == [[{"skill": "Go", "spans": [[0, 2]]}], []]
+    assert fresh.get("other") is None
+
+def test_store_failures_do_not_fail_extraction():
+    class BrokenStore:
+        def get(self, key):
+            raise ConnectionError("redis down")
+        def set(self, key, value):
+            raise ConnectionError("redis down")
+    
+    cache = ExtractionCache(BrokenStore())
+    assert cache.get_or_compute("sources", "text", lambda: [1]) == [1]
+    assert cache.get("extraction:missing") is None
+
+def test_key_tracks_text_and_ontology_version(monkeypatch):
+    key = extraction_cache_key("sources", "Python")
+    assert key == extraction_cache_key("sources", "Python")
+    assert key != extraction_cache_key("sources", "Python 3")
+    assert key != extraction_cache_key("llm:LocalProvider", "Python")
+    
+    edited = skill_ontology.SkillOntology([("go", "Go", "hard")], version="edited")
+    monkeypatch.setattr(skill_ontology, "_ontology", edited)
+    assert key != extraction_cache_key("sources", "Python")
+    assert normalize_text("  Led\r\nteams \n") == "Led\nteams"
+
+def test_sources_key_tracks_each_source():
+    key = sources_cache_key("llm:LocalProvider", ["Python", "SQL"])
+    assert key == sources_cache_key("llm:LocalProvider", ["Python", "SQL"])
+    assert key != sources_cache_key("llm:LocalProvider", ["PythonSQL"])
+    assert key != sources_cache_key("llm:LocalProvider", ["SQL", "Python"])
+    assert key != sources_cache_key("llm:GroqProvider", ["Python", "SQL"])
+
+def test_extract_sources_skips_cached_texts(monkeypatch):
+    from app.services import extraction_cache
+    
+    monkeypatch.setattr(extraction_cache, "_extraction_cache", ExtractionCache())
+    calls = []
+    original = extraction_pool._extract_uncached
+    def counting(texts, use_pool):
+        calls.append(list(texts))
+        return original(texts, use_pool)
+    monkeypatch.setattr(extraction_pool, "_extract_uncached", counting)
+    
+    first = extraction_pool.extract_sources(["Python and Docker", "Led a team"])
+    second = extraction_pool.extract_sources(["Led a team", "Rust services"])
+    
+    assert calls == [["Python and Docker", "Led a team"], ["Rust services"]]
+    assert second[0] == first[1]
+    assert {skill["skill"] for skill in second[1][0]} == {"Rust"}
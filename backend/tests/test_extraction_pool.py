@@ -0,0 +1,30 @@
+from app.core import extraction_pool
+from app.core.extraction_pool import extract_sources
+
+TEXTS = [
+    "Led a team building Python and Docker services. " * 50,
+    "Presented Kubernetes work and debugged React apps.",
+    "Mentored juniors on SQL."
+]
+
+def test_pooled_extraction_matches_in_process(monkeypatch):
+    monkeypatch.setattr(extraction_pool, "EXTRACTION_POOL_WORKERS", 2)
+    credited = []
+    monkeypatch.setattr(extraction_pool, "add_cpu_time", credited.append)
+    try:
+        pooled = extract_sources(TEXTS, use_pool=True)
+        assert extraction_pool._pool is not None
+    finally:
+        extraction_pool.shutdown_extraction_pool()
+    
+    # CPU used by the pool processes is credited to the calling task
+    assert len(credited) == 1 and credited[0] > 0
+    assert pooled == extract_sources(TEXTS, use_pool=False)
+    assert {skill["skill"] for skill in pooled[1][0]} == {"Kubernetes", "React"}
+
+def test_pool_failure_falls_back_to_in_process(monkeypatch):
+    def broken_pool():
+        raise RuntimeError("daemonic processes cannot start an extraction pool")
+    monkeypatch.setattr(extraction_pool, "get_extraction_pool", broken_pool)
+    
+    assert extract_sources(TEXTS, use_pool=True) == extract_sources(TEXTS, use_pool=False)
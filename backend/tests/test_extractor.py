@@ -0,0 +1,117 @@
+import pytest
+from app.services.skill_matcher import SkillMatcher, build_trie_pattern
+from app.services.extractor import extract_explicit_skills
+
+def test_matcher_respects_word_boundaries():
+    matcher = SkillMatcher(["Go", "Java", "JavaScript", "C++", "C#", "AI"])
+    mentions = matcher.find_mentions("Worked at Google on JavaScript and Java; wrote C++, C# and Go. Maintained AI tools.")
+    
+    assert set(mentions) == {"Go", "Java", "JavaScript", "C++", "C#", "AI"}
+    assert len(mentions["Go"]) == 1
+    assert len(mentions["Java"]) == 1
+
+def test_matcher_reports_all_offsets_case_insensitively():
+    text = "python, PYTHON and Python"
+    mentions = SkillMatcher(["Python"]).find_mentions(text)
+    assert mentions["Python"] == [(0, 6), (8, 14), (19, 25)]
+    assert all(text[start:end].lower() == "python" for start, end in mentions["Python"])
+
+def test_matcher_multi_word_terms_span_whitespace():
+    mentions = SkillMatcher(["REST APIs", "Machine Learning"]).find_mentions("Designed REST\nAPIs for machine   learning")
+    assert set(mentions) == {"REST APIs", "Machine Learning"}
+
+def test_trie_pattern_prefers_longest_term():
+    matcher = SkillMatcher(["Node", "Node.js"])
+    assert matcher.find_mentions("Node.js services") == {"Node.js": [(0, 7)]}
+    assert build_trie_pattern([]) == ""
+
+def test_extract_explicit_skills_uses_single_scan_matches():
+    skills = {s["skill"]: s for s in extract_explicit_skills("Used Python and Docker. More Python at Google.")}
+    assert skills["Python"]["mentions"] == 2
+    assert "Go" not in skills
+    assert "Python" in skills["Python"]["context"]
+
+def test_local_provider_uses_word_bounded_rules():
+    from app.services.llm_provider import LocalProvider
+    
+    texts = ["I led the platform team and mentored two juniors.", "Enabled caching; I presented it."]
+    inferred = LocalProvider().infer_implicit_skills(texts)
+    
+    assert {skill["skill"] for skill in inferred} == {"leadership", "mentoring", "communication"}
+
+def test_rule_engine_scans_once_and_returns_spans():
+    from app.services.rule_engine import RuleEngine
+    
+    engine = RuleEngine({
+        "a": [{"skill": "Leadership", "confidence": 0.7, "terms": ["led", "managed"]}],
+        "b": [{"skill": "leadership", "confidence": 0.6, "terms": ["led"]},
+              {"skill": "Mentoring", "confidence": 0.6, "terms": ["mentored"]}]
+    })
+    text = "Led a team, then managed and led another."
+    
+    scans = []
+    scan_windows = engine._scan_windows
+    engine._scan_windows = lambda windows: scans.append(1) or scan_windows(windows)
+    engine.share_scans()
+    first = engine.infer(text, "a")
+    second = engine.infer(text, "b")
+    engine.release_scans()
+    
+    assert len(scans) == 1
+    assert engine._shared.scans is None
+    assert first[0]["evidence"] == ["Led", "managed", "led"]
+    assert [text[s:e] for s, e in first[0]["spans"]] == ["Led", "managed", "led"]
+    assert [skill["skill"] for skill in second] == ["leadership"]
+    assert second[0]["mentions"] == 2
+
+def test_infer_implicit_skills_loads_rules_from_file():
+    from app.services.extractor import infer_implicit_skills
+    from app.services.rule_engine import get_rule_engine
+    
+    skills = {s["skill"]: s for s in infer_implicit_skills("Debugged the service before the deadline.")}
+    assert set(skills) == {"Problem Solving", "Project Management"}
+    assert skills["Problem Solving"]["context"].startswith("...Debugged")
+    assert len(get_rule_engine().version) == 16
+
+def test_extract_explicit_skills_accepts_unparsed_doc():
+    spacy = pytest.importorskip("spacy")
+    text = "Python and Docker"
+    skills = extract_explicit_skills(text, spacy.blank("en")(text))
+    assert {skill["skill"] for skill in skills} == {"Python", "Docker"}
+
+def test_text_windows_overlap_and_partition_ownership():
+    from app.services.text_windows import iter_text_windows
+    
+    text = "".join(chr(97 + i % 26) for i in range(1000))
+    windows = list(iter_text_windows(text, size=100, overlap=20))
+    
+    assert all(text[w.offset:w.offset + len(w.text)] == w.text for w in windows)
+    assert all(len(w.text) <= 100 for w in windows)
+    assert windows[-1].offset + len(windows[-1].text) == len(text)
+    # Ownership ranges tile the document with no gaps or overlaps
+    assert windows[0].owned_start == 0
+    assert all(a.owned_end == b.owned_start for a, b in zip(windows, windows[1:]))
+    # A stream of uneven chunks yields the same windows as the whole string
+    chunks = [text[i:i + 37] for i in range(0, len(text), 37)]
+    assert list(iter_text_windows(chunks, size=100, overlap=20)) == windows
+    assert list(iter_text_windows("", size=100, overlap=20)) == []
+
+def test_extraction_merges_mentions_across_window_boundaries(monkeypatch):
+    from app.services import text_windows
+    from app.services.extractor import infer_implicit_skills
+    
+    sentence = "Built Python services on Kubernetes and led the team. "
+    text = sentence * 200
+    expected_explicit = {s["skill"]: s["mentions"] for s in extract_explicit_skills(text)}
+    expected_implicit = {s["skill"]: s["mentions"] for s in infer_implicit_skills(text)}
+    
+    monkeypatch.setattr(text_windows, "WINDOW_SIZE", 500)
+    monkeypatch.setattr(text_windows, "WINDOW_OVERLAP", 60)
+    chunks = (text[i:i + 128] for i in range(0, len(text), 128))
+    windowed = {s["skill"]: s["mentions"] for s in extract_explicit_skills(chunks)}
+    assert windowed == expected_explicit == {"Python": 200, "Kubernetes": 200}
+    
+    chunks = (text[i:i + 128] for i in range(0, len(text), 128))
+    implicit = {s["skill"]: s for s in infer_implicit_skills(chunks)}
+    assert {skill: s["mentions"] for skill, s in implicit.items()} == expected_implicit
+    assert [text[start:end] for start, end in implicit["Leadership"]["spans"]] == ["led"] * 200
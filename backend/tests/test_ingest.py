@@ -0,0 +1,240 @@
+import pytest
+import os
+from datetime import datetime, timedelta
+from uuid import uuid4, UUID
+from app.core.events import get_job_events
+from app.core.models import Job, Profile
+from fastapi import HTTPException
+from app.api.v1.ingest import compute_content_hash, normalize_urls, save_stream
+
+def test_normalize_urls_ignores_order_case_and_trailing_slash():
+    assert normalize_urls('["https://GitHub.com/a/", "https://example.com/b"]') == \
+        normalize_urls('["https://example.com/b", "https://github.com/a"]')
+    assert normalize_urls(None) == []
+
+def test_content_hash_depends_on_file_and_options():
+    base = compute_content_hash("abc", '["https://github.com/a"]', {})
+    assert base == compute_content_hash("abc", '["https://github.com/a/"]', {})
+    assert base != compute_content_hash("abd", '["https://github.com/a"]', {})
+    assert base != compute_content_hash("abc", '["https://github.com/a"]', {"deep": True})
+
+def _finished_job(db, urls, updated_at):
+    profile = Profile(id=uuid4(), name="Cached", top_skills="[]")
+    db.add(profile)
+    job = Job(
+        id=uuid4(),
+        status="done",
+        profile_id=profile.id,
+        content_hash=compute_content_hash(None, urls, {}),
+        updated_at=updated_at
+    )
+    db.add(job)
+    db.commit()
+    return job
+
+def test_ingest_reuses_fresh_profile(db, client):
+    urls = f'["https://github.com/dedup-{uuid4().hex}"]'
+    cached = _finished_job(db, urls, datetime.utcnow())
+    
+    response = client.post("/api/v1/ingest", data={"urls": urls, "options": "{}"})
+    assert response.status_code == 200
+    assert response.json()["estimatedSeconds"] == 0
+    
+    job_id = response.json()["jobId"]
+    assert db.query(Job).filter(Job.id == UUID(job_id)).first().source_job_id == cached.id
+    assert get_job_events()._last[job_id]["status"] == "done"
+    assert client.get(f"/api/v1/status/{job_id}").json()["status"] == "done"
+    assert client.get(f"/api/v1/profile/{job_id}").json()["profileId"] == str(cached.profile_id)
+
+def test_ingest_ignores_stale_profile(db, client, mocker):
+    urls = f'["https://github.com/stale-{uuid4().hex}"]'
+    _finished_job(db, urls, datetime.utcnow() - timedelta(days=30))
+    delay = mocker.patch("app.api.v1.ingest.process_ingest_job.delay")
+    
+    response = client.post("/api/v1/ingest", data={"urls": urls, "options": "{}"})
+    assert response.status_code == 200
+    assert delay.called
+
+def test_ingest_dedup_hits_do_not_extend_freshness(db, client, mocker):
+    urls = f'["https://github.com/reused-{uuid4().hex}"]'
+    original = _finished_job(db, urls, datetime.utcnow() - timedelta(days=30))
+    db.add(Job(
+        id=uuid4(),
+        status="done",
+        profile_id=original.profile_id,
+        content_hash=original.content_hash,
+        source_job_id=original.id,
+        updated_at=datetime.utcnow()
+    ))
+    db.commit()
+    delay = mocker.patch("app.api.v1.ingest.process_ingest_job.delay")
+    
+    response = client.post("/api/v1/ingest", data={"urls": urls, "options": "{}"})
+    assert response.status_code == 200
+    assert delay.called
+
+def test_ingest_force_refresh_skips_cache(db, client, mocker):
+    urls = f'["https://github.com/forced-{uuid4().hex}"]'
+    _finished_job(db, urls, datetime.utcnow())
+    delay = mocker.patch("app.api.v1.ingest.process_ingest_job.delay")
+    
+    response = client.post("/api/v1/ingest", data={"urls": urls, "options": "{}", "force_refresh": "true"})
+    assert response.status_code == 200
+    assert response.json()["estimatedSeconds"] == 45
+    assert delay.called
+
+def test_ingest_streams_upload_to_disk(client, mocker):
+    import hashlib
+    content = b"%PDF-1.4\n" + b"x" * 200000
+    delay = mocker.patch("app.api.v1.ingest.process_ingest_job.delay")
+    
+    response = client.post("/api/v1/ingest", files={"file": ("cv.pdf", content, "application/pdf")})
+    assert response.status_code == 200
+    
+    saved_path = delay.call_args[0][1]
+    assert saved_path.endswith(".pdf")
+    with open(saved_path, "rb") as f:
+        assert hashlib.sha256(f.read()).hexdigest() == hashlib.sha256(content).hexdigest()
+    os.remove(saved_path)
+
+def test_ingest_rejects_unsupported_upload(client):
+    response = client.post("/api/v1/ingest", files={"file": ("cv.pdf", b"plain text", "application/pdf")})
+    assert response.status_code == 415
+    # Legacy Word documents cannot be parsed, so they are refused up front
+    ole = b"\xd0\xcf\x11\xe0\xa1\xb1\x1a\xe1" + bytes(504)
+    response = client.post("/api/v1/ingest", files={"file": ("cv.doc", ole, "application/msword")})
+    assert response.status_code == 415
+
+def test_ingest_rejects_oversized_upload(client, mocker):
+    mocker.patch("app.api.v1.ingest.MAX_UPLOAD_BYTES", 1024)
+    delay = mocker.patch("app.api.v1.ingest.process_ingest_job.delay")
+    
+    response = client.post("/api/v1/ingest", files={"file": ("cv.pdf", b"%PDF-" + b"x" * 4096, "application/pdf")})
+    assert response.status_code == 413
+    assert not delay.called
+
+def test_ingest_rejects_oversized_request_before_parsing(client, mocker):
+    mocker.patch("app.api.v1.ingest.MAX_UPLOAD_BYTES", 1024)
+    mocker.patch("app.api.v1.ingest.FORM_OVERHEAD_BYTES", 512)
+    save = mocker.patch("app.api.v1.ingest.save_stream")
+    body = b"--x\r\nContent-Disposition: form-data; name=\"file\"; filename=\"cv.pdf\"\r\n\r\n%PDF-" + b"x" * 4096 + b"\r\n--x--\r\n"
+    headers = {"content-type": "multipart/form-data; boundary=x"}
+    
+    assert client.post("/api/v1/ingest", content=body, headers=headers).status_code == 413
+    # Without Content-Length the body is counted as it streams in
+    chunks = (body[i:i + 1000] for i in range(0, len(body), 1000))
+    assert client.post("/api/v1/ingest", content=chunks, headers=headers).status_code == 413
+    assert not save.called
+
+def test_save_stream_requires_docx_document_part(tmp_path):
+    import io
+    docx = _zip_of({"[Content_Types].xml": b"<Types/>", "word/document.xml": b"<w:document/>"})
+    saved_path, _ = save_stream(io.BytesIO(docx), str(tmp_path / "cv"))
+    assert saved_path.endswith(".docx")
+    
+    with pytest.raises(HTTPException) as error:
+        save_stream(io.BytesIO(_zip_of({"notes.txt": b"not a cv"})), str(tmp_path / "other"))
+    assert error.value.status_code == 415
+    assert not os.path.exists(tmp_path / "other.docx")
+
+def _zip_of(members):
+    import io
+    import zipfile
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w") as archive:
+        for name, content in members.items():
+            archive.writestr(name, content)
+    return buffer.getvalue()
+
+def test_ingest_batch_fans_out_zip_members(db, client, mocker):
+    group = mocker.patch("app.api.v1.ingest.group")
+    archive = _zip_of({
+        "alice.pdf": b"%PDF-1.4 alice " + uuid4().bytes,
+        "bob.pdf": b"%PDF-1.4 bob " + uuid4().bytes,
+        "notes.txt": b"not a cv"
+    })
+    
+    response = client.post("/api/v1/ingest/batch", files=[("files", ("cvs.zip", archive, "application/zip"))])
+    assert response.status_code == 200
+    data = response.json()
+    assert len(data["jobIds"]) == 2
+    assert [r["filename"] for r in data["rejected"]] == ["notes.txt"]
+    
+    signatures = list(group.call_args[0][0])
+    assert len(signatures) == 2
+    assert group.return_value.apply_async.called
+    for signature in signatures:
+        os.remove(signature.args[1])
+    
+    jobs = db.query(Job).filter(Job.batch_id == UUID(data["batchId"])).all()
+    assert {job.payload["filename"] for job in jobs} == {"alice.pdf", "bob.pdf"}
+    
+    jobs[0].status = "done"
+    db.commit()
+    status = client.get(f"/api/v1/ingest/batch/{data['batchId']}").json()
+    assert status["status"] == "processing"
+    assert status["total"] == 2
+    assert status["counts"] == {"done": 1, "queued": 1}
+    assert status["progress"] == 50
+    assert {f["filename"] for f in status["files"]} == {"alice.pdf", "bob.pdf"}
+
+def test_ingest_batch_accepts_multipart_files_and_dedups(db, client, mocker):
+    group = mocker.patch("app.api.v1.ingest.group")
+    content = b"%PDF-1.4 cached " + uuid4().bytes
+    first = client.post("/api/v1/ingest/batch", files=[("files", ("a.pdf", content, "application/pdf"))]).json()
+    for signature in group.call_args[0][0]:
+        os.remove(signature.args[1])
+    
+    job = db.query(Job).filter(Job.id == UUID(first["jobIds"][0])).first()
+    profile = Profile(id=uuid4(), name="Batch Cached", top_skills="[]")
+    db.add(profile)
+    job.status, job.profile_id = "done", profile.id
+    db.commit()
+    
+    group.reset_mock()
+    second = client.post("/api/v1/ingest/batch", files=[
+        ("files", ("a-again.pdf", content, "application/pdf")),
+        ("files", ("empty.pdf", b"", "application/pdf"))
+    ]).json()
+    assert second["estimatedSeconds"] == 0
+    assert not group.called
+    assert second["rejected"][0]["filename"] == "empty.pdf"
+    assert get_job_events()._last[second["jobIds"][0]]["status"] == "done"
+    
+    status = client.get(f"/api/v1/ingest/batch/{second['batchId']}").json()
+    assert status["status"] == "done"
+    assert status["files"][0]["profileId"] == str(profile.id)
+
+def test_ingest_batch_caps_decompressed_bytes(client, mocker):
+    mocker.patch("app.api.v1.ingest.MAX_BATCH_UPLOAD_BYTES", 3000)
+    group = mocker.patch("app.api.v1.ingest.group")
+    # Compresses far below the request limit, but not once unzipped
+    archive = _zip_of({
+        "alice.pdf": b"%PDF-1.4 " + b"a" * 2000,
+        "bob.pdf": b"%PDF-1.4 " + b"b" * 2000
+    })
+    
+    response = client.post("/api/v1/ingest/batch", files=[("files", ("cvs.zip", archive, "application/zip"))])
+    assert response.status_code == 200
+    data = response.json()
+    assert len(data["jobIds"]) == 1
+    assert data["rejected"] == [{"filename": "bob.pdf", "error": "Batch exceeds 3000 bytes"}]
+    for signature in group.call_args[0][0]:
+        os.remove(signature.args[1])
+
+def test_ingest_batch_removes_files_when_commit_fails(client, mocker, tmp_path):
+    mocker.patch("app.api.v1.ingest.UPLOAD_DIR", str(tmp_path))
+    session = mocker.patch("app.api.v1.ingest.SessionLocal").return_value
+    session.commit.side_effect = RuntimeError("database unavailable")
+    
+    with pytest.raises(RuntimeError):
+        client.post(
+            "/api/v1/ingest/batch",
+            files=[("files", ("a.pdf", b"%PDF-1.4 " + uuid4().bytes, "application/pdf"))],
+            data={"force_refresh": "true"}
+        )
+    assert list(tmp_path.iterdir()) == []
+
+def test_ingest_batch_status_not_found(client):
+    assert client.get(f"/api/v1/ingest/batch/{uuid4()}").status_code == 404
+    assert client.get("/api/v1/ingest/batch/nope").status_code == 400
@@ -0,0 +1,21 @@
+import pytest
+from app.services.mention_index import collect_mentions, pack_mentions, unpack_mentions, mention_counts
+
+def test_pack_round_trips_and_counts_without_spans():
+    mentions = {"Python": [(0, 6, 0), (40, 46, 1)], "Node.js": [(10, 17, 0)], "Café": []}
+    data = pack_mentions(mentions)
+    
+    assert unpack_mentions(data) == mentions
+    assert mention_counts(data) == {"Python": 2, "Node.js": 1, "Café": 0}
+    # 10 bytes per span after the header and skill table
+    assert len(pack_mentions({"Go": [(i, i + 2, 0) for i in range(1000)]})) == 13 + 2 + 2 + 4 + 10 * 1000
+    assert unpack_mentions(None) == {} and mention_counts(b"") == {}
+    with pytest.raises(ValueError):
+        mention_counts(b"JSON" + data[4:])
+
+def test_collect_mentions_merges_sources_and_duplicate_spans():
+    per_source = [
+        [{"skill": "Leadership", "spans": [(5, 8)]}, {"skill": "Leadership", "spans": [(5, 8), (0, 3)]}],
+        [{"skill": "Leadership", "spans": [(1, 4)]}, {"skill": "mentoring"}]
+    ]
+    assert collect_mentions(per_source) == {"Leadership": [(0, 3, 0), (5, 8, 0), (1, 4, 1)]}
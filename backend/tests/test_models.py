@@ -43,3 +43,26 @@ def test_evidence_creation(db):
     db.commit()
     assert evidence.id is not None
     assert evidence.confidence_weight == 0.8
+
+def test_upgrade_adds_columns_to_existing_tables(tmp_path):
+    from sqlalchemy import create_engine, inspect, text
+    from app.core.db import upgrade_tables
+    
+    engine = create_engine(f"sqlite:///{tmp_path / 'old.db'}")
+    with engine.begin() as conn:
+        # The jobs and profiles tables as the first release created them
+        conn.execute(text("CREATE TABLE jobs (id CHAR(32) PRIMARY KEY, status VARCHAR(10), created_at DATETIME, "
+                          "updated_at DATETIME, profile_id CHAR(32), payload JSON, error TEXT)"))
+        conn.execute(text("CREATE TABLE profiles (id CHAR(32) PRIMARY KEY, name VARCHAR, email VARCHAR, summary TEXT, "
+                          "generated_at DATETIME, source_manifest JSON, top_skills JSON)"))
+        conn.execute(text("INSERT INTO jobs (id, status) VALUES ('1', 'done')"))
+    
+    assert sorted(upgrade_tables(engine)) == [
+        "jobs.batch_id", "jobs.content_hash", "jobs.source_job_id", "jobs.stage_timings", "profiles.mention_index"
+    ]
+    inspector = inspect(engine)
+    assert {"ix_jobs_content_hash", "ix_jobs_batch_id"} <= {index["name"] for index in inspector.get_indexes("jobs")}
+    assert {fk["referred_table"] for fk in inspector.get_foreign_keys("jobs")} == {"ingest_batches", "jobs"}
+    assert upgrade_tables(engine) == []
+    with engine.connect() as conn:
+        assert conn.execute(text("SELECT status, content_hash FROM jobs")).all() == [("done", None)]
@@ -0,0 +1,62 @@
+import pytest
+import time
+import threading
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from app.services.parser import fetch_urls_concurrently
+
+class StubHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path.startswith("/slow"):
+            time.sleep(float(self.path.split("?")[0].split("/")[-1]))
+        if self.path == "/missing":
+            self.send_response(404)
+            self.end_headers()
+            return
+        body = f"<html><body><p>Python at {self.path}</p></body></html>".encode()
+        try:
+            self.send_response(200)
+            self.send_header("Content-Type", "text/html")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+        except (BrokenPipeError, ConnectionResetError):
+            pass  # Client gave up after its deadline
+    
+    def log_message(self, format, *args):
+        pass
+
+@pytest.fixture(scope="module")
+def stub_server():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+
+def test_fetch_urls_concurrently_tolerates_partial_failure(stub_server):
+    urls = [f"{stub_server}/fast", f"{stub_server}/missing", f"{stub_server}/slow/3"]
+    
+    started = time.monotonic()
+    results = fetch_urls_concurrently(urls, deadline=1.0)
+    
+    assert time.monotonic() - started < 2.5
+    assert [url for url, _ in results] == [f"{stub_server}/fast"]
+    assert "Python at /fast" in results[0][1]
+
+def test_fetch_urls_concurrently_runs_in_parallel(stub_server):
+    urls = [f"{stub_server}/slow/0.5?{i}" for i in range(4)]
+    
+    started = time.monotonic()
+    results = fetch_urls_concurrently(urls, deadline=5.0, per_host_limit=4)
+    
+    assert len(results) == 4
+    assert time.monotonic() - started < 1.5
+
+def test_fetch_urls_concurrently_respects_per_host_limit(stub_server):
+    urls = [f"{stub_server}/slow/0.4?{i}" for i in range(3)]
+    
+    started = time.monotonic()
+    results = fetch_urls_concurrently(urls, deadline=5.0, per_host_limit=1)
+    
+    assert len(results) == 3
+    assert time.monotonic() - started >= 1.2
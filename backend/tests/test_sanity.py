@@ -0,0 +1,83 @@
+import json
+import time
+import pytest
+import threading
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from app.services import sanity
+from app.services.sanity import SanitySkillSync
+
+class SanityStub(BaseHTTPRequestHandler):
+    """Sanity query API stand-in honouring If-None-Match"""
+    dataset = [{"_id": "s1", "name": "Kubernetes", "category": "hard", "synonyms": ["k8s"]}]
+    etag = '"v1"'
+    requests = []
+    down = False
+    
+    def do_GET(self):
+        type(self).requests.append(dict(self.headers))
+        if type(self).down:
+            self.send_response(503)
+            self.end_headers()
+            return
+        if self.headers.get("If-None-Match") == type(self).etag:
+            self.send_response(304)
+            self.end_headers()
+            return
+        body = json.dumps({"result": type(self).dataset}).encode()
+        self.send_response(200)
+        self.send_header("ETag", type(self).etag)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+    
+    def log_message(self, format, *args):
+        pass
+
+@pytest.fixture
+def stub_url():
+    SanityStub.requests, SanityStub.down, SanityStub.etag = [], False, '"v1"'
+    server = ThreadingHTTPServer(("127.0.0.1", 0), SanityStub)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}/v2021-06-07/data/query/production"
+    server.shutdown()
+
+def test_sync_serves_from_memory_and_revalidates_conditionally(stub_url, tmp_path):
+    snapshot = tmp_path / "sanity.json"
+    sync = SanitySkillSync(stub_url, token="t", snapshot_path=str(snapshot), ttl=0, retry_interval=0)
+    
+    assert [skill["name"] for skill in sync.query("K8S")] == ["Kubernetes"]
+    assert sync.query("python") == []
+    assert json.loads(snapshot.read_text())["version"] == sync.version
+    
+    # Stale data is served immediately while a background sync revalidates it
+    assert sync.query("kube")
+    deadline = time.monotonic() + 5
+    while len(SanityStub.requests) < 2 and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert SanityStub.requests[0].get("Authorization") == "Bearer t"
+    assert SanityStub.requests[1].get("If-None-Match") == '"v1"'
+
+def test_last_snapshot_is_used_while_sanity_is_down(stub_url, tmp_path):
+    snapshot = str(tmp_path / "sanity.json")
+    assert SanitySkillSync(stub_url, snapshot_path=snapshot).sync()
+    
+    SanityStub.down = True
+    restarted = SanitySkillSync(stub_url, snapshot_path=snapshot, retry_interval=3600)
+    assert restarted.sync() is False
+    assert [skill["_id"] for skill in restarted.query()] == ["s1"]
+    
+    never_synced = SanitySkillSync(stub_url, snapshot_path=str(tmp_path / "none.json"), retry_interval=3600)
+    assert never_synced.query("kube") is None
+    assert never_synced.query("kube") is None
+    # The failed first sync is not retried on every call
+    assert len(SanityStub.requests) == 3
+
+def test_query_skills_falls_back_to_local_ontology(monkeypatch, tmp_path):
+    monkeypatch.setattr(sanity, "is_sanity_available", lambda: True)
+    monkeypatch.setattr(sanity, "_sanity_sync", SanitySkillSync(
+        "http://127.0.0.1:9/unreachable", snapshot_path=str(tmp_path / "none.json"), timeout=0.5
+    ))
+    
+    assert sanity.query_skills("kube") == [{"_id": "local_kubernetes", "name": "Kubernetes", "category": "hard"}]
@@ -0,0 +1,134 @@
+import pytest
+from app.services import skill_ontology
+from app.services.skill_ontology import SkillOntology, load_ontology, get_ontology, get_local_skills, get_skill_matcher
+
+def test_default_ontology_is_loaded_once_and_indexed():
+    ontology = get_ontology()
+    assert get_local_skills() is get_local_skills() is ontology.names
+    assert ontology.skill_id("node.js") == "nodedotjs"
+    assert ontology.canonical_name("  rest   apis ") == "REST APIs"
+    assert ontology.skill_type("Leadership") == "soft"
+    assert ontology.skill_type("COBOL", "hard") == "hard"
+    assert "Web3" in ontology.names_of_type("emerging")
+    assert len(ontology.version) == 16
+    assert ontology.footprint_bytes() > 0
+    
+    with pytest.raises(AttributeError):
+        ontology.names = ()
+
+def test_csv_ontology_and_duplicate_surface_forms(tmp_path):
+    path = tmp_path / "skills.csv"
+    path.write_text("id,name,type\nk8s,Kubernetes,hard\ndup,kubernetes,soft\nlead,Leadership,soft\n")
+    ontology = load_ontology(str(path))
+    
+    assert ontology.names == ("Kubernetes", "Leadership")
+    assert ontology.name_of("lead") == "Leadership"
+    assert "KUBERNETES" in ontology
+    
+    path.write_text("id,name,type\nx,X,unknown\n")
+    with pytest.raises(ValueError):
+        load_ontology(str(path))
+
+def test_hierarchy_edges_and_closure(tmp_path):
+    path = tmp_path / "skills.csv"
+    path.write_text(
+        "id,name,type,aliases,parents,related\n"
+        "lang,Language,hard,,,\n"
+        "py,Python,hard,,lang,\n"
+        "dj,Django,hard,,py,fl\n"
+        "fl,Flask,hard,,py|lang,\n"
+    )
+    ontology = load_ontology(str(path))
+    
+    assert ontology.related_skills("Django", "parent") == ("Python",)
+    assert ontology.related_skills("Django", "ancestor") == ("Python", "Language")
+    assert ontology.related_skills("Language", "descendant") == ("Python", "Flask", "Django")
+    # Related-to edges are symmetric
+    assert ontology.related_skills("Flask", "related") == ("Django",)
+    assert ontology.related_skills("Django") == ("Flask", "Python", "Language")
+    assert list(ontology.neighbours(ontology.index_of("Python"), "child")) == [2, 3]
+    assert ontology.related_skills("COBOL") == ()
+    
+    path.write_text("id,name,type,aliases,parents\na,A,hard,,b\nb,B,hard,,a\n")
+    with pytest.raises(ValueError, match="Cycle"):
+        load_ontology(str(path))
+    path.write_text("id,name,type,aliases,parents\na,A,hard,,missing\n")
+    with pytest.raises(ValueError, match="missing"):
+        load_ontology(str(path))
+
+def test_matcher_is_rebuilt_only_when_the_version_changes(monkeypatch):
+    matcher = get_skill_matcher()
+    assert get_skill_matcher() is matcher
+    
+    monkeypatch.setattr(skill_ontology, "_ontology", SkillOntology([("cobol", "COBOL", "hard")], version="v2"))
+    assert get_skill_matcher().find_mentions("COBOL and Python") == {"COBOL": [(0, 5)]}
+
+def test_aliases_resolve_to_canonical_skills():
+    from app.services.extractor import extract_explicit_skills
+    from app.services.skill_ontology import normalize_skill, canonical_skill_name
+    
+    assert normalize_skill("k8s") == normalize_skill("Kubernetes") == "kubernetes"
+    assert canonical_skill_name("postgres") == "PostgreSQL"
+    assert canonical_skill_name("  Unknown   Tool ") == "Unknown Tool"
+    
+    skills = {s["skill"]: s for s in extract_explicit_skills("Ran k8s clusters and Kubernetes jobs on Postgres.")}
+    assert skills["Kubernetes"]["mentions"] == 2
+    assert "PostgreSQL" in skills
+
+def test_github_frameworks_use_canonical_names_and_word_bounds():
+    from app.services.github_analyzer import GitHubAnalyzer
+    
+    frameworks = GitHubAnalyzer("https://github.com/someone")._detect_frameworks([
+        {"name": "k8s-operator", "description": "Kubernetes operator backed by postgres"},
+        {"name": "latest-tests", "description": None},
+        {"name": "react_portfolio", "description": "Showcasing leadership"},
+        {"name": "DjangoBlog", "description": None},
+        {"name": "flask_api", "description": None},
+        {"name": "GraphQLServer", "description": None},
+        {"name": "nextjs-blog", "description": None},
+        {"name": "python-utils", "description": "Ready to go scripts with AI"}
+    ])
+    assert frameworks == {"Kubernetes": 1, "PostgreSQL": 1, "React": 2, "Django": 1, "Flask": 1, "GraphQL": 1}
+
+def test_github_skills_skip_languages_already_found():
+    from app.services.github_analyzer import GitHubAnalyzer
+    
+    skills = GitHubAnalyzer("https://github.com/someone")._extract_skills(
+        [{"name": "django-python", "description": "Python and Docker"}], {"Python": 100.0}
+    )
+    assert len(skills) == 3
+    assert {s["name"]: s["category"] for s in skills} == {"Python": "hard", "Django": "hard", "Docker": "hard"}
+
+def test_persistence_and_merge_collapse_alias_rows(db):
+    from uuid import uuid4
+    from app.core.models import Profile, Skill, Evidence
+    from app.core.tasks import resolve_skill_ids
+    from merge_duplicate_skills import merge_duplicate_skills
+    
+    ids = resolve_skill_ids(db, [{"skill": "k8s"}, {"skill": "Kubernetes"}, {"skill": "mentoring"}])
+    assert ids["k8s"] == ids["Kubernetes"]
+    assert db.query(Skill).filter(Skill.id == ids["mentoring"]).first().name == "Mentoring"
+    
+    # Rows written before aliases were resolved
+    profile = Profile(id=uuid4(), name="Merge Profile")
+    legacy = [Skill(id=uuid4(), name=name, type="hard") for name in ["k8s", "postgres", "Zig Lang", "zig lang"]]
+    db.add_all([profile, *legacy])
+    db.flush()
+    db.add_all([Evidence(id=uuid4(), profile_id=profile.id, skill_id=skill.id, source_type="cv",
+                         snippet=skill.name, confidence_weight=0.5) for skill in legacy])
+    db.commit()
+    
+    assert merge_duplicate_skills(db, batch_size=1, dry_run=True)["merged"] >= 2
+    assert db.query(Skill).filter(Skill.name == "k8s").count() == 1
+    
+    result = merge_duplicate_skills(db, batch_size=1)
+    assert result["evidence_moved"] >= 2
+    names = {name for (name,) in db.query(Skill.name).all()}
+    assert {"k8s", "postgres", "zig lang"}.isdisjoint(names)
+    assert {"Kubernetes", "PostgreSQL", "Zig Lang"} <= names
+    evidence_skills = {
+        ev.snippet: db.query(Skill).filter(Skill.id == ev.skill_id).first().name
+        for ev in db.query(Evidence).filter(Evidence.profile_id == profile.id).all()
+    }
+    assert evidence_skills == {"k8s": "Kubernetes", "postgres": "PostgreSQL", "Zig Lang": "Zig Lang", "zig lang": "Zig Lang"}
+    assert merge_duplicate_skills(db)["groups"] == 0
@@ -0,0 +1,58 @@
+from app.services import skill_search
+from app.services.skill_ontology import SkillOntology, get_ontology
+from app.services.skill_search import SkillSearchIndex, SkillSearchService, PREFIX_TOPK_THRESHOLD, edit_distance
+
+def _ontology(names):
+    return SkillOntology(((f"s{i}", name, "hard") for i, name in enumerate(names)), version="test")
+
+def test_prefix_search_ranks_by_popularity_and_matches_words_and_aliases():
+    index = SkillSearchIndex(get_ontology(), {"PostgreSQL": 5, "Python": 9})
+    
+    assert [r["name"] for r in index.search("p", 2)] == ["Python", "PostgreSQL"]
+    assert index.search("psql")[0]["name"] == "PostgreSQL"
+    assert index.search("learn")[0]["name"] == "Machine Learning"
+    assert index.search("  PYTH ")[0] == {
+        "id": get_ontology().skill_id("Python"), "name": "Python", "type": "hard",
+        "popularity": 9, "match": "prefix", "score": 1.0
+    }
+    assert index.search("zzzz") == []
+
+def test_precomputed_prefixes_agree_with_range_scans():
+    names = [f"Data{word} {n}" for word in ("flow", "mesh", "core") for n in range(PREFIX_TOPK_THRESHOLD + 1)]
+    index = SkillSearchIndex(_ontology(names), {name: i % 7 for i, name in enumerate(names)})
+    
+    assert "data" in index.prefix_top and "dataflow" in index.prefix_top
+    for prefix in ("d", "data", "datam", "dataflow 1", "dataflow 63"):
+        lo = index.forms.index(next(f for f in index.forms if f.startswith(prefix)))
+        hi = lo + sum(f.startswith(prefix) for f in index.forms)
+        assert index.prefix_search(prefix, 10) == index._top_skills(lo, hi, 10)
+
+def test_typos_are_corrected_word_by_word():
+    index = SkillSearchIndex(get_ontology())
+    
+    assert index.search("kubernets")[0]["name"] == "Kubernetes"
+    assert index.search("pyhton")[0]["name"] == "Python"
+    # Dropped and added characters are corrected from shorter and longer prefixes
+    assert index.search("kubrnetes")[0]["name"] == "Kubernetes"
+    assert index.search("kubbern")[0]["name"] == "Kubernetes"
+    assert index.search("machine lerning")[0]["name"] == "Machine Learning"
+    fuzzy = index.search("postgrs")[0]
+    assert fuzzy["name"] == "PostgreSQL" and fuzzy["match"] == "fuzzy" and 0 < fuzzy["score"] < 1
+    # Exact prefixes come first, corrections only fill the remaining slots
+    assert [r["match"] for r in index.search("reac", 3)][0] == "prefix"
+
+def test_swapped_letters_rank_by_edit_distance():
+    assert edit_distance("pyhton", "python") == 1
+    assert edit_distance("pyhton", "pytor") == 2
+    # Bigrams score "pytor" above "python" for this swap; the edit distance settles it
+    index = SkillSearchIndex(_ontology(["Python", "PyTorch"]))
+    assert [r["name"] for r in index.search("pyhton")] == ["Python", "PyTorch"]
+
+def test_search_endpoint(client, monkeypatch):
+    monkeypatch.setattr(skill_search, "_skill_search", SkillSearchService(lambda: {"Docker": 4}))
+    
+    response = client.get("/api/v1/skills/search", params={"q": "doc", "limit": 3})
+    assert response.status_code == 200
+    assert response.json()["results"][0]["name"] == "Docker"
+    assert response.json()["results"][0]["popularity"] == 4
+    assert client.get("/api/v1/skills/search", params={"limit": 0}).status_code == 422
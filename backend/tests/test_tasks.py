@@ -0,0 +1,141 @@
+import pytest
+from app.core.models import Profile, Skill, Evidence
+from app.core.tasks import resolve_skill_ids, persist_skill_evidence
+from uuid import uuid4
+
+def test_resolve_skill_ids_reuses_existing_skills(db):
+    existing = Skill(id=uuid4(), name="Bulk Existing", type="hard")
+    db.add(existing)
+    db.commit()
+    
+    skill_ids = resolve_skill_ids(db, [
+        {"skill": "Bulk Existing"},
+        {"skill": "Bulk New"},
+        {"skill": "Bulk New"}
+    ])
+    db.commit()
+    
+    assert skill_ids["Bulk Existing"] == existing.id
+    assert db.query(Skill).filter(Skill.name == "Bulk New").count() == 1
+    assert skill_ids["Bulk New"] == db.query(Skill).filter(Skill.name == "Bulk New").first().id
+    
+    resolve_skill_ids(db, [{"skill": "k8s"}])
+    assert db.query(Skill).filter(Skill.name == "Kubernetes").first().ontology_ref == "kubernetes"
+
+def test_persist_skill_evidence_bulk_inserts_rows(db):
+    profile = Profile(id=uuid4(), name="Bulk Profile")
+    db.add(profile)
+    db.flush()
+    
+    rows = persist_skill_evidence(db, profile.id, [
+        {"skill": "Bulk Python", "confidence": 0.8, "context": "Python services", "source_type": "cv"},
+        {"skill": "Bulk Python", "confidence": 0.6, "context": "more Python", "source_type": "github"},
+        {"skill": "", "confidence": 0.5},
+        {"skill": "Leadership", "confidence": 0.7, "source_type": "llm"}
+    ])
+    db.commit()
+    
+    assert len(rows) == 3
+    evidence = db.query(Evidence).filter(Evidence.profile_id == profile.id).all()
+    assert len(evidence) == 3
+    assert {ev.id for ev in evidence} == {row["id"] for row, _, _ in rows}
+    assert db.query(Skill).filter(Skill.name == "Bulk Python").count() == 1
+    assert db.query(Skill).filter(Skill.name == "Leadership").first().type == "soft"
+
+def _write_cv(tmp_path, text):
+    import docx
+    document = docx.Document()
+    for line in text.split("\n"):
+        document.add_paragraph(line)
+    path = tmp_path / "cv.docx"
+    document.save(str(path))
+    return str(path)
+
+def test_process_ingest_job_publishes_partial_profile(db, client, tmp_path, monkeypatch):
+    from app.core import tasks
+    from app.core.models import Job
+    from app.services.rule_engine import get_rule_engine
+    
+    job = Job(id=uuid4(), status="queued", payload={})
+    db.add(job)
+    db.commit()
+    cv_path = _write_cv(tmp_path, "Built Python and Docker services.\nLed a team of five engineers.")
+    
+    seen = {}
+    class RecordingProvider:
+        def infer_implicit_skills(self, documents):
+            seen["response"] = client.get(f"/api/v1/profile/{job.id}")
+            seen["shared_scans"] = len(get_rule_engine()._shared.scans)
+            return [{"skill": "mentoring", "confidence": 0.6}]
+    monkeypatch.setattr(tasks, "get_llm_provider", lambda: RecordingProvider())
+    
+    tasks.process_ingest_job(str(job.id), cv_path, None, "{}")
+    
+    # The extraction scan is shared for the job's lifetime only
+    assert seen["shared_scans"] == 1
+    assert get_rule_engine()._shared.scans is None
+    
+    partial = seen["response"]
+    assert partial.status_code == 200
+    assert partial.json()["partial"] is True
+    assert "Python" in {skill["name"] for skill in partial.json()["skills"]}
+    
+    final = client.get(f"/api/v1/profile/{job.id}").json()
+    assert final["partial"] is False
+    assert final["profileId"] == partial.json()["profileId"]
+    assert "Mentoring" in {skill["name"] for skill in final["skills"]}
+    
+    timings = client.get(f"/api/v1/status/{job.id}").json()["stageTimings"]
+    assert set(timings) == {"parsing", "extracting", "inferring", "scoring", "persisting"}
+    assert timings["parsing"]["items"] == 1
+    assert timings["inferring"]["items"] == 1
+    assert all(stage["wall_ms"] >= 0 and stage["cpu_ms"] >= 0 for stage in timings.values())
+
+def test_profile_serves_mention_highlights_from_index(db, client, tmp_path):
+    from app.core import tasks
+    from app.core.models import Job
+    from app.services.extraction_cache import normalize_text
+    from app.services.parser import parse_file
+    
+    job = Job(id=uuid4(), status="queued", payload={})
+    db.add(job)
+    db.commit()
+    cv_path = _write_cv(tmp_path, "Python services; more Python.\nI led Docker migrations.")
+    text = normalize_text(parse_file(cv_path))
+    
+    tasks.process_ingest_job(str(job.id), cv_path, None, "{}")
+    
+    skills = {skill["name"]: skill for skill in client.get(f"/api/v1/profile/{job.id}").json()["skills"]}
+    assert skills["Python"]["mentions"] == 2
+    
+    highlights = client.get(f"/api/v1/profile/{job.id}/highlights", params={"skill": "Python"}).json()
+    assert highlights["sources"] == ["cv"]
+    [python] = highlights["skills"]
+    assert python["count"] == 2
+    assert [text[span["start"]:span["end"]] for span in python["spans"]] == ["Python", "Python"]
+    assert {span["source"] for span in python["spans"]} == {"cv"}
+
+def test_profile_links_related_skills_from_the_ontology(db, client, tmp_path):
+    from app.core import tasks
+    from app.core.models import Job
+    
+    job = Job(id=uuid4(), status="queued", payload={})
+    db.add(job)
+    db.commit()
+    cv_path = _write_cv(tmp_path, "Built Django and Flask services in Python.\nRan them on Kubernetes with Docker.")
+    
+    tasks.process_ingest_job(str(job.id), cv_path, None, "{}")
+    
+    profile = client.get(f"/api/v1/profile/{job.id}").json()
+    skills = {skill["name"]: skill for skill in profile["skills"]}
+    assert skills["Django"]["related"][:2] == ["Flask", "REST APIs"]
+    assert "Python" in skills["Django"]["related"]
+    
+    names = {node["id"]: node["name"] for node in profile["graph"]["nodes"]}
+    assert set(names.values()) == set(skills)
+    edges = {(names[e["source"]], names[e["target"]], e["type"]) for e in profile["graph"]["edges"]}
+    assert {("Django", "Python", "parent"), ("Flask", "Python", "parent")} <= edges
+    # Symmetric related-to edges appear once per pair
+    related = [frozenset((source, target)) for source, target, kind in edges if kind == "related"]
+    assert len(related) == len(set(related))
+    assert {frozenset(("Django", "Flask")), frozenset(("Docker", "Kubernetes"))} <= set(related)
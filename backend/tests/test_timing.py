@@ -0,0 +1,51 @@
+import pytest
+from uuid import uuid4
+from app.core.auth import create_access_token
+from app.core.models import Job
+from app.core.timing import StageTimer, add_cpu_time, percentile, summarize_stage_timings
+
+def test_stage_timer_accumulates_repeated_stages():
+    timer = StageTimer()
+    with timer.stage("persisting") as stats:
+        stats["items"] = 3
+    with timer.stage("persisting") as stats:
+        stats["items"] = 2
+    
+    timings = timer.snapshot()
+    assert timings["persisting"]["items"] == 5
+    assert timings["persisting"]["wall_ms"] >= 0
+
+def test_stage_timer_includes_credited_cpu():
+    timer = StageTimer()
+    with timer.stage("extracting"):
+        add_cpu_time(0.25)
+    assert timer.snapshot()["extracting"]["cpu_ms"] >= 250
+
+def test_percentile_nearest_rank():
+    values = list(range(1, 101))
+    assert percentile(values, 50) == 50
+    assert percentile(values, 99) == 99
+    assert percentile([], 50) == 0.0
+
+def test_summarize_stage_timings():
+    summary = summarize_stage_timings([
+        {"parsing": {"wall_ms": 10, "cpu_ms": 5, "items": 1}},
+        {"parsing": {"wall_ms": 30, "cpu_ms": 15, "items": 2}},
+        None
+    ])
+    assert summary["parsing"]["jobs"] == 2
+    assert summary["parsing"]["wall_ms"]["p50"] == 10
+    assert summary["parsing"]["wall_ms"]["p99"] == 30
+    assert "extracting" not in summary
+
+def test_admin_stage_timings_endpoint(db, client):
+    db.add(Job(id=uuid4(), status="done", stage_timings={"extracting": {"wall_ms": 12.5, "cpu_ms": 10, "items": 4}}))
+    db.commit()
+    
+    token = create_access_token({"user_id": str(uuid4()), "role": "admin"})
+    response = client.get("/api/v1/admin/stage-timings", headers={"Authorization": f"Bearer {token}"})
+    assert response.status_code == 200
+    assert response.json()["stages"]["extracting"]["jobs"] >= 1
+    
+    employee = create_access_token({"user_id": str(uuid4()), "role": "employee"})
+    assert client.get("/api/v1/admin/stage-timings", headers={"Authorization": f"Bearer {employee}"}).status_code == 403
@@ -0,0 +1,129 @@
+import subprocess
+import sys
+import textwrap
+import numpy as np
+import pytest
+from app.services import vector_index
+from app.services.vector_index import EvidenceVectorIndex, NumpyVectors, BACKENDS, normalize_rows, top_k
+
+DIM = 8
+
+def _vector(*hot):
+    vector = np.zeros(DIM, dtype=np.float32)
+    vector[list(hot)] = 1.0
+    return vector
+
+@pytest.mark.parametrize("backend", sorted(BACKENDS))
+def test_add_search_and_replace(tmp_path, backend):
+    index = EvidenceVectorIndex(str(tmp_path), DIM, backend)
+    assert index.search(_vector(0)) == [[]]
+    
+    index.add([
+        ("ev-a", _vector(0) * 3, "Python services", {"skill": "Python"}),
+        ("ev-b", _vector(1), "Docker images", None),
+        ("ev-c", _vector(0, 1), "Python in Docker", None)
+    ])
+    [results] = index.search(_vector(0), limit=2)
+    assert [r["evidence_id"] for r in results] == ["ev-a", "ev-c"]
+    assert results[0]["similarity"] == pytest.approx(1.0)
+    assert results[0]["metadata"] == {"skill": "Python"}
+    
+    # Re-adding an evidence id replaces its vector instead of duplicating it
+    index.add([("ev-a", _vector(2), "Rust services", None)])
+    assert len(index) == 3
+    [results] = index.search(_vector(2), limit=1)
+    assert results[0]["evidence_id"] == "ev-a" and results[0]["text"] == "Rust services"
+    
+    batch = index.search(np.stack([_vector(1), _vector(2)]), limit=1)
+    assert [matches[0]["evidence_id"] for matches in batch] == ["ev-b", "ev-a"]
+
+@pytest.mark.parametrize("backend", sorted(BACKENDS))
+def test_index_persists_and_is_shared_across_processes(tmp_path, backend):
+    reader = EvidenceVectorIndex(str(tmp_path), DIM, backend)
+    reader.add([("ev-local", _vector(3), "local", None)])
+    assert len(reader) == 1
+    
+    # Another process (a worker) adds to the same directory
+    script = textwrap.dedent(f"""
+        import numpy as np
+        from app.services.vector_index import EvidenceVectorIndex
+        index = EvidenceVectorIndex({str(tmp_path)!r}, {DIM}, {backend!r})
+        vector = np.zeros({DIM}, dtype=np.float32)
+        vector[4] = 1.0
+        index.add([("ev-worker", vector, "from the worker", {{"skill": "Go"}})])
+    """)
+    subprocess.run([sys.executable, "-c", script], check=True)
+    
+    # The reader picks up the new file without a restart
+    [results] = reader.search(_vector(4), limit=1)
+    assert results[0]["evidence_id"] == "ev-worker"
+    assert results[0]["metadata"] == {"skill": "Go"}
+    
+    # So does a fresh process, and its own adds keep both
+    restarted = EvidenceVectorIndex(str(tmp_path), DIM, backend)
+    restarted.add([("ev-after", _vector(5), "after restart", None)])
+    assert len(reader) == 3
+    assert {r["evidence_id"] for r in reader.search(_vector(3, 4, 5), limit=5)[0]} == {"ev-local", "ev-worker", "ev-after"}
+
+@pytest.mark.parametrize("backend", sorted(BACKENDS))
+def test_segment_is_compacted_into_a_new_generation(tmp_path, backend):
+    writer = EvidenceVectorIndex(str(tmp_path), DIM, backend, compact_rows=4)
+    reader = EvidenceVectorIndex(str(tmp_path), DIM, backend)
+    writer.add([("ev-a", _vector(0), "a", None), ("ev-b", _vector(1), "b", None)])
+    assert [r["evidence_id"] for r in reader.search(_vector(0), limit=1)[0]] == ["ev-a"]
+    
+    # Adds only append until the segment is full
+    writer.add([("ev-a", _vector(2), "a again", None)])
+    assert not (tmp_path / "manifest.json").exists()
+    writer.add([("ev-c", _vector(3), "c", None)])
+    assert writer._generation == 1 and len(writer._segment) == 0
+    
+    # Replaced vectors and records are gone from the new generation
+    assert len(writer._base) == 3
+    assert (tmp_path / "records-1.jsonl").read_text().count("\n") == 3
+    texts = [r["text"] for r in reader.search(_vector(0, 2), limit=5)[0]]
+    assert texts[0] == "a again" and "a" not in texts
+    
+    # Later adds land in the new segment; replaced base vectors are skipped
+    for generation in range(2, 4):
+        writer.add([(f"ev-{n}", _vector(n % DIM), f"gen {generation}", None) for n in range(4)])
+        assert writer._generation == generation
+    assert not (tmp_path / "records-1.jsonl").exists()
+    writer.add([("ev-b", _vector(7), "b last", None)])
+    [results] = reader.search(_vector(1), limit=5)
+    assert "ev-b" not in [r["evidence_id"] for r in results]
+    assert reader.search(_vector(7), limit=1)[0][0]["text"] == "b last"
+    assert len(reader) == 7
+
+def test_writer_drops_a_partial_tail(tmp_path):
+    index = EvidenceVectorIndex(str(tmp_path), DIM, "numpy")
+    index.add([("ev-a", _vector(0), "a", None)])
+    # A writer died mid-append
+    with open(tmp_path / "records-0.jsonl", "ab") as f:
+        f.write(b'{"id": 1, "evid')
+    with open(tmp_path / "segment-0.bin", "ab") as f:
+        f.write(b"\x00" * 5)
+    
+    index.add([("ev-b", _vector(1), "b", None)])
+    assert [r["evidence_id"] for r in EvidenceVectorIndex(str(tmp_path), DIM, "numpy").search(_vector(1), limit=1)[0]] == ["ev-b"]
+
+def test_top_k_matches_a_full_sort():
+    scores = np.random.default_rng(1).standard_normal((4, 50)).astype(np.float32)
+    assert np.array_equal(top_k(scores, 5), np.argsort(-scores, axis=1, kind="stable")[:, :5])
+    assert np.array_equal(top_k(scores, 50), np.argsort(-scores, axis=1, kind="stable"))
+
+def test_numpy_batched_search_matches_single_queries(monkeypatch):
+    rng = np.random.default_rng(2)
+    vectors = NumpyVectors(DIM)
+    vectors.add(np.arange(100, 300), normalize_rows(rng.standard_normal((200, DIM))))
+    queries = normalize_rows(rng.standard_normal((7, DIM)))
+    
+    # Force several query chunks
+    monkeypatch.setattr(vector_index, "SEARCH_CHUNK_CELLS", 400)
+    scores, ids = vectors.search(queries, 3)
+    for query, query_scores, query_ids in zip(queries, scores, ids):
+        single_scores, single_ids = vectors.search(query[None], 3)
+        assert np.array_equal(query_ids, single_ids[0])
+        assert np.allclose(query_scores, single_scores[0])
+        assert np.allclose(query_scores, np.sort(vectors.matrix @ query)[::-1][:3])
+    assert vectors.matrix.flags.c_contiguous and vectors.matrix.dtype == np.float32
@@ -0,0 +1,40 @@
+import pytest
+import gc
+from app.core.worker_bootstrap import preload_models, current_rss_bytes
+
+def test_current_rss_bytes_is_positive():
+    assert current_rss_bytes() > 0
+
+def test_preload_models_reports_load_and_savings():
+    try:
+        report = preload_models(concurrency=4)
+    finally:
+        gc.unfreeze()
+    
+    assert report["children"] == 4
+    assert report["load_seconds"] >= 0
+    assert report["estimated_rss_saved_mb"] == pytest.approx(report["models_rss_mb"] * 3, abs=0.2)
+
+def test_preload_skips_remote_embedding_warmup(monkeypatch):
+    from app.services import embeddings
+    
+    calls = []
+    monkeypatch.setattr(embeddings, "USE_GROQ", True)
+    monkeypatch.setattr(embeddings, "embed_texts", lambda texts: calls.append(texts))
+    try:
+        preload_models(concurrency=1, prefork=False)
+    finally:
+        gc.unfreeze()
+    assert calls == []
+
+def test_worker_init_limits_torch_threads_only_for_prefork(monkeypatch):
+    from types import SimpleNamespace
+    from celery.concurrency.prefork import TaskPool
+    from app.core import tasks
+    
+    seen = []
+    monkeypatch.setattr(tasks, "WORKER_PRELOAD_MODELS", True)
+    monkeypatch.setattr(tasks, "preload_models", lambda concurrency, prefork: seen.append((concurrency, prefork)))
+    for pool_cls in ("prefork", TaskPool, "threads", "solo"):
+        tasks.preload_worker_models(sender=SimpleNamespace(concurrency=2, pool_cls=pool_cls))
+    assert seen == [(2, True), (2, True), (2, False), (2, False)]
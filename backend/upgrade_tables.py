@@ -0,0 +1,13 @@
+#!/usr/bin/env python3
+"""
+Add the columns, foreign keys and indexes that newer releases added to
+existing tables (create_tables.py only creates missing tables). Run after
+deploying a release, before starting the API and workers; safe to re-run.
+
+    python upgrade_tables.py
+"""
+from app.core.db import upgrade_tables
+
+if __name__ == "__main__":
+    added = upgrade_tables()
+    print(f"Added columns: {', '.join(added)}" if added else "Tables up to date")